@@ -0,0 +1,283 @@
+"""Benchmark cases for the Pig hot paths.
+
+Each case is registered with ``@case(name)`` and, given a size, returns
+``(fn, ops)``: ``fn`` is timed, and one call of it does ``ops`` operations.
+All setup happens before ``fn`` is returned, so only the hot path is timed,
+and every call starts from the same state (seeded dice, empty search
+tables), so the best of several calls isn't just the warmest one. Files go
+in a ``TemporaryDirectory`` that ``fn`` holds on to; it is removed once
+the case is done with.
+"""
+from __future__ import annotations
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from pig.ai import (ComputerStrategy, SearchStrategy, SmartStrategy,
+                    TranspositionTable)
+from pig.dice import Dice, ScriptedDice, write_script
+from pig.game import Game
+from pig.player import Player
+from pig.scoreboard import Scoreboard, ScoreRow
+from pig.turn import Turn
+import pig.shell as shell
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+Case = Callable[[int], "tuple[Callable[[], object], int]"]
+CASES: dict[str, tuple[Case, bool]] = {}   # name -> (factory, sized?)
+
+LOOP = 10_000                               # ops per call for small cases
+SEED = 2024                                 # every timed call, same dice
+
+
+def case(name: str, sized: bool = False):
+    """Register a benchmark. Sized cases run once per scoreboard size."""
+    def wrap(fn: Case) -> Case:
+        CASES[name] = (fn, sized)
+        return fn
+    return wrap
+
+
+def _workdir() -> tempfile.TemporaryDirectory:
+    # the scripted dice keep their file mapped, which Windows won't delete
+    return tempfile.TemporaryDirectory(prefix="pig-bench-",
+                                       ignore_cleanup_errors=True)
+
+
+def _fresh_tables(bots) -> Callable[[], None]:
+    """Return a function that empties the search bots' tables."""
+    tables = [b.table for b in bots if isinstance(b, SearchStrategy)]
+
+    def clear():
+        for t in tables:
+            t.clear()
+    return clear
+
+
+def _strategies() -> dict[str, Callable[[], object]]:
+    return {
+        "computer": lambda: ComputerStrategy(18),
+        "smart": lambda: SmartStrategy(),
+        # fixed depth, generous budget: measures search work, not the clock
+        "search": lambda: SearchStrategy(max_depth=3, time_budget=10,
+                                         table=TranspositionTable()),
+    }
+
+
+# ----- dice / turn -----
+
+@case("dice.roll")
+def dice_roll(_size: int):
+    """Single ``Dice.roll`` calls."""
+    roll = Dice().roll
+
+    def run():
+        for _ in range(LOOP):
+            roll()
+    return run, LOOP
+
+
+@case("turn.create")
+def turn_create(_size: int):
+    """Build a ``Turn``."""
+    p, d = Player("A"), Dice()
+
+    def run():
+        for _ in range(LOOP):
+            Turn(p, d)
+    return run, LOOP
+
+
+@case("turn.roll")
+def turn_roll(_size: int):
+    """``Turn.roll`` on seeded dice, restarting busted turns."""
+    t = Turn(Player("A"), Dice())
+
+    def run():
+        random.seed(SEED)
+        for _ in range(LOOP):
+            if t.finished:
+                t.reset()
+            t.roll()
+    return run, LOOP
+
+
+@case("turn.hold")
+def turn_hold(_size: int):
+    """``Turn.hold`` of a five-point turn."""
+    t = Turn(Player("A"), Dice())
+
+    def run():
+        for _ in range(LOOP):
+            t.reset()
+            t.points = 5
+            t.hold()
+    return run, LOOP
+
+
+# ----- game -----
+
+def _cpu_turn_case(kind: str):
+    def factory(_size: int):
+        bot = _strategies()[kind]()
+        clear = _fresh_tables([bot])
+        g = Game(target=100)
+        n = 200 if kind == "search" else 2_000
+
+        def run():
+            clear()
+            g.reset()
+            random.seed(SEED)
+            for _ in range(n):
+                if g.is_over:
+                    g.reset()
+                g.play_cpu_turn(bot.decide)
+        return run, n
+    return factory
+
+
+for _kind in ("computer", "smart", "search"):
+    case(f"game.play_cpu_turn.{_kind}")(_cpu_turn_case(_kind))
+
+
+def _full_game_case(a: str, b: str):
+    def factory(_size: int):
+        bots = (_strategies()[a](), _strategies()[b]())
+        clear = _fresh_tables(bots)
+        n = 5 if "search" in (a, b) else 50
+
+        def run():
+            clear()
+            random.seed(SEED)
+            for _ in range(n):
+                g = Game(target=100)
+                while not g.is_over:
+                    g.play_cpu_turn(bots[g.current_index].decide)
+        return run, n
+    return factory
+
+
+for _a, _b in (("computer", "computer"), ("computer", "smart"),
+               ("smart", "smart"), ("search", "smart")):
+    case(f"game.full.{_a}-vs-{_b}")(_full_game_case(_a, _b))
+
+
+@case("game.scripted_rolls")
+def scripted_rolls(_size: int):
+    """Smart vs smart on a recorded dice script: same rolls on every build."""
+    work = _workdir()
+    path = Path(work.name) / "rolls.bin"
+    n = 100_000
+    write_script(path, n, seed=SEED)
+    dice = ScriptedDice.open(path)
+    bot = SmartStrategy()
+
+    def run(_work=work):                    # holds the directory open
+        dice.rewind()
+        g = Game(target=100, dice=dice)
+        for _ in range(n // 20):            # stays well inside the script
+            if g.is_over:
+                g.reset()
+            g.play_cpu_turn(bot.decide)
+    return run, n // 20
+
+
+# ----- scoreboard -----
+
+def make_scoreboard(rows: int, seed: int = 0) -> Scoreboard:
+    """Build a scoreboard of ``rows`` fake results among 50 names."""
+    rng = random.Random(seed)
+    names = [f"Player {i}" for i in range(50)]
+    sb = Scoreboard()
+    hist = sb.history
+    for i in range(rows):
+        a, b = rng.sample(names, 2)
+        hist.append(ScoreRow(
+            when="2026-01-01T00:00:00", target=100, winner=a,
+            scores={a: 100 + i % 7, b: i % 90},
+        ))
+    return sb
+
+
+@case("scoreboard.wins_table", sized=True)
+def wins_table(size: int):
+    """Win counts per player over ``size`` results."""
+    sb = make_scoreboard(size)
+    return sb.wins_table, size
+
+
+@case("scoreboard.top", sized=True)
+def top(size: int):
+    """Top three players over ``size`` results."""
+    sb = make_scoreboard(size)
+    return (lambda: sb.top(3)), size
+
+
+@case("scoreboard.save", sized=True)
+def save(size: int):
+    """Write a ``size``-row scoreboard file."""
+    sb = make_scoreboard(size)
+    work = _workdir()
+    tmp = Path(work.name) / "scoreboard.json"
+
+    def run(_work=work):                    # holds the directory open
+        old = shell.SAVE_PATH
+        shell.SAVE_PATH = tmp
+        try:
+            shell.save_scoreboard(sb)
+        finally:
+            shell.SAVE_PATH = old
+    return run, size
+
+
+@case("scoreboard.load", sized=True)
+def load(size: int):
+    """Read a ``size``-row scoreboard file."""
+    work = _workdir()
+    tmp = Path(work.name) / "scoreboard.json"
+    old = shell.SAVE_PATH
+    shell.SAVE_PATH = tmp
+    try:
+        shell.save_scoreboard(make_scoreboard(size))
+    finally:
+        shell.SAVE_PATH = old
+
+    def run(_work=work):                    # holds the directory open
+        shell.SAVE_PATH = tmp
+        try:
+            shell.load_scoreboard()
+        finally:
+            shell.SAVE_PATH = old
+    return run, size
+
+
+# ----- start-up -----
+
+# what ``python main.py`` does before the first prompt, minus the prompt
+_TO_PROMPT = (
+    "import sys; sys.path.insert(0, {src!r}); import main; "
+    "sh = main.make_shell(); sh._print_header(); sh.out.flush()"
+)
+
+
+@case("startup.to_prompt", sized=True)
+def to_prompt(size: int):
+    """Fresh interpreter to first prompt, next to a ``size``-row scoreboard."""
+    work = _workdir()
+    old = shell.SAVE_PATH
+    shell.SAVE_PATH = Path(work.name) / "scoreboard.json"
+    try:
+        shell.save_scoreboard(make_scoreboard(size))
+    finally:
+        shell.SAVE_PATH = old
+    cmd = [sys.executable, "-c", _TO_PROMPT.format(src=str(SRC))]
+
+    def run():
+        subprocess.run(cmd, cwd=work.name, check=True,
+                       stdout=subprocess.DEVNULL)
+    return run, 1
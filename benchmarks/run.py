@@ -0,0 +1,181 @@
+"""Run the Pig benchmarks and compare against a stored baseline.
+
+Usage (from the repo root)::
+
+    python benchmarks/run.py                       # full run, compare
+    python benchmarks/run.py --quick               # small sizes, fewer repeats
+    python benchmarks/run.py --only dice turn      # name prefixes
+    python benchmarks/run.py --save-baseline       # record a new baseline
+
+Results are written as JSON (``--out``). Every result is the best of
+``--repeat`` timings, reported as seconds per operation. A case counts
+as a regression when it is more than ``--threshold`` slower than the
+baseline; the exit code is then 1.
+
+Timings are also stored divided by a fixed pure-Python reference loop
+timed in the same run, and the comparison uses those normalized numbers,
+so a baseline taken on a slower or busier machine still compares fairly.
+The reference is timed (best of ``--repeat``) before every case and once
+more at the end, and the median of those readings is the one divided
+by, so a burst of noise in a few of them doesn't move it. How far the
+slowest reading strayed from the fastest is printed as the run's
+*drift*; it only tells you how steady the machine was and never widens
+the threshold.
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+sys.path.insert(0, str(HERE))
+
+from cases import CASES  # noqa: E402
+
+BASELINE = HERE / "baseline.json"
+SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000,)
+
+
+def measure(fn, ops: int, repeat: int) -> float:
+    """Best seconds per op over ``repeat`` calls (GC off while timing)."""
+    best = float("inf")
+    gc_was_on = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_on:
+            gc.enable()
+    return best / ops
+
+
+def reference_loop(repeat: int = 5) -> float:
+    """Seconds for a fixed pure-Python loop (best of ``repeat``)."""
+    def loop():
+        total = 0
+        for i in range(200_000):
+            total += i % 7
+        return total
+    return measure(loop, 1, repeat)
+
+
+def run(only: list[str] | None, sizes: tuple[int, ...], repeat: int,
+        log=print) -> tuple[dict[str, dict], dict[str, float]]:
+    """Run the selected cases.
+
+    Returns ``{name: {"seconds": ..., ...}}`` and the reference loop as
+    ``{"seconds": median, "drift": slowest / fastest - 1}``.
+    """
+    refs: list[float] = []
+    results: dict[str, dict] = {}
+    for name, (factory, sized) in CASES.items():
+        if only and not any(name.startswith(p) for p in only):
+            continue
+        for size in (sizes if sized else (0,)):
+            key = f"{name}[{size}]" if sized else name
+            fn, ops = factory(size)
+            # big scoreboards are slow to time; one or two goes is plenty
+            reps = repeat if size < 1_000_000 else min(repeat, 2)
+            refs.append(reference_loop(repeat))
+            per_op = measure(fn, ops, reps)
+            results[key] = {"seconds": per_op, "ops_per_sec": 1 / per_op}
+            log(f"{key:<42} {per_op * 1e6:>12.3f} us/op "
+                f"{1 / per_op:>14,.0f} op/s")
+    refs.append(reference_loop(repeat))
+    ref = statistics.median(refs)
+    for r in results.values():
+        r["normalized"] = r["seconds"] / ref
+    return results, {"seconds": ref, "drift": max(refs) / min(refs) - 1}
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict],
+            threshold: float) -> list[str]:
+    """Names of cases more than ``threshold`` slower than the baseline."""
+    slower = []
+    for key, now in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        unit = "normalized" if "normalized" in now and "normalized" in base \
+            else "seconds"
+        ratio = now[unit] / base[unit]
+        if ratio > 1 + threshold:
+            slower.append(f"{key}: {ratio:.2f}x baseline")
+    return slower
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    ap = argparse.ArgumentParser(description="Pig benchmarks.")
+    ap.add_argument("--quick", action="store_true",
+                    help=f"sizes {QUICK_SIZES} and 3 repeats")
+    ap.add_argument("--only", nargs="*", default=None,
+                    help="run cases whose names start with these")
+    ap.add_argument("--sizes", type=int, nargs="*", default=None,
+                    help=f"scoreboard sizes (default {SIZES})")
+    ap.add_argument("--repeat", type=int, default=None)
+    ap.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed slowdown before failing (0.25 = 25%%)")
+    ap.add_argument("--save-baseline", action="store_true",
+                    help="write results to the baseline file too")
+    args = ap.parse_args(argv)
+
+    sizes = tuple(args.sizes) if args.sizes \
+        else (QUICK_SIZES if args.quick else SIZES)
+    repeat = args.repeat or (3 if args.quick else 5)
+    results, ref = run(args.only, sizes, repeat)
+    print(f"reference loop {ref['seconds'] * 1e3:.2f} ms, "
+          f"drift {ref['drift']:.1%}")
+
+    doc = {
+        "meta": {
+            "when": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "reference": ref,
+        },
+        "results": results,
+    }
+    args.out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"results written to {args.out}")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            old = json.loads(args.baseline.read_text(encoding="utf-8"))
+            old["results"].update(results)
+            old["meta"] = doc["meta"]
+            doc = old
+        args.baseline.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("no baseline to compare against")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    threshold = args.threshold
+    slower = compare(results, baseline["results"], threshold)
+    if slower:
+        print(f"REGRESSIONS (> {threshold:.0%} slower):")
+        for line in slower:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions (threshold {threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,34 @@
 # if __name__ == "__main__":
 #     main()
 
-"""Entry point for the Pig game project (cmd-based)."""
-from pig.shell import PigShell, load_scoreboard
+"""Entry point for the Pig game project (cmd-based).
+
+``python main.py`` starts the interactive shell. ``python main.py --batch
+[files...] [--mode pvc --diff hard ...]`` runs commands without prompts
+(see ``pig.batch``).
+"""
+from __future__ import annotations
+import sys
+
+from pig.shell import LazyScoreboard, PigShell
 from pig.game import Game
+from pig.output import StreamSink
+
+
+def make_shell() -> PigShell:
+    """Build the interactive shell; the scoreboard is read when needed."""
+    return PigShell(Game(), LazyScoreboard(), out=StreamSink(sys.stdout))
 
 
-def main() -> None:
-    """Run the Pig game shell."""
-    shell = PigShell(Game(), load_scoreboard())
-    shell.cmdloop()
+def main(argv: list[str] | None = None) -> int:
+    """Run the Pig game shell, or a batch run with ``--batch``."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--batch":
+        from pig.batch import main as batch_main
+        return batch_main(argv[1:])
+    make_shell().cmdloop()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import math
+from time import perf_counter
+
 from .game import Game
 
 
@@ -117,3 +120,188 @@ class SmartStrategy:
             threshold = max(threshold, 22)
 
         return "hold" if t >= threshold else "roll"
+
+
+class TranspositionTable:
+    """Bounded cache of searched positions, shared across moves and games.
+
+    Keys are packed ints (see ``SearchStrategy._key``). When full, the
+    oldest entries are dropped first.
+    """
+
+    def __init__(self, max_entries: int = 200_000) -> None:
+        """Create an empty table holding at most ``max_entries`` values."""
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self._data: dict[int, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> float | None:
+        """Return the stored value for ``key``, or None."""
+        v = self._data.get(key)
+        if v is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return v
+
+    def put(self, key: int, value: float) -> None:
+        """Store a value, evicting the oldest entry if the table is full."""
+        data = self._data
+        if key not in data and len(data) >= self.max_entries:
+            del data[next(iter(data))]
+        data[key] = value
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        """Return how many positions are stored."""
+        return len(self._data)
+
+
+# one table for the whole process, so search bots learn across games
+SHARED_TABLE = TranspositionTable()
+
+
+class _OutOfTime(Exception):
+    """Raised inside the search when the move deadline passes."""
+
+
+class SearchStrategy:
+    """Look-ahead bot. Expectiminimax over roll/hold with dice chance nodes.
+
+    Values are the chance that the player to move wins. Each roll uses up
+    one level of depth; at depth 0 a quick estimate is used instead.
+    Depth grows 1, 2, 3, ... until ``max_depth`` or the time budget runs
+    out, and the answer from the deepest finished search is used.
+    """
+
+    MAX_DEPTH = 255          # depth gets 8 bits of the table key
+    MAX_SIDES = 255          # ... the die size 8 more
+    MAX_TARGET = 2**32 - 1   # ... and the target 32
+
+    def __init__(
+        self,
+        max_depth: int = 8,
+        time_budget: float | None = 0.05,
+        table: TranspositionTable | None = None,
+    ) -> None:
+        """Initialize the search bot.
+
+        Args:
+            max_depth (int): Deepest search to try (number of rolls),
+                1 to ``MAX_DEPTH``. Defaults to 8.
+            time_budget (float | None): Seconds allowed per decision.
+                Defaults to 0.05. None searches to ``max_depth`` every
+                time, so the moves don't depend on the machine's speed.
+            table (TranspositionTable | None): Cache to use. Defaults to
+                the process-wide ``SHARED_TABLE``.
+
+        Raises:
+            ValueError: If ``max_depth`` is out of range.
+        """
+        if not 1 <= max_depth <= self.MAX_DEPTH:
+            raise ValueError(f"max_depth must be 1..{self.MAX_DEPTH}")
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.table = table if table is not None else SHARED_TABLE
+        self.last_depth = 0      # deepest search finished on the last move
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def decide(self, game: Game) -> str:
+        """Determine whether to roll or hold by searching ahead.
+
+        Args:
+            game (Game): The current game state.
+
+        Returns:
+            str: Either "roll" or "hold" as the decision.
+
+        Raises:
+            ValueError: If the die has more than ``MAX_SIDES`` sides or
+                the target is above ``MAX_TARGET`` (the table key has no
+                room for them).
+        """
+        me = game.current.score
+        opp = game.opponent.score
+        t = game.turn_points
+        target = game.target
+        sides = getattr(game.dice, "sides", 6)
+        if sides > self.MAX_SIDES or target > self.MAX_TARGET:
+            raise ValueError(f"search needs at most {self.MAX_SIDES} sides "
+                             f"and a target up to {self.MAX_TARGET}")
+
+        if me + t >= target:
+            return "hold"
+        if t == 0:
+            return "roll"
+
+        self._deadline = (math.inf if self.time_budget is None
+                          else perf_counter() + self.time_budget)
+        self._nodes = 0
+        self.last_depth = 0
+        choice = "roll"
+        for depth in range(1, self.max_depth + 1):
+            try:
+                hold_v = self._hold(me, opp, t, depth, target, sides)
+                roll_v = self._roll(me, opp, t, depth, target, sides)
+            except _OutOfTime:
+                break
+            choice = "hold" if hold_v >= roll_v else "roll"
+            self.last_depth = depth
+        return choice
+
+    # ----- search -----
+
+    @staticmethod
+    def _key(me, opp, t, depth, target, sides) -> int:
+        # pack the whole position into one int: fixed-width fields for
+        # the setup and depth at the bottom, then me, opp, t (each below
+        # the target once the position is live) in base ``target``
+        pos = (me * target + opp) * target + t
+        return (pos << 48) | (target << 16) | (sides << 8) | depth
+
+    @staticmethod
+    def _estimate(me, opp, t, target) -> float:
+        """Cheap guess: share of the remaining distance the opponent has."""
+        mine = target - me - t
+        theirs = target - opp
+        return theirs / (mine + theirs)
+
+    def _value(self, me, opp, t, depth, target, sides) -> float:
+        if me + t >= target:
+            return 1.0
+        if depth == 0:
+            return self._estimate(me, opp, t, target)
+
+        self._nodes += 1
+        if not self._nodes & 1023 and perf_counter() > self._deadline:
+            raise _OutOfTime
+
+        key = self._key(me, opp, t, depth, target, sides)
+        hit = self.table.get(key)
+        if hit is not None:
+            return hit
+
+        best = self._roll(me, opp, t, depth, target, sides)
+        if t > 0:
+            best = max(best, self._hold(me, opp, t, depth, target, sides))
+        self.table.put(key, best)
+        return best
+
+    def _hold(self, me, opp, t, depth, target, sides) -> float:
+        if me + t >= target:
+            return 1.0
+        return 1.0 - self._value(opp, me + t, 0, depth - 1, target, sides)
+
+    def _roll(self, me, opp, t, depth, target, sides) -> float:
+        total = 1.0 - self._value(opp, me, 0, depth - 1, target, sides)
+        for face in range(2, sides + 1):
+            total += self._value(me, opp, t + face, depth - 1, target, sides)
+        return total / sides
@@ -0,0 +1,417 @@
+"""Exact win probabilities for Pig, no simulation.
+
+A position is ``(i, j, k)``: the player to move has ``i`` banked, the
+other player ``j``, and ``k`` turn points. The chance the mover wins is
+
+* rolling: ``(1 - P(j, i, 0) + sum(P(i, j, k + f) for f in 2..sides)) / sides``
+* holding (``k > 0``): ``1 - P(j, i + k, 0)``
+* and 1 once ``i + k`` reaches the target (holding wins).
+
+Holding moves to a higher score sum, which is already solved if we go
+from the highest sums down. The only loop left is between ``P(i, j, 0)``
+and ``P(j, i, 0)`` through the bust term, so each score pair is settled
+with a few Newton steps on that one unknown. Every turn-points column is
+one pass with a sliding window over the next ``sides - 1`` values.
+
+:func:`optimal` solves optimal play (both sides maximise), once per
+target and die size. :func:`evaluate` solves a fixed pair of strategies
+instead; ``decide`` is called once per position to compile them.
+:func:`best_response` lets one side maximise against a fixed opponent,
+which tells how exploitable that opponent is
+(``python -m pig.analysis`` checks the shipped difficulties).
+"""
+from __future__ import annotations
+import argparse
+import sys
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Sequence
+
+from pig.game import Game
+
+
+ROLL, HOLD = 1, 0
+TOL = 1e-13           # Newton stops once the pair value moves less than this
+MAX_TARGET = 200      # tables grow with target**3 (200 -> ~4M positions)
+
+
+class ValueTable:
+    """Win chances (and moves) for one mover over every live position.
+
+    Positions ``(i, j, k)`` with ``i + k >= target`` are wins and not
+    stored; everything else lives in one flat ``array("d")``.
+    """
+
+    def __init__(self, target: int, sides: int) -> None:
+        """Allocate the tables for ``target`` and a ``sides``-sided die."""
+        if not 1 <= target <= MAX_TARGET:
+            raise ValueError(f"target must be between 1 and {MAX_TARGET}")
+        if sides < 2:
+            raise ValueError("sides must be >= 2")
+        self.target = target
+        self.sides = sides
+        # offset of the (i, 0, 0) block; each (i, j) column is target - i long
+        self.offsets = [0] * (target + 1)
+        for i in range(target):
+            self.offsets[i + 1] = self.offsets[i] + target * (target - i)
+        size = self.offsets[target]
+        self.values = array("d", bytes(8 * size))
+        self.moves = bytearray(size)          # ROLL / HOLD per position
+
+    def index(self, i: int, j: int, k: int) -> int:
+        """Flat index of a live position."""
+        return self.offsets[i] + j * (self.target - i) + k
+
+    def value(self, i: int, j: int, k: int = 0) -> float:
+        """Chance the mover wins from ``(i, j, k)``."""
+        if i + k >= self.target:
+            return 1.0
+        if j >= self.target:
+            return 0.0
+        return self.values[self.index(i, j, k)]
+
+    def move(self, i: int, j: int, k: int = 0) -> str:
+        """Return the table's move at ``(i, j, k)``: "roll" or "hold"."""
+        if i + k >= self.target:
+            return "hold"
+        return "roll" if self.moves[self.index(i, j, k)] == ROLL else "hold"
+
+    def __len__(self) -> int:
+        """Return the number of positions in the table."""
+        return len(self.moves)
+
+
+Policy = Optional[bytearray]      # compiled moves, or None for "play best"
+
+
+def _column(me: ValueTable, other: ValueTable, policy: Policy,
+            i: int, j: int, b: float) -> tuple[float, float]:
+    """Fill ``me``'s ``(i, j, *)`` column given the bust value ``b``.
+
+    ``b`` is ``(1 - P_other(j, i, 0)) / sides``. Returns the value at
+    ``k = 0`` and its derivative with respect to ``b``.
+    """
+    T, s = me.target, me.sides
+    inv = 1.0 / s
+    L = T - i
+    base = me.offsets[i] + j * L
+    vals, moves = me.values, me.moves
+    ovals = other.values
+    # hold at k: 1 - P_other(j, i + k, 0); that index steps by T - j
+    ostep = T - j
+    oidx = other.offsets[j] + (i + L - 1) * ostep
+
+    v = [0.0] * L + [1.0] * s           # v[k] for k >= L is a win
+    d = [0.0] * (L + s)
+    win_v, win_d = s - 1.0, 0.0         # sums of v / d over k+2 .. k+s
+    for k in range(L - 1, -1, -1):
+        roll = b + inv * win_v
+        if k:
+            hold = 1.0 - ovals[oidx]
+            oidx -= ostep
+        else:
+            hold = s * b                # holding 0 just passes the turn
+        if policy is None:
+            rolls = k == 0 or roll > hold
+        else:
+            rolls = policy[base + k] == ROLL
+        if rolls:
+            val, dv = roll, 1.0 + inv * win_d
+        else:
+            val, dv = hold, (float(s) if k == 0 else 0.0)
+        v[k], d[k] = val, dv
+        vals[base + k] = val
+        moves[base + k] = ROLL if rolls else HOLD
+        win_v += v[k + 1] - v[k + s]    # slide the window down one
+        win_d += d[k + 1] - d[k + s]
+    return v[0], d[0]
+
+
+def _solve(a: ValueTable, b: ValueTable, pol_a: Policy, pol_b: Policy) -> None:
+    """Fill both tables: ``a`` when A moves, ``b`` when B moves.
+
+    Pass the same table twice (with the same policy) for a symmetric
+    solve, e.g. optimal play.
+    """
+    T, s = a.target, a.sides
+    same = a is b
+    guess = 0.5
+    for total in range(2 * T - 2, -1, -1):
+        for i in range(max(0, total - T + 1), min(T - 1, total) + 1):
+            j = total - i
+            if same and i > j:
+                continue                # done together with (j, i)
+            x = guess
+            for _ in range(100):
+                if same and i == j:
+                    ax, dx = _column(a, a, pol_a, i, j, (1.0 - x) / s)
+                    slope = -dx / s - 1.0
+                else:
+                    y, dy = _column(b, a, pol_b, j, i, (1.0 - x) / s)
+                    ax, dx = _column(a, b, pol_a, i, j, (1.0 - y) / s)
+                    slope = dx * dy / (s * s) - 1.0
+                h = ax - x
+                if abs(h) < TOL:
+                    break
+                if slope == 0.0:        # both sides pass forever: call it even
+                    x = 0.5
+                    continue
+                x = min(1.0, max(0.0, x - h / slope))
+            guess = x
+
+
+@lru_cache(maxsize=8)
+def optimal(target: int = 100, sides: int = 6) -> ValueTable:
+    """Win chances under optimal play. Solved once per (target, sides).
+
+    About a second at target 100; small targets are instant.
+    """
+    table = ValueTable(target, sides)
+    _solve(table, table, None, None)
+    return table
+
+
+# ----- fixed strategies -----
+
+class _Seat:
+    __slots__ = ("score",)
+
+    def __init__(self) -> None:
+        self.score = 0
+
+
+class _Dice:
+    __slots__ = ("sides",)
+
+    def __init__(self, sides: int) -> None:
+        self.sides = sides
+
+
+class _Position:
+    """Just enough of a ``Game`` for ``decide`` to read."""
+
+    def __init__(self, target: int, sides: int) -> None:
+        if not 1 <= target <= MAX_TARGET:
+            raise ValueError(f"target must be between 1 and {MAX_TARGET}")
+        if sides < 2:
+            raise ValueError("sides must be >= 2")
+        self.target = target
+        self.dice = _Dice(sides)
+        self.current = _Seat()
+        self.opponent = _Seat()
+        self.turn_points = 0
+        self.players = [self.current, self.opponent]
+        self.current_index = 0
+        self.winner_id = None
+
+
+def compile_policy(decide: Callable, target: int = 100,
+                   sides: int = 6) -> bytearray:
+    """Ask ``decide`` about every live position; returns ROLL/HOLD bytes.
+
+    Laid out like :class:`ValueTable`, so ``policy[table.index(i, j, k)]``
+    is the strategy's move at ``(i, j, k)``.
+    """
+    pos = _Position(target, sides)
+    me, opp = pos.current, pos.opponent
+    out = bytearray()
+    for i in range(target):
+        me.score = i
+        for j in range(target):
+            opp.score = j
+            for k in range(target - i):
+                pos.turn_points = k
+                out.append(ROLL if decide(pos) == "roll" else HOLD)
+    return out
+
+
+def evaluate(pol_a: bytearray, pol_b: bytearray, target: int = 100,
+             sides: int = 6) -> tuple[ValueTable, ValueTable]:
+    """Exact win chances when A plays ``pol_a`` and B plays ``pol_b``.
+
+    Returns ``(a, b)``: ``a.value(i, j, k)`` is A's chance when A is to
+    move, ``b.value(i, j, k)`` is B's chance when B is to move.
+    """
+    a, b = ValueTable(target, sides), ValueTable(target, sides)
+    if len(pol_a) != len(a) or len(pol_b) != len(b):
+        raise ValueError("policies were compiled for another target/dice")
+    _solve(a, b, pol_a, pol_b)
+    return a, b
+
+
+# compiled policies and solved pairs, keyed by strategy settings
+_policies: dict[tuple, bytearray] = {}
+_pairs: dict[tuple, tuple[ValueTable, ValueTable]] = {}
+CACHE_SIZE = 16
+
+
+def _strategy_key(strategy) -> tuple | None:
+    """Class + settings of a strategy, or None if they can't be hashed."""
+    cls = type(strategy)
+    settings = tuple(sorted((k, v) for k, v in vars(strategy).items()
+                            if not k.startswith("_")))
+    key = (cls.__module__, cls.__qualname__, settings)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _remember(cache: dict, key, value) -> None:
+    if len(cache) >= CACHE_SIZE:
+        del cache[next(iter(cache))]      # oldest first
+    cache[key] = value
+
+
+def policy_for(strategy, target: int = 100, sides: int = 6) -> bytearray:
+    """``compile_policy`` for a strategy object, cached by its settings."""
+    key = _strategy_key(strategy)
+    if key is None:
+        return compile_policy(strategy.decide, target, sides)
+    key += (target, sides)
+    pol = _policies.get(key)
+    if pol is None:
+        pol = compile_policy(strategy.decide, target, sides)
+        _remember(_policies, key, pol)
+    return pol
+
+
+def solve_pair(a, b, target: int = 100,
+               sides: int = 6) -> tuple[ValueTable, ValueTable]:
+    """``evaluate`` for two strategy objects, cached like ``policy_for``."""
+    ka, kb = _strategy_key(a), _strategy_key(b)
+    key = None if ka is None or kb is None else (ka, kb, target, sides)
+    if key is not None and key in _pairs:
+        return _pairs[key]
+    tables = evaluate(policy_for(a, target, sides),
+                      policy_for(b, target, sides), target, sides)
+    if key is not None:
+        _remember(_pairs, key, tables)
+    return tables
+
+
+# ----- best response -----
+
+@dataclass(frozen=True)
+class BestResponse:
+    """The strongest counter to one fixed strategy."""
+
+    target: int
+    sides: int
+    policy: bytearray       # the counter's moves, laid out like ValueTable
+    win_first: float        # counter's chance moving first
+    win_second: float       # ... moving second
+
+    @property
+    def win_rate(self) -> float:
+        """Counter's chance over a match with alternating seats."""
+        return (self.win_first + self.win_second) / 2
+
+    @property
+    def exploitability(self) -> float:
+        """How far above an even match the counter gets (0 = unbeatable)."""
+        return self.win_rate - 0.5
+
+
+_responses: dict[tuple, BestResponse] = {}
+
+
+def best_response(opponent, target: int = 100, sides: int = 6) -> BestResponse:
+    """Solve the best counter to ``opponent`` (anything with ``decide``).
+
+    The same kernel as :func:`optimal`, with the opponent's moves fixed
+    to its compiled policy (cached, see :func:`policy_for`).
+    """
+    key = _strategy_key(opponent)
+    if key is not None:
+        key += (target, sides)
+        if key in _responses:
+            return _responses[key]
+    pol = policy_for(opponent, target, sides)
+    me, them = ValueTable(target, sides), ValueTable(target, sides)
+    _solve(me, them, None, pol)
+    res = BestResponse(target, sides, me.moves, me.value(0, 0, 0),
+                       1.0 - them.value(0, 0, 0))
+    if key is not None:
+        _remember(_responses, key, res)
+    return res
+
+
+def exploitability(target: int = 100, sides: int = 6,
+                   difficulties: Sequence[str] = ("easy", "normal", "hard"),
+                   ) -> dict[str, BestResponse]:
+    """Best responses to the shell's bots at each difficulty.
+
+    Search bots ("expert") aren't included: compiling one would run a
+    search for every position.
+    """
+    from pig.shell import _build_brain
+    return {d: best_response(_build_brain(d, target), target, sides)
+            for d in difficulties}
+
+
+# ----- querying a Game -----
+
+def _position(game: Game) -> tuple[int, int, int, int, int]:
+    sides = getattr(game.dice, "sides", 6)
+    return (game.current.score, game.opponent.score, game.turn_points,
+            game.target, sides)
+
+
+def win_probability(game: Game, strategies: Sequence | None = None) -> float:
+    """Chance the player to move in ``game`` wins.
+
+    Args:
+        game (Game): Any game; only scores, turn points, target and the
+            dice's ``sides`` are read.
+        strategies (Sequence | None): ``(player 1's, player 2's)``
+            strategy objects (anything with ``decide``). None means both
+            sides play optimally.
+
+    Returns:
+        float: Exact probability in [0, 1].
+
+    Raises:
+        ValueError: If the target is above ``MAX_TARGET``.
+    """
+    if game.is_over:
+        return 1.0 if game.winner_id == game.current.player_id else 0.0
+    i, j, k, target, sides = _position(game)
+    if strategies is None:
+        return optimal(target, sides).value(i, j, k)
+    mine = strategies[game.current_index]
+    theirs = strategies[1 - game.current_index]
+    a, _ = solve_pair(mine, theirs, target, sides)
+    return a.value(i, j, k)
+
+
+def best_move(game: Game) -> str:
+    """Return the optimal move for the player to move: "roll" or "hold"."""
+    i, j, k, target, sides = _position(game)
+    return optimal(target, sides).move(i, j, k)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print how exploitable each difficulty is."""
+    ap = argparse.ArgumentParser(
+        description="Exploitability of the Pig difficulties.")
+    ap.add_argument("--target", type=int, default=100)
+    ap.add_argument("--sides", type=int, default=6)
+    args = ap.parse_args(argv)
+    try:
+        rows = exploitability(args.target, args.sides)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"target {args.target}: best counter's win rate per difficulty")
+    for name, br in rows.items():
+        print(f"  {name:>6}: {br.win_rate:.4f} "
+              f"(first {br.win_first:.4f}, second {br.win_second:.4f}), "
+              f"exploitability {br.exploitability:+.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Non-interactive (batch) runs of the Pig shell.
+
+Feeds command files or piped stdin through ``PigShell`` with no prompts
+and no pauses. All output is collected in memory and written once at the
+end, and the run reports how many commands per second it managed, so
+recorded sessions double as regression and perf runs.
+"""
+from __future__ import annotations
+import argparse
+import io
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Iterable, TextIO
+
+from pig.dice import Dice
+from pig.game import Game
+from pig.scoreboard import Scoreboard
+from pig.pacing import InstantPacer
+from pig.output import StreamSink
+from pig.shell import DIFFICULTIES, PigShell
+
+
+@dataclass
+class BatchResult:
+    """What a batch run produced."""
+
+    output: str
+    sessions: int
+    commands: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Commands per second (0 if nothing ran)."""
+        return self.commands / self.seconds if self.seconds > 0 else 0.0
+
+
+def run_session(
+    lines: Iterable[str],
+    *,
+    mode: str = "pvp",
+    difficulty: str = "normal",
+    target: int = 100,
+    seed: int | None = None,
+    sb: Scoreboard | None = None,
+) -> tuple[str, int]:
+    """Play one scripted session in a fresh game.
+
+    Blank lines and lines starting with ``#`` are skipped. Stops at the
+    first command that ends the shell (``quit``). The cheat word is
+    turned off (its menu would prompt), so it's just an unknown command.
+
+    With a ``seed`` the dice get their own ``random.Random(seed)`` and
+    search bots play to their full depth with no time limit, so the run
+    is the same on any machine.
+
+    Returns:
+        tuple[str, int]: The captured output and the number of commands run.
+    """
+    game = Game() if seed is None else Game(dice=Dice(rng=random.Random(seed)))
+    game.set_target(target)
+    buf = io.StringIO()
+    count = 0
+    with redirect_stdout(buf):
+        # built inside the redirect so cmd's own writes (help) land in buf
+        shell = PigShell(game, sb if sb is not None else Scoreboard(),
+                         pacer=InstantPacer(), out=StreamSink())
+        shell.persist = False
+        shell._cheat_word = None
+        shell.timed_search = seed is None
+        shell.set_mode(mode, difficulty)
+        shell._print_header()
+        for raw in lines:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            count += 1
+            line = shell.precmd(line)
+            stop = shell.onecmd(line)
+            if shell.postcmd(stop, line):
+                break
+        shell.out.flush()
+    return buf.getvalue(), count
+
+
+def run_batch(
+    scripts: Iterable[Iterable[str]],
+    *,
+    mode: str = "pvp",
+    difficulty: str = "normal",
+    target: int = 100,
+    seed: int | None = None,
+) -> BatchResult:
+    """Run many scripted sessions back to back and time them.
+
+    With a seed, session ``i`` uses ``seed + i`` so every run is repeatable.
+    """
+    parts: list[str] = []
+    sessions = commands = 0
+    start = time.perf_counter()
+    for i, script in enumerate(scripts):
+        out, n = run_session(
+            script, mode=mode, difficulty=difficulty, target=target,
+            seed=None if seed is None else seed + i,
+        )
+        parts.append(out)
+        sessions += 1
+        commands += n
+    elapsed = time.perf_counter() - start
+    return BatchResult("".join(parts), sessions, commands, elapsed)
+
+
+def _positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a whole number: {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the flags shared by ``main.py --batch`` and ``pig.batch``."""
+    ap = argparse.ArgumentParser(
+        description="Run Pig shell commands from files or stdin, no prompts."
+    )
+    ap.add_argument("scripts", nargs="*",
+                    help="command files (one session each); stdin if none")
+    ap.add_argument("--mode", choices=["pvp", "pvc"], default="pvp")
+    ap.add_argument("--diff", choices=DIFFICULTIES,
+                    default="normal", help="computer difficulty (pvc)")
+    ap.add_argument("--target", type=_positive_int, default=100)
+    ap.add_argument("--seed", type=int, default=None,
+                    help="seed dice so runs repeat exactly")
+    ap.add_argument("--stats", action="store_true",
+                    help="print throughput to stderr")
+    ap.add_argument("--quiet", action="store_true",
+                    help="don't write the game output")
+    return ap
+
+
+def main(argv: list[str] | None = None, *,
+         stdin: TextIO | None = None, stdout: TextIO | None = None,
+         stderr: TextIO | None = None) -> int:
+    """Command-line entry point. Returns a process exit code."""
+    args = build_parser().parse_args(argv)
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+
+    if args.scripts:
+        scripts = []
+        for path in args.scripts:
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    scripts.append(fh.read().splitlines())
+            except OSError as e:
+                print(f"can't read {path}: {e}", file=stderr)
+                return 2
+    else:
+        scripts = [stdin.read().splitlines()]
+
+    result = run_batch(scripts, mode=args.mode, difficulty=args.diff,
+                       target=args.target, seed=args.seed)
+    if not args.quiet:
+        stdout.write(result.output)
+        stdout.flush()
+    if args.stats:
+        print(
+            f"{result.sessions} sessions, {result.commands} commands "
+            f"in {result.seconds:.3f}s ({result.rate:.0f} cmd/s)",
+            file=stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,9 @@
 
 from __future__ import annotations
 import os
+from collections import deque
 from typing import Callable, Optional
+from pig.dice import Dice
 from pig.game import Game
 
 
@@ -12,6 +14,44 @@ def cheats_enabled() -> bool:
     return os.getenv("PIG_DEV", "0").lower() in {"1", "true", "yes"}
 
 
+class RiggedDice(Dice):
+    """
+    Wraps the game's dice so cheats can steer the rolls.
+    While no knob is set, ``roll`` *is* the wrapped dice's own method,
+    so idle cheats cost nothing per roll.
+    """
+
+    def __init__(self, inner: Dice) -> None:
+        self.inner = inner
+        self.sides = getattr(inner, "sides", 6)
+        self.queue: deque[int] = deque()     # forced next rolls
+        self.no_bust = False                 # turn 1s into 2s
+        self.bias: Optional[Callable[[], int]] = None
+        self._rigged_roll = self._rigged     # one bound method, kept stable
+        self.roll = inner.roll               # type: ignore[method-assign]
+
+    def refresh(self) -> None:
+        """Pick the bare or rigged roll depending on the knobs."""
+        busy = self.queue or self.no_bust or self.bias is not None
+        self.roll = self._rigged_roll if busy else self.inner.roll
+
+    def _rigged(self) -> int:
+        # 1) forced values first
+        if self.queue:
+            v = self.queue.popleft()
+            if not self.queue:
+                self.refresh()
+            return v
+
+        # 2) biased chooser, if any, else the real dice
+        if self.bias is not None:
+            v = max(1, min(6, int(self.bias())))
+        else:
+            v = self.inner.roll()
+        # 3) optional “no bust”
+        return 2 if (self.no_bust and v == 1) else v
+
+
 class Cheat:
     """
     Small helper that can rig dice and tweak scores.
@@ -21,10 +61,7 @@ class Cheat:
     def __init__(self, game: Game) -> None:
         self.game = game
         self.active = cheats_enabled()
-        self._orig_roll = game.dice.roll
-        self._queue: list[int] = []          # forced next rolls
-        self._no_bust: bool = False          # turn 1s into 2s (simple “no bust”)
-        self._bias: Optional[Callable[[], int]] = None  # callable returning a 1..6
+        self._dice: Optional[RiggedDice] = None   # set once the hook is in
 
         if self.active:
             self._install_hook()
@@ -34,7 +71,8 @@ class Cheat:
     def force_next_roll(self, value: int) -> None:
         if not self.active: return
         v = max(1, min(6, int(value)))
-        self._queue.append(v)
+        self._dice.queue.append(v)
+        self._dice.refresh()
 
     def force_next_rolls(self, *values: int) -> None:
         for v in values:
@@ -42,18 +80,22 @@ class Cheat:
 
     def no_bust_on_ones(self, on: bool = True) -> None:
         if not self.active: return
-        self._no_bust = bool(on)
+        self._dice.no_bust = bool(on)
+        self._dice.refresh()
 
     def bias(self, chooser: Callable[[], int]) -> None:
         """Set a function that returns a biased roll (1..6)."""
         if not self.active: return
-        self._bias = chooser
+        self._dice.bias = chooser
+        self._dice.refresh()
 
     def clear(self) -> None:
         if not self.active: return
-        self._queue.clear()
-        self._no_bust = False
-        self._bias = None
+        d = self._dice
+        d.queue.clear()
+        d.no_bust = False
+        d.bias = None
+        d.refresh()
 
     def add_points(self, player_no: int, pts: int) -> None:
         if not self.active: return
@@ -74,32 +116,22 @@ class Cheat:
     # ---- hook machinery ----
 
     def _install_hook(self) -> None:
-        orig = self._orig_roll
-
-        def rigged_roll() -> int:
-            # 1) forced values first
-            if self._queue:
-                return self._queue.pop(0)
-
-            # 2) biased chooser, if any
-            if self._bias is not None:
-                v = int(self._bias())
-                v = max(1, min(6, v))
-                return 2 if (self._no_bust and v == 1) else v
-
-            # 3) original dice, with optional “no bust”
-            v = orig()
-            if self._no_bust and v == 1:
-                return 2
-            return v
-
-        # replace the dice's roll with our wrapper
-        setattr(self.game.dice, "roll", rigged_roll)
+        # swap the game's dice for a wrapper (the current turn too, if it
+        # shares them); new turns pick it up from game.dice
+        g = self.game
+        self._dice = RiggedDice(g.dice)
+        if g.turn.dice is g.dice:
+            g.turn.dice = self._dice
+        g.dice = self._dice
 
     def uninstall(self) -> None:
         if not self.active: return
-        setattr(self.game.dice, "roll", self._orig_roll)
         self.clear()
+        g, rigged = self.game, self._dice
+        if g.dice is rigged:
+            g.dice = rigged.inner
+        if g.turn.dice is rigged:
+            g.turn.dice = rigged.inner
 
     def arm(self) -> None:
         """Turn cheats on right now (ignores env)."""
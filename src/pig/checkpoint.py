@@ -0,0 +1,212 @@
+"""Long matches that survive being killed, and reruns that cost nothing.
+
+A match is cut into *shards*: ranges of block seeds (``pig.compare``
+blocks, 4 games each) whose counts are added up at the end. A finished
+shard is stored under a hash of everything its result depends on:
+
+    (A's config, B's config, first seed, last seed, target, sides)
+
+where a config is the strategy's class and public settings. The store is
+one JSON file, rewritten atomically (temp file + ``os.replace``) every
+few shards and when the run stops for any reason. So:
+
+* a run that dies resumes from the last checkpoint and only replays
+  the shards that weren't saved;
+* rerunning with strategies that didn't change finds every shard and
+  plays no games at all; change one setting and only that bot's
+  matchups are replayed.
+
+Bots whose settings don't serialize the same way twice (the search bot's
+table, say) simply never hit the cache.
+
+``python -m pig.checkpoint easy hard computer:18 --blocks 20000
+--store run.json`` runs (or resumes) a round-robin.
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+from pig.compare import Comparison, play_block
+
+
+FORMAT = 1      # bump when shard results would come out differently
+
+
+def strategy_config(strategy) -> dict:
+    """Class and public settings of a strategy, as plain data."""
+    cls = type(strategy)
+    settings = {k: v for k, v in vars(strategy).items()
+                if not k.startswith("_")}
+    return {"class": f"{cls.__module__}.{cls.__qualname__}",
+            "settings": json.loads(json.dumps(settings, default=repr))}
+
+
+def shard_key(a, b, lo: int, hi: int, target: int = 100,
+              sides: int = 6) -> str:
+    """Content hash naming the result of blocks ``lo..hi-1`` of A vs B."""
+    data = {"format": FORMAT, "a": strategy_config(a), "b": strategy_config(b),
+            "seeds": [lo, hi], "target": target, "sides": sides}
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ShardStore:
+    """Finished shards on disk, keyed by :func:`shard_key`.
+
+    ``path=None`` keeps everything in memory. A missing or broken file
+    (including JSON that isn't a store) starts empty.
+    """
+
+    def __init__(self, path: str | Path | None = None, every: int = 10,
+                 interval: float = 30.0) -> None:
+        """Open (or start) the store at ``path``."""
+        self.path = Path(path) if path is not None else None
+        self.every = every              # save after this many new shards...
+        self.interval = interval        # ...or this many seconds
+        self.shards: dict[str, dict] = {}
+        self.hits = 0                   # lookups answered from the store
+        self._dirty = 0
+        self._saved_at = time.monotonic()
+        if self.path is not None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if isinstance(data, dict) and data.get("format") == FORMAT \
+                    and isinstance(data.get("shards"), dict):
+                self.shards = data["shards"]
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the shard ``key`` is stored."""
+        return key in self.shards
+
+    def __len__(self) -> int:
+        """Return how many shards are stored."""
+        return len(self.shards)
+
+    def get(self, key: str) -> Comparison | None:
+        """Return the stored result, or None."""
+        entry = self.shards.get(key)
+        if not entry:
+            return None
+        self.hits += 1
+        return Comparison.from_dict(entry["result"])
+
+    def put(self, key: str, result: Comparison, **note) -> None:
+        """Remember a finished shard; saves when a checkpoint is due."""
+        self.shards[key] = {"result": result.to_dict(), **note}
+        self._dirty += 1
+        if (self._dirty >= self.every
+                or time.monotonic() - self._saved_at >= self.interval):
+            self.save()
+
+    def save(self) -> None:
+        """Write the file atomically (no-op in memory or when clean)."""
+        self._saved_at = time.monotonic()
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"format": FORMAT, "shards": self.shards}),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = 0
+
+
+def shard_ranges(blocks: int, shard: int,
+                 seed: int = 0) -> list[tuple[int, int]]:
+    """Cut blocks ``seed .. seed + blocks - 1`` into ``[lo, hi)`` ranges."""
+    return [(lo, min(lo + shard, seed + blocks))
+            for lo in range(seed, seed + blocks, shard)]
+
+
+def run_match(a, b, blocks: int, *, store: ShardStore | None = None,
+              shard: int = 250, seed: int = 0, target: int = 100,
+              sides: int = 6) -> tuple[Comparison, int]:
+    """Play (or look up) ``blocks`` blocks of A vs B.
+
+    Args:
+        a: Strategy object for A.
+        b: Strategy object for B.
+        blocks (int): Blocks in the match (4 games each).
+        store (ShardStore | None): Where finished shards are kept.
+        shard (int): Blocks per shard (the unit of checkpointing).
+        seed (int): Seed of the first block.
+        target (int): Target score.
+        sides (int): Die size.
+
+    Returns:
+        tuple[Comparison, int]: The total, and how many blocks were
+        actually played (0 when everything came from the store).
+    """
+    store = store if store is not None else ShardStore()
+    total, played = Comparison(), 0
+    try:
+        for lo, hi in shard_ranges(blocks, shard, seed):
+            key = shard_key(a, b, lo, hi, target, sides)
+            result = store.get(key)
+            if result is None:
+                result = Comparison()
+                for s in range(lo, hi):
+                    result.add(*play_block(a, b, s, target, sides))
+                played += hi - lo
+                store.put(key, result, seeds=[lo, hi])
+            total.merge(result)
+    finally:
+        store.save()
+    return total, played
+
+
+def round_robin(bots: dict, blocks: int, *, store: ShardStore | None = None,
+                shard: int = 250, seed: int = 0, target: int = 100,
+                sides: int = 6) -> dict[tuple[str, str], Comparison]:
+    """:func:`run_match` for every pair of ``bots`` (name -> strategy)."""
+    store = store if store is not None else ShardStore()
+    return {(x, y): run_match(bots[x], bots[y], blocks, store=store,
+                              shard=shard, seed=seed, target=target,
+                              sides=sides)[0]
+            for x, y in combinations(bots, 2)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    from pig.matchup import bot_from_text
+    ap = argparse.ArgumentParser(
+        description="Resumable round-robin of Pig bots.")
+    ap.add_argument("bots", nargs="+",
+                    help='"easy", "normal", "hard", "computer:18", '
+                         '"smart:12,28"')
+    ap.add_argument("--blocks", type=int, default=10_000,
+                    help="blocks per pair (4 games each)")
+    ap.add_argument("--shard", type=int, default=250)
+    ap.add_argument("--store", type=Path, default=Path("tournament.json"),
+                    help="checkpoint / cache file")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    args = ap.parse_args(argv)
+    try:
+        bots = {text: bot_from_text(text, args.target) for text in args.bots}
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    store = ShardStore(args.store)
+    before = len(store)
+    for (x, y), r in round_robin(bots, args.blocks, store=store,
+                                 shard=args.shard, seed=args.seed,
+                                 target=args.target).items():
+        lo, hi = r.interval
+        print(f"{x:>14} vs {y:<14} {r.rate:.4f}  [{lo:.4f}, {hi:.4f}]  "
+              f"{r.games} games")
+    print(f"{len(store) - before} new shards, {store.hits} reused "
+          f"({args.store})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Compare two strategies by simulation, with as little luck as possible.
+
+Games are played in *blocks* that share one seed:
+
+* **common random numbers** - A vs B, then B vs A with the same rolls:
+  the dice are reseeded per (seat, turn number), so each seat's n-th
+  turn starts from the same rolls whichever bot is sitting there;
+* **antithetic dice** - the same two games again with every roll mirrored
+  (``r -> sides + 1 - r``), so a lucky stream is paired with an unlucky one.
+
+Each block scores A's share of wins in it. Because the luck inside a
+block mostly cancels, block scores vary much less than single games and
+the same confidence interval needs far fewer games. Block ``i`` uses
+seed ``seed + i``, so every block can be replayed on its own.
+
+``python -m pig.compare easy hard --blocks 2000`` prints the estimate.
+"""
+from __future__ import annotations
+import argparse
+import math
+import random
+import sys
+from dataclasses import dataclass, field
+
+from pig.dice import AntitheticDice, Dice
+from pig.game import Game
+
+
+Z95 = 1.959963984540054          # two-sided 95% normal quantile
+
+
+def _turn_seed(seed: int, seat: int, turn: int) -> int:
+    return (seed * 2 + seat) * 1_000_003 + turn
+
+
+def play_game(first, second, dice: Dice, target: int = 100,
+              seed: int | None = None) -> int:
+    """Play one game to the end; returns the winning seat (0 or 1).
+
+    With ``seed``, the dice are reseeded at the start of every turn from
+    ``(seed, seat, turn number)``: each seat's n-th turn gets the same
+    rolls whoever sits there and whatever happened before.
+    """
+    g = Game(target=target, dice=dice)
+    bots = (first.decide, second.decide)
+    turns = [0, 0]
+    while not g.is_over:
+        seat = g.current_index
+        if seed is not None:
+            dice.rng.seed(_turn_seed(seed, seat, turns[seat]))
+            turns[seat] += 1
+        g.play_cpu_turn(bots[seat])
+    return 0 if g.winner_id == g.players[0].player_id else 1
+
+
+def play_block(a, b, seed: int, target: int = 100, sides: int = 6,
+               paired: bool = True,
+               antithetic: bool = True) -> tuple[int, int]:
+    """Play one block; returns ``(A's wins, games)``.
+
+    Without ``paired`` a block is a single game, A's seat alternating
+    with the seed, which is plain Monte Carlo.
+    """
+    if not paired:
+        a_first = seed % 2 == 0
+        seats = (a, b) if a_first else (b, a)
+        won = play_game(*seats, Dice(sides, random.Random(seed)), target)
+        return int(won == (0 if a_first else 1)), 1
+    kinds = (Dice, AntitheticDice) if antithetic else (Dice,)
+    wins = games = 0
+    for kind in kinds:
+        dice = kind(sides, random.Random())
+        wins += play_game(a, b, dice, target, seed) == 0
+        wins += play_game(b, a, dice, target, seed) == 1
+        games += 2
+    return wins, games
+
+
+@dataclass
+class Comparison:
+    """A's win rate against B, with a 95% confidence interval."""
+
+    blocks: int = 0
+    games: int = 0
+    wins: int = 0
+    _sum: float = field(default=0.0, repr=False)     # of block scores
+    _sumsq: float = field(default=0.0, repr=False)
+
+    def add(self, wins: int, games: int) -> None:
+        """Count one block."""
+        score = wins / games
+        self.blocks += 1
+        self.games += games
+        self.wins += wins
+        self._sum += score
+        self._sumsq += score * score
+
+    def merge(self, other: "Comparison") -> None:
+        """Add another run's blocks to this one."""
+        self.blocks += other.blocks
+        self.games += other.games
+        self.wins += other.wins
+        self._sum += other._sum
+        self._sumsq += other._sumsq
+
+    def to_dict(self) -> dict:
+        """Plain counts (for saving)."""
+        return {"blocks": self.blocks, "games": self.games, "wins": self.wins,
+                "sum": self._sum, "sumsq": self._sumsq}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Comparison":
+        """Rebuild from :meth:`to_dict` output."""
+        return cls(data["blocks"], data["games"], data["wins"],
+                   data["sum"], data["sumsq"])
+
+    @property
+    def rate(self) -> float:
+        """A's share of the games won."""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the rate, from the spread of block scores."""
+        n = self.blocks
+        if n < 2:
+            return math.inf
+        mean = self._sum / n
+        var = max(0.0, (self._sumsq - n * mean * mean) / (n - 1))
+        return math.sqrt(var / n)
+
+    @property
+    def half_width(self) -> float:
+        """Half the width of the 95% interval."""
+        return Z95 * self.stderr
+
+    @property
+    def interval(self) -> tuple[float, float]:
+        """95% confidence interval for the rate."""
+        h = self.half_width
+        return max(0.0, self.rate - h), min(1.0, self.rate + h)
+
+
+def compare(a, b, blocks: int = 1000, *, seed: int = 0, target: int = 100,
+            sides: int = 6, paired: bool = True,
+            antithetic: bool = True) -> Comparison:
+    """Estimate A's win rate against B.
+
+    Args:
+        a: Strategy object (anything with ``decide``).
+        b: The other strategy.
+        blocks (int): Blocks to play (4 games each by default).
+        seed (int): Seed of block 0; block ``i`` uses ``seed + i``.
+        target (int): Target score.
+        sides (int): Die size.
+        paired (bool): Same dice for both seat orders (CRN). False plays
+            one plain game per block.
+        antithetic (bool): Also play mirrored dice (needs ``paired``).
+
+    Returns:
+        Comparison: The estimate and its interval.
+    """
+    result = Comparison()
+    for i in range(blocks):
+        result.add(*play_block(a, b, seed + i, target, sides, paired,
+                               antithetic))
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    from pig.matchup import bot_from_text
+    ap = argparse.ArgumentParser(description="Compare two Pig bots.")
+    ap.add_argument("a", help='"easy", "normal", "hard", "computer:18", '
+                              '"smart:12,28"')
+    ap.add_argument("b")
+    ap.add_argument("--blocks", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    ap.add_argument("--plain", action="store_true",
+                    help="plain Monte Carlo (no shared or mirrored dice)")
+    ap.add_argument("--no-antithetic", action="store_true")
+    args = ap.parse_args(argv)
+    try:
+        a = bot_from_text(args.a, args.target)
+        b = bot_from_text(args.b, args.target)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    r = compare(a, b, args.blocks, seed=args.seed, target=args.target,
+                paired=not args.plain, antithetic=not args.no_antithetic)
+    lo, hi = r.interval
+    print(f"{args.a} vs {args.b}: {r.rate:.4f}  95% CI [{lo:.4f}, {hi:.4f}]  "
+          f"({r.games} games)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,12 +6,120 @@ import random
 class Dice:
     """A standard six-sided dice."""
 
-    def __init__(self, sides: int = 6) -> None:
-        """Create a dice with a given number of sides (default 6)."""
+    def __init__(self, sides: int = 6,
+                 rng: random.Random | None = None) -> None:
+        """Create a dice with a given number of sides (default 6).
+
+        Pass ``rng`` (e.g. ``random.Random(seed)``) to give the dice its
+        own reproducible stream; by default (None) they share the global
+        one.
+        """
         if sides < 2:
             raise ValueError("Dice must have at least 2 sides.")
         self.sides = sides
+        self.rng = rng
 
     def roll(self) -> int:
         """Roll the dice and return a value between 1 and `sides`."""
-        return random.randint(1, self.sides)
\ No newline at end of file
+        return (self.rng or random).randint(1, self.sides)
+
+
+class AntitheticDice(Dice):
+    """Mirror image of a seeded ``Dice``: roll ``r`` becomes ``sides + 1 - r``.
+
+    Still a fair die, but paired with ``Dice`` on the same seed its rolls
+    are as far apart as possible, which cancels out luck in comparisons.
+    """
+
+    def roll(self) -> int:
+        """Roll and mirror."""
+        return self.sides + 1 - (self.rng or random).randint(1, self.sides)
+
+
+class ScriptedDice(Dice):
+    """Dice that hand out a pre-recorded sequence, one roll per byte.
+
+    Made for load tests: build the same million-roll workload once with
+    :func:`write_script`, then replay it on every build with
+    ``Game(dice=ScriptedDice.open(path))``. The file is memory-mapped and
+    nothing is parsed: opening it makes one C-speed pass over the bytes to
+    check every roll is in range, and after that each roll is a single
+    byte read straight from the mapping.
+    """
+
+    def __init__(self, data, sides: int = 6, loop: bool = False) -> None:
+        """Wrap a bytes-like sequence of rolls (checked once, not per roll)."""
+        super().__init__(sides)
+        self._mmap = None
+        view = memoryview(data).cast("B")
+        if not len(view) or min(view) < 1 or max(view) > sides:
+            empty = not len(view)
+            view.release()          # or the caller can't close ``data``
+            if empty:
+                raise ValueError("Dice script is empty.")
+            raise ValueError(f"Dice script has rolls outside 1..{sides}.")
+        self._view = view
+        self.loop = loop
+        self._next = iter(self._view).__next__
+
+    @classmethod
+    def open(cls, path, sides: int = 6, loop: bool = False) -> "ScriptedDice":
+        """Memory-map a script file written by :func:`write_script`."""
+        import mmap
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:          # zero-length file
+                raise ValueError("Dice script is empty.") from None
+        try:
+            dice = cls(mm, sides, loop)
+        except BaseException:
+            mm.close()
+            raise
+        dice._mmap = mm
+        return dice
+
+    def __len__(self) -> int:
+        """Return the number of rolls in the script."""
+        return len(self._view)
+
+    def roll(self) -> int:
+        """Return the next recorded roll."""
+        try:
+            return self._next()
+        except StopIteration:
+            if not self.loop:
+                raise EOFError(
+                    f"Dice script ran out after {len(self._view)} rolls."
+                ) from None
+            self._next = iter(self._view).__next__
+            return self._next()
+
+    def rewind(self) -> None:
+        """Start the script over from the first roll."""
+        self._next = iter(self._view).__next__
+
+    def close(self) -> None:
+        """Release the file mapping (if any)."""
+        self._next = iter(()).__next__
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "ScriptedDice":
+        """Use as a context manager; the mapping is closed on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the mapping."""
+        self.close()
+
+
+def write_script(path, rolls: int, sides: int = 6,
+                 seed: int | None = None) -> None:
+    """Write ``rolls`` random rolls to ``path`` as a dice script."""
+    rng = random.Random(seed)
+    data = bytes(rng.randint(1, sides) for _ in range(rolls))
+    with open(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,260 @@
+"""Append-only event log for a Pig game, plus a replayer.
+
+Events are stored as small ints in an ``array`` so a long game costs a
+couple of bytes per action:
+
+* ``1..sides`` — a roll of that value
+* ``HOLD``, ``SWITCH``, ``WIN`` — what happened after a roll or hold
+* ``RESET`` / ``RESET_CLEAR`` — ``Game.reset`` with/without names kept
+* ``TARGET`` followed by the new target value
+* ``UNDO`` / ``REDO`` — ``Game.undo`` / ``Game.redo`` (one per step)
+* ``RENAME`` followed by an index into ``EventLog.renames``, which holds
+  the ``(player number, new name)`` pairs
+
+The header keeps what's needed to rebuild the game from scratch: the
+starting target, player names, dice sides and the seed (if any).
+"""
+from __future__ import annotations
+import random
+from array import array
+from typing import Iterator
+
+from pig.dice import Dice
+from pig.game import Game
+from pig.player import Player
+
+
+HOLD = 0
+SWITCH = -1
+WIN = -2
+RESET = -3
+RESET_CLEAR = -4
+TARGET = -5
+UNDO = -6
+REDO = -7
+RENAME = -8
+
+_NAMES = {HOLD: "hold", SWITCH: "switch", WIN: "win",
+          RESET: "reset", RESET_CLEAR: "reset", TARGET: "target",
+          UNDO: "undo", REDO: "redo", RENAME: "rename"}
+
+
+class EventLog:
+    """Compact history of one game. ``Game`` appends to it as it plays."""
+
+    def __init__(
+        self,
+        target: int = 100,
+        players: tuple[str, str] = ("Player 1", "Player 2"),
+        sides: int = 6,
+        seed: int | None = None,
+    ) -> None:
+        """Start an empty log for a game with these settings."""
+        self.start_target = target
+        self.players = tuple(players)
+        self.sides = sides
+        self.seed = seed
+        self.codes = array("i")
+        self.renames: list[tuple[int, str]] = []   # (player no, name)
+        self.count = 0        # logical events (TARGET + value is one)
+
+    # ---- writers (called by Game) ----
+
+    def roll(self, value: int) -> None:
+        """Log a roll of ``value``."""
+        self.codes.append(value)
+        self.count += 1
+
+    def hold(self) -> None:
+        """Log a hold."""
+        self.codes.append(HOLD)
+        self.count += 1
+
+    def switch(self) -> None:
+        """Log the turn passing to the other player."""
+        self.codes.append(SWITCH)
+        self.count += 1
+
+    def win(self) -> None:
+        """Log the game being won."""
+        self.codes.append(WIN)
+        self.count += 1
+
+    def reset(self, keep_names: bool = True) -> None:
+        """Log a ``Game.reset`` (with or without the names kept)."""
+        self.codes.append(RESET if keep_names else RESET_CLEAR)
+        self.count += 1
+
+    def target(self, value: int) -> None:
+        """Log a new target score."""
+        self.codes.extend((TARGET, value))
+        self.count += 1
+
+    def rename(self, player_no: int, name: str) -> None:
+        """Log player ``player_no`` (1 or 2) being renamed to ``name``."""
+        self.codes.extend((RENAME, len(self.renames)))
+        self.renames.append((player_no, name))
+        self.count += 1
+
+    def undo(self) -> None:
+        """Log one ``Game.undo`` step."""
+        self.codes.append(UNDO)
+        self.count += 1
+
+    def redo(self) -> None:
+        """Log one ``Game.redo`` step."""
+        self.codes.append(REDO)
+        self.count += 1
+
+    # ---- readers ----
+
+    def __len__(self) -> int:
+        """Return the number of logged events."""
+        return self.count
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        """Yield ``(code, arg)`` pairs; only TARGET and RENAME use ``arg``."""
+        codes = self.codes
+        i, n = 0, len(codes)
+        while i < n:
+            c = codes[i]
+            if c in (TARGET, RENAME):
+                yield c, codes[i + 1]
+                i += 2
+            else:
+                yield c, 0
+                i += 1
+
+    def describe(self) -> list[str]:
+        """Readable lines, e.g. ``["roll 4", "hold", "switch"]``."""
+        out = []
+        for code, arg in self:
+            if code > 0:
+                out.append(f"roll {code}")
+            elif code == TARGET:
+                out.append(f"target {arg}")
+            elif code == RENAME:
+                player_no, name = self.renames[arg]
+                out.append(f"rename {player_no} {name}")
+            else:
+                out.append(_NAMES[code])
+        return out
+
+    def to_dict(self) -> dict:
+        """Plain dict for saving as JSON."""
+        return {
+            "target": self.start_target,
+            "players": list(self.players),
+            "sides": self.sides,
+            "seed": self.seed,
+            "events": self.codes.tolist(),
+            "renames": [list(r) for r in self.renames],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EventLog":
+        """Rebuild a log saved with ``to_dict``."""
+        log = cls(
+            target=data.get("target", 100),
+            players=tuple(data.get("players", ("Player 1", "Player 2"))),
+            sides=data.get("sides", 6),
+            seed=data.get("seed"),
+        )
+        log.codes.extend(data.get("events", []))
+        log.renames = [(int(no), str(name))
+                       for no, name in data.get("renames", [])]
+        log.count = sum(1 for _ in log)
+        return log
+
+
+def record(game: Game, seed: int | None = None) -> EventLog:
+    """Start logging ``game`` from its current (fresh) state.
+
+    If a seed is given, the game's dice get their own
+    ``random.Random(seed)`` (the global RNG is left alone) and the seed is
+    kept in the log header. Dice that aren't ``Dice`` (test doubles, say)
+    are left as they are.
+    """
+    if seed is not None and isinstance(game.dice, Dice):
+        game.dice.rng = random.Random(seed)
+    log = EventLog(
+        target=game.target,
+        players=(game.players[0].name, game.players[1].name),
+        sides=getattr(game.dice, "sides", 6),
+        seed=seed,
+    )
+    game.events = log
+    return log
+
+
+class _Feed:
+    """Stands in for the dice during replay: hands back logged values."""
+
+    def __init__(self, sides: int) -> None:
+        self.sides = sides
+        self.value = 0
+
+    def roll(self) -> int:
+        return self.value
+
+
+def replay(log: EventLog, upto: int | None = None) -> Game:
+    """Rebuild the game described by ``log`` without rolling any dice.
+
+    Args:
+        log: The event log to play back.
+        upto: Stop after this many events (default: all of them).
+
+    Raises:
+        ValueError: If the log doesn't follow the game rules (e.g. a
+            ``win`` where the rules say the turn switches).
+    """
+    feed = _Feed(log.sides)
+    game = Game(
+        target=log.start_target,
+        dice=feed,  # type: ignore[arg-type]
+        players=[Player(log.players[0]), Player(log.players[1])],
+    )
+    if UNDO in log.codes:
+        # undo as far back as the live game could (it never went further)
+        game.enable_undo(max(1, len(log)))
+    limit = len(log) if upto is None else upto
+    done = 0
+    expect: int | None = None   # SWITCH/WIN the rules require next
+    for code, arg in log:
+        if done >= limit:
+            break
+        done += 1
+        if expect is not None:
+            if code != expect:
+                raise ValueError(
+                    f"event {done}: log says {_NAMES.get(code, code)}, "
+                    f"rules say {_NAMES[expect]}"
+                )
+            expect = None
+            continue
+        if code > 0:
+            feed.value = code
+            game.roll()
+            if code == 1:
+                expect = SWITCH
+        elif code == HOLD:
+            game.hold()
+            expect = WIN if game.is_over else SWITCH
+        elif code in (RESET, RESET_CLEAR):
+            game.reset(keep_names=(code == RESET))
+        elif code == TARGET:
+            game.set_target(arg)
+        elif code == RENAME:
+            game.rename(*log.renames[arg])
+        elif code == UNDO:
+            if not game.undo():
+                raise ValueError(f"event {done}: nothing to undo")
+        elif code == REDO:
+            if not game.redo():
+                raise ValueError(f"event {done}: nothing to redo")
+        else:
+            raise ValueError(f"event {done}: unexpected {_NAMES[code]}")
+    game.dice = Dice(log.sides)
+    game.turn.dice = game.dice
+    return game
@@ -1,10 +1,15 @@
 """Core game loop logic for Pig."""
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 from pig.dice import Dice
 from pig.player import Player
 from pig.turn import Turn
 
+if TYPE_CHECKING:
+    from pig.events import EventLog
+
 
 @dataclass
 class Game:
@@ -18,8 +23,14 @@ class Game:
     current_index: int = 0
     turn_points: int = 0
     winner_id: str | None = None
+    # optional history; None means nothing is recorded (no cost)
+    events: EventLog | None = None
+    # how many roll/hold steps undo() can go back; 0 turns undo off
+    undo_depth: int = 0
     # not passed in by callers; created on init/reset/switch
     turn: Turn | None = field(default=None, init=False)
+    _undo: deque | None = field(default=None, init=False, repr=False)
+    _redo: deque | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         """Initialize transient turn state after dataclass init.
@@ -28,6 +39,8 @@ class Game:
         """
         # start with Player 1
         self.turn = Turn(self.current, self.dice)
+        if self.undo_depth:
+            self.enable_undo(self.undo_depth)
 
     # --- convenience bits the UI can use ---
 
@@ -74,6 +87,8 @@ class Game:
         if new_target < 1:
             raise ValueError("target must be >= 1")
         self.target = new_target
+        if self.events is not None:
+            self.events.target(new_target)
 
     def rename(self, player_no: int, new_name: str) -> None:
         """Rename a player in the game.
@@ -89,6 +104,8 @@ class Game:
         if player_no not in (1, 2):
             raise ValueError("player_no must be 1 or 2")
         self.players[player_no - 1].change_name(new_name)
+        if self.events is not None:
+            self.events.rename(player_no, self.players[player_no - 1].name)
 
     def snapshot(self) -> dict:
         """Small dict the UI can print or log."""
@@ -100,6 +117,90 @@ class Game:
             "winner": (self.get_winner().name if self.is_over else None),
         }
 
+    # --- compact state + undo/redo ---
+
+    def state(self) -> tuple[int, int, int, int, int]:
+        """Compact state: (current_index, turn_points, score1, score2, winner).
+
+        ``winner`` is the winning player's index, or -1 while playing.
+        """
+        p1, p2 = self.players
+        if self.winner_id is None:
+            won = -1
+        else:
+            won = 0 if p1.player_id == self.winner_id else 1
+        return (self.current_index, self.turn_points, p1.score, p2.score, won)
+
+    def restore(self, state: tuple[int, int, int, int, int]) -> None:
+        """Put the game back to a ``state()`` tuple (names, target kept)."""
+        idx, points, s1, s2, won = state
+        self.players[0].score = s1
+        self.players[1].score = s2
+        self.current_index = idx
+        self.turn_points = points
+        self.winner_id = None if won < 0 else self.players[won].player_id
+        self.turn = Turn(self.current, self.dice)
+        self.turn.points = points
+
+    def enable_undo(self, depth: int = 50) -> None:
+        """Keep the last ``depth`` roll/hold steps so they can be undone."""
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.undo_depth = depth
+        self._undo = deque(self._undo or (), maxlen=depth)
+        self._redo = deque(self._redo or (), maxlen=depth)
+
+    def history(self) -> list[tuple[int, int, int, int, int]]:
+        """Undoable states, oldest first (the current state not included)."""
+        return list(self._undo) if self._undo is not None else []
+
+    def can_undo(self) -> bool:
+        """Return True if there is a step to undo."""
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        """Return True if there is an undone step to redo."""
+        return bool(self._redo)
+
+    def undo(self) -> bool:
+        """Step back one roll/hold. Returns False if there's nothing to undo.
+
+        Undo and redo steps go in the event log too, so replaying it ends
+        where the game is now.
+        """
+        if not self._undo:
+            return False
+        self._redo.append(self.state())
+        self.restore(self._undo.pop())
+        if self.events is not None:
+            self.events.undo()
+        return True
+
+    def redo(self) -> bool:
+        """Re-apply the last undone step. Returns False if there's none."""
+        if not self._redo:
+            return False
+        self._undo.append(self.state())
+        self.restore(self._redo.pop())
+        if self.events is not None:
+            self.events.redo()
+        return True
+
+    def rewind(self, steps: int) -> int:
+        """Undo up to ``steps`` times. Returns how many steps were undone."""
+        done = 0
+        while done < steps and self.undo():
+            done += 1
+        return done
+
+    def _remember(self, snapshot: tuple | None = None) -> None:
+        # ``snapshot``: the state() taken before the step, if it was
+        # taken early (a roll only counts once the dice have answered)
+        if self._undo is not None:
+            self._undo.append(snapshot if snapshot is not None
+                              else self.state())
+            self._redo.clear()
+
     # --- core rules ---
 
     def roll(self) -> int:
@@ -107,15 +208,23 @@ class Game:
         if self.winner_id is not None:
             return 0  # game is done
 
-        value = self.turn.roll()
+        before = self.state() if self._undo is not None else None
+        value = self.turn.roll()          # the dice may raise (EOFError...)
+        self._remember(before)
+        log = self.events
 
         if self.turn.finished and self.turn.busted:
             # rolled a 1 — lose turn points and switch
             self.turn_points = 0
             self._switch()
             self.turn = Turn(self.current, self.dice)
+            if log is not None:
+                log.roll(value)
+                log.switch()
         else:
             self.turn_points = self.turn.points
+            if log is not None:
+                log.roll(value)
 
         return value
 
@@ -124,15 +233,23 @@ class Game:
         if self.winner_id is not None:
             return
 
+        self._remember()
         self.turn.hold()
         self.turn_points = 0
+        log = self.events
+        if log is not None:
+            log.hold()
 
         if self.current.score >= self.target:
             self.winner_id = self.current.player_id
+            if log is not None:
+                log.win()
             return
 
         self._switch()
         self.turn = Turn(self.current, self.dice)
+        if log is not None:
+            log.switch()
 
     def reset(self, *, keep_names: bool = True) -> None:
         """Reset scores/turn. Keep player names if asked."""
@@ -145,6 +262,11 @@ class Game:
         self.turn_points = 0
         self.winner_id = None
         self.turn = Turn(self.current, self.dice)
+        if self._undo is not None:
+            self._undo.clear()
+            self._redo.clear()
+        if self.events is not None:
+            self.events.reset(keep_names)
 
     def _switch(self) -> None:
         self.current_index = 1 - self.current_index
@@ -0,0 +1,329 @@
+"""Streaming histograms of how bots play, in constant memory.
+
+A :class:`GameStats` sink keeps four fixed-size histograms:
+
+* ``rolls_per_turn`` - rolls made in each turn;
+* ``turns_per_game`` - turns in each finished game;
+* ``busts_per_game`` - turns lost to a 1 in each finished game;
+* ``margin`` - winner's score minus the runner-up's.
+
+Each is a bincount-style ``array("q")``; values past the last bin are
+counted in it (with the exact sum kept for the mean), so memory stays
+the same whether you feed it ten games or a billion rolls. Sinks add up
+with :meth:`GameStats.merge` (e.g. one per worker process) and round-trip
+through JSON.
+
+Feed it from a loop (:meth:`GameStats.play`) or, like ``pig.metrics``,
+hook ``Game.roll``/``hold`` with :func:`enable` so every game counts,
+human turns included. A game is recorded as soon as it has a winner;
+unfinished ones are tracked through a weak reference and forgotten when
+they are reset or garbage-collected.
+
+``python -m pig.histograms easy hard --games 10000 --json stats.json``
+prints a summary.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+import weakref
+from array import array
+from pathlib import Path
+
+from pig import hooks
+
+ROLL_BINS = 64
+TURN_BINS = 256
+BUST_BINS = 128
+MARGIN_BINS = 256
+
+
+class Histogram:
+    """Counts per integer value; the last bin takes everything above."""
+
+    def __init__(self, bins: int) -> None:
+        """Make ``bins`` empty bins (values 0 .. bins - 1)."""
+        if bins < 1:
+            raise ValueError("need at least one bin")
+        self.counts = array("q", bytes(8 * bins))
+        self.total = 0          # values added
+        self.sum = 0            # their exact sum (not clipped)
+
+    def add(self, value: int, n: int = 1) -> None:
+        """Count ``value`` (a non-negative int) ``n`` times."""
+        last = len(self.counts) - 1
+        self.counts[value if value < last else last] += n
+        self.total += n
+        self.sum += value * n
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram of the same size."""
+        if len(other.counts) != len(self.counts):
+            raise ValueError("histograms have different sizes")
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.total += other.total
+        self.sum += other.sum
+
+    @property
+    def mean(self) -> float:
+        """Average value (0 if empty)."""
+        return self.sum / self.total if self.total else 0.0
+
+    def quantile(self, q: float) -> int:
+        """Smallest value with at least ``q`` of the counts at or below it."""
+        need, seen = q * self.total, 0
+        for value, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= need:
+                return value
+        return len(self.counts) - 1
+
+    def to_dict(self) -> dict:
+        """Plain data (for JSON). Trailing empty bins are left out."""
+        counts = list(self.counts)
+        while counts and not counts[-1]:
+            counts.pop()
+        return {"bins": len(self.counts), "total": self.total,
+                "sum": self.sum, "counts": counts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        """Rebuild from :meth:`to_dict` output."""
+        h = cls(data["bins"])
+        for i, c in enumerate(data["counts"]):
+            h.counts[i] = c
+        h.total, h.sum = data["total"], data["sum"]
+        return h
+
+
+class GameStats:
+    """Histograms of turns and games, fed one turn at a time."""
+
+    NAMES = ("rolls_per_turn", "turns_per_game", "busts_per_game", "margin")
+
+    def __init__(self) -> None:
+        """Start with every histogram empty."""
+        self.rolls_per_turn = Histogram(ROLL_BINS)
+        self.turns_per_game = Histogram(TURN_BINS)
+        self.busts_per_game = Histogram(BUST_BINS)
+        self.margin = Histogram(MARGIN_BINS)
+        self.busts = 0                   # turns that ended on a 1
+        # id(game) -> (weakref to it, [turns, busts, rolls this turn]);
+        # an entry goes when its game ends, is reset or is garbage
+        self._open: dict[int, tuple[weakref.ref, list[int]]] = {}
+
+    def __getstate__(self) -> dict:
+        """Pickle the counts only (games in progress stay behind)."""
+        state = self.__dict__.copy()
+        state["_open"] = {}
+        return state
+
+    @property
+    def bust_rate(self) -> float:
+        """Share of turns lost to a 1."""
+        turns = self.rolls_per_turn.total
+        return self.busts / turns if turns else 0.0
+
+    def _tally(self, game) -> list[int]:
+        key = id(game)
+        entry = self._open.get(key)
+        if entry is not None and entry[0]() is game:
+            return entry[1]
+        opened = self._open
+
+        def gone(ref, key=key):
+            if key in opened and opened[key][0] is ref:
+                del opened[key]
+
+        tally = [0, 0, 0]
+        opened[key] = (weakref.ref(game, gone), tally)
+        return tally
+
+    def _end_turn(self, game, rolls: int, bust: bool) -> None:
+        self.rolls_per_turn.add(rolls)
+        self.busts += bust
+        if game is None:
+            return
+        tally = self._tally(game)
+        tally[0] += 1
+        tally[1] += bust
+        tally[2] = 0
+        if game.winner_id is not None:
+            self.end_game(game)
+
+    def add_turn(self, summary: dict, game=None) -> None:
+        """Count one turn from a ``Game.play_cpu_turn`` summary.
+
+        Pass the ``game`` to also count it towards that game's totals;
+        the game is recorded once it has a winner.
+        """
+        rolls = sum(1 for step in summary["actions"]
+                    if step["action"] == "roll")
+        self._end_turn(game, rolls, summary["ended"] == "bust")
+
+    def on_roll(self, game, value: int) -> None:
+        """Count a ``Game.roll`` (a 1 ends the turn)."""
+        if not value:
+            return                       # the game was already over
+        tally = self._tally(game)
+        tally[2] += 1
+        if value == 1:
+            self._end_turn(game, tally[2], True)
+
+    def on_hold(self, game) -> None:
+        """Count a ``Game.hold`` that ended a turn (and maybe the game)."""
+        self._end_turn(game, self._tally(game)[2], False)
+
+    def drop(self, game) -> None:
+        """Forget an unfinished game (abandoned or reset)."""
+        self._open.pop(id(game), None)
+
+    def end_game(self, game) -> None:
+        """Record a finished game (its turns, busts and winning margin)."""
+        entry = self._open.pop(id(game), None)
+        turns, busts = entry[1][:2] if entry else (0, 0)
+        self.turns_per_game.add(turns)
+        self.busts_per_game.add(busts)
+        scores = sorted((p.score for p in game.players), reverse=True)
+        self.margin.add(scores[0] - scores[1] if len(scores) > 1
+                        else scores[0])
+
+    def play(self, game, bots) -> None:
+        """Play ``game`` to the end with one strategy per seat, counting."""
+        deciders = [b.decide for b in bots]
+        while not game.is_over:
+            summary = game.play_cpu_turn(deciders[game.current_index])
+            self.add_turn(summary, game)
+
+    def merge(self, other: "GameStats") -> None:
+        """Add another sink's counts (games still open there are skipped)."""
+        for name in self.NAMES:
+            getattr(self, name).merge(getattr(other, name))
+        self.busts += other.busts
+
+    def to_dict(self) -> dict:
+        """Plain data (for JSON)."""
+        out = {name: getattr(self, name).to_dict() for name in self.NAMES}
+        out["busts"] = self.busts
+        return out
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameStats":
+        """Rebuild from :meth:`to_dict` output."""
+        stats = cls()
+        for name in cls.NAMES:
+            setattr(stats, name, Histogram.from_dict(data[name]))
+        stats.busts = data["busts"]
+        return stats
+
+    def save(self, path: str | Path) -> None:
+        """Write the counts as JSON."""
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "GameStats":
+        """Read counts written by :meth:`save`."""
+        text = Path(path).read_text(encoding="utf-8")
+        return cls.from_dict(json.loads(text))
+
+
+TAG = "histograms"
+_sink: GameStats | None = None
+
+
+def is_enabled() -> bool:
+    """Return True if ``Game`` is hooked."""
+    return hooks.is_wrapped(TAG)
+
+
+def enable(stats: GameStats) -> None:
+    """Send every roll and hold of every ``Game`` to ``stats``.
+
+    Human and computer turns alike are counted, until :func:`disable`.
+    Only one sink can be hooked at a time; asking for another raises
+    ``RuntimeError``. Don't also feed the hooked sink with
+    :meth:`GameStats.play`, or every turn is counted twice.
+    """
+    global _sink
+    if is_enabled():
+        if stats is not _sink:
+            raise RuntimeError("another GameStats is already hooked")
+        return
+    from pig.game import Game
+
+    def rolled(fn):
+        def wrapper(self):
+            value = fn(self)
+            stats.on_roll(self, value)
+            return value
+        return wrapper
+
+    def held(fn):
+        def wrapper(self):
+            playing = self.winner_id is None
+            fn(self)
+            if playing:
+                stats.on_hold(self)
+        return wrapper
+
+    def reset(fn):
+        def wrapper(self, *args, **kwargs):
+            stats.drop(self)
+            return fn(self, *args, **kwargs)
+        return wrapper
+
+    _sink = stats
+    hooks.wrap(Game, "roll", TAG, rolled)
+    hooks.wrap(Game, "hold", TAG, held)
+    hooks.wrap(Game, "reset", TAG, reset)
+
+
+def disable() -> None:
+    """Remove the hooks (counts collected so far are kept)."""
+    global _sink
+    hooks.unwrap(TAG)
+    _sink = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    import random
+    from pig.dice import Dice
+    from pig.game import Game
+    from pig.matchup import bot_from_text
+    ap = argparse.ArgumentParser(description="Histograms of bot-vs-bot games.")
+    ap.add_argument("a", help='"easy", "normal", "hard", "computer:18", '
+                              '"smart:12,28"')
+    ap.add_argument("b")
+    ap.add_argument("--games", type=int, default=10_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    ap.add_argument("--json", type=Path, default=None,
+                    help="write the counts here")
+    args = ap.parse_args(argv)
+    try:
+        bots = (bot_from_text(args.a, args.target),
+                bot_from_text(args.b, args.target))
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    dice = Dice(6, random.Random(args.seed))
+    stats = GameStats()
+    for n in range(args.games):
+        stats.play(Game(target=args.target, dice=dice),
+                   bots if n % 2 == 0 else bots[::-1])
+    for name in GameStats.NAMES:
+        h = getattr(stats, name)
+        print(f"{name:>15}: mean {h.mean:6.2f}  median {h.quantile(0.5):>3}  "
+              f"90% {h.quantile(0.9):>3}")
+    print(f"{'bust rate':>15}: {stats.bust_rate:.3f} of turns")
+    if args.json:
+        stats.save(args.json)
+        print(f"counts written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""One registry for the opt-in method wrappers (timers, metrics, stats).
+
+``pig.instrument``, ``pig.metrics`` and ``pig.histograms`` all wrap the
+same hot methods (``Game.roll``, ``Game.hold``, the strategies'
+``decide``...). If each saved its own "original" and put it back on
+``disable()``, turning them off in the wrong order would strip or strand
+the other's wrappers. Here every wrapped attribute keeps the real
+original plus an ordered list of layers, each tagged with its owner;
+adding or removing a layer rebuilds the chain from the original, so any
+mix of modules can come and go in any order.
+
+Module-level functions that other modules import by name (``from
+pig.shell import save_scoreboard``) can't be wrapped by replacing the
+module attribute. Mark them :func:`hookable` where they're defined and
+the layers go inside the function everyone already holds.
+"""
+from __future__ import annotations
+import functools
+from typing import Callable
+
+
+Make = Callable[[Callable], Callable]     # original -> wrapper
+
+
+def hookable(fn: Callable) -> Callable:
+    """Let hooks wrap ``fn`` even where it was imported by name."""
+    slot = [fn]
+
+    @functools.wraps(fn)
+    def call(*args, **kwargs):
+        return slot[0](*args, **kwargs)
+
+    call.__hook_slot__ = slot
+    return call
+
+
+class _Chain:
+    """The original of one attribute and the layers on top of it."""
+
+    def __init__(self, owner: object, attr: str) -> None:
+        self.owner, self.attr = owner, attr
+        current = getattr(owner, attr)
+        self.slot = getattr(current, "__hook_slot__", None)
+        self.original = self.slot[0] if self.slot is not None else current
+        self.layers: list[tuple[str, Make]] = []
+
+    def install(self) -> None:
+        fn = self.original
+        for _, make in self.layers:
+            fn = functools.wraps(fn)(make(fn))
+        if self.slot is not None:
+            self.slot[0] = fn
+        else:
+            setattr(self.owner, self.attr, fn)
+
+
+_chains: dict[tuple[int, str], _Chain] = {}
+
+
+def wrap(owner: object, attr: str, tag: str, make: Make) -> None:
+    """Add a layer ``make(fn) -> wrapper`` over ``owner.attr`` for ``tag``."""
+    key = (id(owner), attr)
+    chain = _chains.get(key)
+    if chain is None:
+        chain = _chains[key] = _Chain(owner, attr)
+    chain.layers.append((tag, make))
+    chain.install()
+
+
+def unwrap(tag: str) -> None:
+    """Remove every layer owned by ``tag``; others stay in place."""
+    for key, chain in list(_chains.items()):
+        kept = [layer for layer in chain.layers if layer[0] != tag]
+        if len(kept) == len(chain.layers):
+            continue
+        chain.layers = kept
+        chain.install()
+        if not kept:
+            del _chains[key]
+
+
+def is_wrapped(tag: str) -> bool:
+    """Return True if ``tag`` has any layer installed."""
+    return any(t == tag for c in _chains.values() for t, _ in c.layers)
+
+
+def original(owner: object, attr: str) -> Callable:
+    """Return the unwrapped ``owner.attr``, hooks or not."""
+    chain = _chains.get((id(owner), attr))
+    if chain is not None:
+        return chain.original
+    current = getattr(owner, attr)
+    slot = getattr(current, "__hook_slot__", None)
+    return slot[0] if slot is not None else current
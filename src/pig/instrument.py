@@ -0,0 +1,156 @@
+"""Opt-in counters and timers for the hot paths. Off unless asked for.
+
+Set ``PIG_PROF=1`` (or "true"/"yes") to count and time dice rolls,
+strategy decisions, ``Game.roll``/``hold``, ``Turn`` creation and
+scoreboard load/save. ``PIG_PROF=profile`` also runs ``cProfile``.
+
+When it's off nothing is wrapped at all, so the game runs the plain
+methods with zero extra cost. When it's on, each hooked call adds two
+``perf_counter_ns`` reads and two integer adds. The wrappers go through
+``pig.hooks``, so they stack with ``pig.metrics`` in any order.
+"""
+from __future__ import annotations
+import functools
+import os
+import time
+from typing import Callable
+
+from pig import hooks
+
+
+TAG = "instrument"
+_stats: dict[str, list[int]] = {}           # name -> [calls, total ns]
+_profiler = None                            # cProfile.Profile once started
+_profiling = False
+
+
+def prof_mode() -> str:
+    """Return what PIG_PROF asks for: "", "counters" or "profile"."""
+    val = os.getenv("PIG_PROF", "0").lower()
+    if val == "profile":
+        return "profile"
+    if val in {"1", "true", "yes"}:
+        return "counters"
+    return ""
+
+
+def is_enabled() -> bool:
+    """Return True if the hooks are installed."""
+    return hooks.is_wrapped(TAG)
+
+
+def _timed(name: str, fn: Callable) -> Callable:
+    stat = _stats.setdefault(name, [0, 0])
+    clock = time.perf_counter_ns
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stat[0] += 1
+            stat[1] += clock() - t0
+    return wrapper
+
+
+def _hook(owner: object, attr: str, name: str) -> None:
+    hooks.wrap(owner, attr, TAG, lambda fn: _timed(name, fn))
+
+
+def enable(profile: bool = False) -> None:
+    """Install the counters (and start cProfile if ``profile``)."""
+    if not is_enabled():
+        from pig import ai, game, shell, turn
+        # count rolls where the game asks for them: RiggedDice binds
+        # its inner roll per instance and the scripted and antithetic
+        # dice override roll, so a hook on Dice.roll would miss them
+        _hook(turn.Turn, "roll", "dice.roll")
+        _hook(game.Game, "roll", "game.roll")
+        _hook(game.Game, "hold", "game.hold")
+        _hook(turn.Turn, "__init__", "turn.create")
+        for cls in (ai.ComputerStrategy, ai.SmartStrategy, ai.SearchStrategy):
+            _hook(cls, "decide", f"decide.{cls.__name__}")
+        _hook(shell, "load_scoreboard", "scoreboard.load")
+        _hook(shell, "save_scoreboard", "scoreboard.save")
+    if profile:
+        start_profile()
+
+
+def disable() -> None:
+    """Put the original methods back and stop cProfile."""
+    stop_profile()
+    hooks.unwrap(TAG)
+
+
+def enable_from_env() -> None:
+    """Turn things on if ``PIG_PROF`` says so."""
+    mode = prof_mode()
+    if mode:
+        enable(profile=(mode == "profile"))
+
+
+def reset() -> None:
+    """Zero every counter (hooks stay installed)."""
+    for stat in _stats.values():
+        stat[0] = stat[1] = 0
+
+
+def snapshot() -> dict[str, dict[str, float]]:
+    """Counters as ``{name: {"calls", "total_ms", "avg_us"}}``."""
+    out = {}
+    for name, (calls, ns) in sorted(_stats.items()):
+        if calls:
+            out[name] = {
+                "calls": calls,
+                "total_ms": ns / 1e6,
+                "avg_us": ns / calls / 1e3,
+            }
+    return out
+
+
+def report() -> str:
+    """Counters as a small text table."""
+    if not is_enabled():
+        return "(instrumentation is off — set PIG_PROF=1)"
+    rows = snapshot()
+    if not rows:
+        return "(nothing counted yet)"
+    lines = [f"{'phase':<24}{'calls':>10}{'total ms':>12}{'avg us':>10}"]
+    for name, r in rows.items():
+        lines.append(f"{name:<24}{r['calls']:>10}"
+                     f"{r['total_ms']:>12.2f}{r['avg_us']:>10.2f}")
+    return "\n".join(lines)
+
+
+# ----- cProfile -----
+
+def start_profile() -> None:
+    """Start (or keep running) a cProfile session."""
+    global _profiler, _profiling
+    if _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+    _profiler.enable()
+    _profiling = True
+
+
+def stop_profile() -> None:
+    """Pause cProfile; the data collected so far is kept."""
+    global _profiling
+    if _profiler is not None:
+        _profiler.disable()
+    _profiling = False
+
+
+def dump_profile(path: str) -> bool:
+    """Write the cProfile data as a pstats file. False if never profiled.
+
+    Open it with ``python -m pstats <file>``. Profiling carries on after.
+    """
+    if _profiler is None:
+        return False
+    _profiler.dump_stats(path)      # this pauses the profiler...
+    if _profiling:
+        _profiler.enable()          # ...so pick up where we were
+    return True
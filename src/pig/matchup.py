@@ -0,0 +1,179 @@
+"""Exact head-to-head numbers for two strategies, no simulation.
+
+Two fixed strategies turn Pig into an absorbing Markov chain: states are
+``(mover, i, j, k)`` and the game ends when someone holds at the target.
+:func:`head_to_head` solves that chain for each seat's win chance and
+the expected game length (turns and rolls) with A moving first or second.
+
+The chain is never built as a matrix. Each strategy is compiled into a
+``bytearray`` of moves (``pig.analysis.policy_for``), which is all the
+transition structure there is, and the solve walks the score sums from
+the top down. Every step only needs sums already solved, except the bust
+link between ``(i, j, 0)`` and ``(j, i, 0)``; with fixed strategies that
+link is linear, so each score pair is finished with one 2x2 solve
+instead of sweeping until convergence.
+
+``python -m pig.matchup easy hard --target 100`` prints a matchup.
+"""
+from __future__ import annotations
+import argparse
+import sys
+from dataclasses import dataclass
+
+from pig.analysis import ROLL, ValueTable, policy_for, solve_pair
+
+
+@dataclass(frozen=True)
+class Matchup:
+    """A vs B, exactly. "first"/"second" is A's seat."""
+
+    target: int
+    sides: int
+    win_first: float        # A's chance to win when A moves first
+    win_second: float       # ... when B moves first
+    turns_first: float      # expected turns in the game when A starts
+    turns_second: float
+    rolls_first: float      # expected dice rolls in the game when A starts
+    rolls_second: float
+
+    @property
+    def win_rate(self) -> float:
+        """A's chance over a match with alternating seats."""
+        return (self.win_first + self.win_second) / 2
+
+
+def _column(me: ValueTable, other: ValueTable, policy: bytearray,
+            i: int, j: int, y: float,
+            per_roll: float, per_turn: float) -> tuple[float, float]:
+    """Fill ``me``'s ``(i, j, *)`` column of an expected count.
+
+    ``y`` is the other side's value at ``(j, i, 0)`` (what follows a
+    bust). Returns the value at ``k = 0`` and its slope in ``y``.
+    """
+    T, s = me.target, me.sides
+    inv = 1.0 / s
+    L = T - i
+    base = me.offsets[i] + j * L
+    vals, ovals = me.values, other.values
+    ostep = T - j
+    oidx = other.offsets[j] + (i + L - 1) * ostep
+
+    bust, dbust = inv * (per_turn + y), inv
+    v = [0.0] * L + [per_turn] * s       # a winning hold ends the turn
+    d = [0.0] * (L + s)
+    win_v, win_d = (s - 1) * per_turn, 0.0
+    for k in range(L - 1, -1, -1):
+        if policy[base + k] == ROLL:
+            val = per_roll + bust + inv * win_v
+            dv = dbust + inv * win_d
+        elif k:
+            val, dv = per_turn + ovals[oidx], 0.0
+        else:                                # holding 0 passes the turn
+            val, dv = per_turn + y, 1.0
+        if k:
+            oidx -= ostep
+        v[k], d[k] = val, dv
+        vals[base + k] = val
+        win_v += v[k + 1] - v[k + s]
+        win_d += d[k + 1] - d[k + s]
+    return v[0], d[0]
+
+
+def _expected(pol_a: bytearray, pol_b: bytearray, target: int, sides: int,
+              per_roll: float,
+              per_turn: float) -> tuple[ValueTable, ValueTable]:
+    """Count the rolls/turns expected to be left, A or B to move."""
+    a, b = ValueTable(target, sides), ValueTable(target, sides)
+    T = target
+
+    def col(me, other, pol, i, j, y):
+        return _column(me, other, pol, i, j, y, per_roll, per_turn)
+
+    for total in range(2 * T - 2, -1, -1):
+        for i in range(max(0, total - T + 1), min(T - 1, total) + 1):
+            j = total - i
+            # x = A(i, j, 0) = a0 + a1 * y,  y = B(j, i, 0) = b0 + b1 * x
+            b0, b1 = col(b, a, pol_b, j, i, 0.0)
+            ax, a1 = col(a, b, pol_a, i, j, b0)
+            det = 1.0 - a1 * b1
+            if det <= 1e-15:
+                raise ValueError("these strategies can pass the turn forever")
+            x = ax / det
+            y = b0 + b1 * x
+            col(a, b, pol_a, i, j, y)
+            col(b, a, pol_b, j, i, x)
+    return a, b
+
+
+def head_to_head(a, b, target: int = 100, sides: int = 6) -> Matchup:
+    """Solve A vs B exactly.
+
+    Args:
+        a: Strategy object (anything with ``decide``) for A.
+        b: Strategy object for B.
+        target (int): Target score. Defaults to 100.
+        sides (int): Die size. Defaults to 6.
+
+    Returns:
+        Matchup: Win chances and expected game lengths for both seats.
+    """
+    pa, pb = policy_for(a, target, sides), policy_for(b, target, sides)
+    wa, wb = solve_pair(a, b, target, sides)
+    ta, tb = _expected(pa, pb, target, sides, per_roll=0.0, per_turn=1.0)
+    ra, rb = _expected(pa, pb, target, sides, per_roll=1.0, per_turn=0.0)
+    return Matchup(
+        target=target, sides=sides,
+        win_first=wa.value(0, 0, 0), win_second=1.0 - wb.value(0, 0, 0),
+        turns_first=ta.values[0], turns_second=tb.values[0],
+        rolls_first=ra.values[0], rolls_second=rb.values[0],
+    )
+
+
+def bot_from_text(text: str, target: int = 100):
+    """Build a bot from text.
+
+    ``"easy"`` .. ``"hard"`` give the shell's preset for ``target``;
+    ``"computer:18"`` and ``"smart:12,28"`` give that kind with those
+    thresholds.
+
+    Raises:
+        ValueError: For unknown kinds, bad numbers, or ``"expert"``
+            (the search bot can't be compiled).
+    """
+    from pig.presets import make_bot
+    from pig.shell import _build_brain
+    kind, sep, params = text.partition(":")
+    if not sep:
+        if kind not in ("easy", "normal", "hard"):
+            # the search bot would need a search per position to compile
+            raise ValueError(f"can't compile difficulty {kind!r}")
+        return _build_brain(kind, target)
+    return make_bot((kind, tuple(int(p) for p in params.split(","))))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    ap = argparse.ArgumentParser(description="Exact Pig matchup of two bots.")
+    ap.add_argument("a", help='"easy", "normal", "hard", "computer:18", '
+                              '"smart:12,28"')
+    ap.add_argument("b")
+    ap.add_argument("--target", type=int, default=100)
+    ap.add_argument("--sides", type=int, default=6)
+    args = ap.parse_args(argv)
+    try:
+        a = bot_from_text(args.a, args.target)
+        b = bot_from_text(args.b, args.target)
+        m = head_to_head(a, b, args.target, args.sides)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"{args.a} vs {args.b}, target {m.target}")
+    print(f"  {args.a} wins: {m.win_first:.4f} moving first, "
+          f"{m.win_second:.4f} moving second, {m.win_rate:.4f} overall")
+    print(f"  game length: {m.turns_first:.2f} / {m.turns_second:.2f} turns, "
+          f"{m.rolls_first:.2f} / {m.rolls_second:.2f} rolls")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
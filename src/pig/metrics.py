@@ -0,0 +1,257 @@
+"""Live game metrics in Prometheus text format, stdlib only.
+
+``enable()`` hooks ``Game``, the strategies and the scoreboard so they
+count games started/finished, rolls, busts and hold decisions, and time
+``decide()`` and scoreboard writes. ``serve(port)`` exposes the numbers
+at ``http://127.0.0.1:<port>/metrics``.
+
+Every thread writes to its own shard (a plain dict reached through
+``threading.local``), so the hot path never takes a lock. A scrape adds
+the shards up. The only lock is taken once per thread, when its shard is
+registered. Like ``pig.instrument`` nothing is hooked until you ask;
+both install their wrappers through ``pig.hooks``, so either can be
+turned off first without disturbing the other.
+"""
+from __future__ import annotations
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+
+from pig import hooks
+
+# upper bounds in seconds; one more bucket catches everything (+Inf)
+BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4,
+           1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0)
+
+HELP = {
+    "pig_games_started_total": ("counter", "Games started (new or reset)."),
+    "pig_games_finished_total": ("counter", "Games that ended with a winner."),
+    "pig_rolls_total": ("counter", "Dice rolls made through Game.roll."),
+    "pig_busts_total": ("counter", "Rolls of 1 that lost the turn."),
+    "pig_decisions_total": ("counter", "Strategy decisions, by choice."),
+    "pig_decide_seconds": ("histogram", "Time spent in strategy decide()."),
+    "pig_scoreboard_write_seconds": (
+        "histogram", "Time to record a result or save the scoreboard."),
+}
+
+Key = Tuple[str, str]          # (metric name, label text like 'a="b"')
+
+
+class _Shard:
+    """One thread's numbers."""
+
+    __slots__ = ("counters", "hists")
+
+    def __init__(self) -> None:
+        self.counters: Dict[Key, int] = {}
+        # key -> [bucket counts..., +Inf count, sum]
+        self.hists: Dict[Key, list] = {}
+
+
+_local = threading.local()
+_shards: list[_Shard] = []
+_shards_lock = threading.Lock()
+TAG = "metrics"
+
+
+def _shard() -> _Shard:
+    try:
+        return _local.shard
+    except AttributeError:
+        shard = _Shard()
+        with _shards_lock:
+            _shards.append(shard)
+        _local.shard = shard
+        return shard
+
+
+def inc(name: str, labels: str = "", n: int = 1) -> None:
+    """Add ``n`` to a counter in this thread's shard."""
+    c = _shard().counters
+    key = (name, labels)
+    c[key] = c.get(key, 0) + n
+
+
+def observe(name: str, seconds: float, labels: str = "") -> None:
+    """Record one timing in a histogram."""
+    h = _shard().hists
+    key = (name, labels)
+    row = h.get(key)
+    if row is None:
+        row = h[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+    row[bisect_left(BUCKETS, seconds)] += 1
+    row[-1] += seconds
+
+
+def reset() -> None:
+    """Zero everything (all threads)."""
+    with _shards_lock:
+        for s in _shards:
+            s.counters.clear()
+            s.hists.clear()
+
+
+def collect() -> tuple[dict[Key, int], dict[Key, list]]:
+    """Sum every shard into one set of counters and histograms."""
+    counters: dict[Key, int] = {}
+    hists: dict[Key, list] = {}
+    with _shards_lock:
+        shards = list(_shards)
+    for s in shards:
+        for key, v in list(s.counters.items()):
+            counters[key] = counters.get(key, 0) + v
+        for key, row in list(s.hists.items()):
+            acc = hists.get(key)
+            if acc is None:
+                hists[key] = list(row)
+            else:
+                for i, v in enumerate(row):
+                    acc[i] += v
+    return counters, hists
+
+
+def _labels(*parts: str) -> str:
+    parts = tuple(p for p in parts if p)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render() -> str:
+    """Everything in Prometheus text exposition format (version 0.0.4)."""
+    counters, hists = collect()
+    lines: list[str] = []
+    names = sorted({k[0] for k in counters} | {k[0] for k in hists})
+    for name in names:
+        kind, text = HELP.get(name, ("untyped", name))
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (n, lab), v in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{name}{_labels(lab)} {v}")
+        for (n, lab), row in sorted(hists.items()):
+            if n != name:
+                continue
+            running = 0
+            for bound, count in zip(BUCKETS, row):
+                running += count
+                le = _labels(lab, 'le="%g"' % bound)
+                lines.append(f"{name}_bucket{le} {running}")
+            total = running + row[len(BUCKETS)]
+            le = _labels(lab, 'le="+Inf"')
+            lines.append(f"{name}_bucket{le} {total}")
+            lines.append(f"{name}_sum{_labels(lab)} {row[-1]:.9g}")
+            lines.append(f"{name}_count{_labels(lab)} {total}")
+    return "\n".join(lines) + "\n"
+
+
+# ----- hooks -----
+
+def _wrap(owner: object, attr: str,
+          make: Callable[[Callable], Callable]) -> None:
+    hooks.wrap(owner, attr, TAG, make)
+
+
+def is_enabled() -> bool:
+    """Return True if the hooks are installed."""
+    return hooks.is_wrapped(TAG)
+
+
+def enable() -> None:
+    """Install the hooks on Game, the strategies and the scoreboard (once)."""
+    if is_enabled():
+        return
+    from pig import ai, game, scoreboard, shell
+    clock = time.perf_counter
+
+    def started(fn):
+        def wrapper(self, *a, **k):
+            inc("pig_games_started_total")
+            return fn(self, *a, **k)
+        return wrapper
+
+    def rolled(fn):
+        def wrapper(self):
+            value = fn(self)
+            if value:
+                inc("pig_rolls_total")
+                if value == 1:
+                    inc("pig_busts_total")
+            return value
+        return wrapper
+
+    def held(fn):
+        def wrapper(self):
+            playing = self.winner_id is None
+            fn(self)
+            if playing and self.winner_id is not None:
+                inc("pig_games_finished_total")
+        return wrapper
+
+    def timed(name, labels=""):
+        def make(fn):
+            def wrapper(*a, **k):
+                t0 = clock()
+                try:
+                    return fn(*a, **k)
+                finally:
+                    observe(name, clock() - t0, labels)
+            return wrapper
+        return make
+
+    def decided(label):
+        def make(fn):
+            def wrapper(self, g):
+                t0 = clock()
+                choice = fn(self, g)
+                observe("pig_decide_seconds", clock() - t0, label)
+                inc("pig_decisions_total", f'{label},choice="{choice}"')
+                return choice
+            return wrapper
+        return make
+
+    _wrap(game.Game, "__post_init__", started)
+    _wrap(game.Game, "reset", started)
+    _wrap(game.Game, "roll", rolled)
+    _wrap(game.Game, "hold", held)
+    for cls in (ai.ComputerStrategy, ai.SmartStrategy, ai.SearchStrategy):
+        _wrap(cls, "decide", decided(f'strategy="{cls.__name__}"'))
+    w = "pig_scoreboard_write_seconds"
+    _wrap(scoreboard.Scoreboard, "record", timed(w, 'op="record"'))
+    _wrap(scoreboard.Scoreboard, "record_from_game", timed(w, 'op="record"'))
+    _wrap(shell, "save_scoreboard", timed(w, 'op="save"'))
+
+
+def disable() -> None:
+    """Remove the hooks (numbers collected so far are kept)."""
+    hooks.unwrap(TAG)
+
+
+# ----- HTTP endpoint -----
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args) -> None:
+        return  # keep scrapes out of the game's output
+
+
+def serve(port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a daemon thread. ``port=0`` picks one.
+
+    Call ``shutdown()`` then ``server_close()`` on the result to stop.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="pig-metrics",
+                     daemon=True).start()
+    return server
@@ -0,0 +1,90 @@
+"""Output sinks for the shell: collect text, write it out in one go."""
+from __future__ import annotations
+import sys
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    import socket
+
+
+class Sink(ABC):
+    """Buffers text until ``flush()``. Subclasses decide where it goes.
+
+    With ``autoflush=True`` every write goes straight out, which is how a
+    plain ``print`` behaves.
+    """
+
+    def __init__(self, autoflush: bool = False) -> None:
+        """Start with nothing queued."""
+        self.autoflush = autoflush
+        self.flushes = 0             # how many real writes we've made
+        self._buf: list[str] = []
+
+    def write(self, text: str) -> None:
+        """Queue some text (flushes right away in autoflush mode)."""
+        self._buf.append(text)
+        if self.autoflush:
+            self.flush()
+
+    def pending(self) -> str:
+        """Text written but not flushed yet."""
+        return "".join(self._buf)
+
+    def flush(self) -> None:
+        """Send everything queued as a single write."""
+        if not self._buf:
+            return
+        data = "".join(self._buf)
+        self._buf.clear()
+        self._emit(data)
+        self.flushes += 1
+
+    @abstractmethod
+    def _emit(self, data: str) -> None:
+        """Write one flushed chunk to wherever this sink sends text."""
+
+
+class StreamSink(Sink):
+    """Writes to a text stream. ``None`` means whatever ``sys.stdout`` is."""
+
+    def __init__(self, stream: TextIO | None = None,
+                 autoflush: bool = False) -> None:
+        """Write to ``stream`` (``sys.stdout`` at flush time if None)."""
+        super().__init__(autoflush)
+        self.stream = stream
+
+    def _emit(self, data: str) -> None:
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(data)
+        stream.flush()
+
+
+class SocketSink(Sink):
+    """Sends to a connected socket with one ``sendall`` per flush."""
+
+    def __init__(self, sock: socket.socket, encoding: str = "utf-8",
+                 autoflush: bool = False) -> None:
+        """Send to ``sock``, encoding text with ``encoding``."""
+        super().__init__(autoflush)
+        self.sock = sock
+        self.encoding = encoding
+
+    def _emit(self, data: str) -> None:
+        self.sock.sendall(data.encode(self.encoding))
+
+
+class MemorySink(Sink):
+    """Keeps flushed text in memory. Handy for tests and batch runs."""
+
+    def __init__(self, autoflush: bool = False) -> None:
+        """Start with nothing flushed."""
+        super().__init__(autoflush)
+        self.chunks: list[str] = []
+
+    def _emit(self, data: str) -> None:
+        self.chunks.append(data)
+
+    def getvalue(self) -> str:
+        """Everything flushed so far."""
+        return "".join(self.chunks)
@@ -0,0 +1,76 @@
+"""Pacing for the shell: how long to pause between dramatic lines."""
+from __future__ import annotations
+import os
+import time
+
+
+DEFAULT_DELAY = 0.25
+
+
+class Pacer:
+    """Base pacer. Never waits; subclasses add a delay."""
+
+    delay: float = 0.0
+
+    def pause(self) -> None:
+        """Blocking pause, used by the cmd shell."""
+
+    async def wait(self) -> None:
+        """Non-blocking pause for asyncio callers."""
+
+
+class InstantPacer(Pacer):
+    """No pauses at all. For scripted sessions, tests and benchmarks."""
+
+
+class FixedPacer(Pacer):
+    """Sleep a fixed number of seconds on every pause."""
+
+    def __init__(self, delay: float = DEFAULT_DELAY) -> None:
+        """Pause for ``delay`` seconds (0 or more) each time."""
+        if delay < 0:
+            raise ValueError("delay can't be negative")
+        self.delay = float(delay)
+
+    def pause(self) -> None:
+        """Sleep, blocking the whole process."""
+        time.sleep(self.delay)
+
+    async def wait(self) -> None:
+        """Sleep on the event loop; other tasks keep running."""
+        import asyncio      # only async callers pay for it
+        await asyncio.sleep(self.delay)
+
+
+class AsyncPacer(FixedPacer):
+    """Only ``await wait()`` delays; ``pause()`` never blocks the process.
+
+    The network server awaits it between the paced parts of a reply; a
+    terminal shell (which only calls ``pause()``) runs instantly.
+    """
+
+    def pause(self) -> None:
+        """Return at once; only asyncio callers get the delay."""
+        return None
+
+
+def make_pacer(spec: str | None = None) -> Pacer:
+    """Build a pacer from a spec string.
+
+    ``"instant"`` (or ``"0"``) -> no pauses, ``"async"`` or
+    ``"async:<secs>"`` -> asyncio timer (the server's replies only), a
+    number -> fixed delay.
+    With no spec, reads ``PIG_PACE`` and falls back to a fixed 0.25s.
+    """
+    if spec is None:
+        spec = os.getenv("PIG_PACE", "")
+    spec = spec.strip().lower()
+    if not spec:
+        return FixedPacer(DEFAULT_DELAY)
+    if spec in {"instant", "off", "none"}:
+        return InstantPacer()
+    if spec.startswith("async"):
+        _, _, secs = spec.partition(":")
+        return AsyncPacer(float(secs) if secs else DEFAULT_DELAY)
+    delay = float(spec)
+    return InstantPacer() if delay == 0 else FixedPacer(delay)
@@ -0,0 +1,199 @@
+"""Play lots of bot games on all cores without shipping results back.
+
+Games are short, so returning a result object per game through a
+process pool spends more time pickling than playing. Here the parent
+makes one ``multiprocessing.shared_memory`` block with a *slab* of int64
+counters per worker; each worker plays its share of the games and adds
+straight into its own slab (no locks needed), then answers with just
+``(slot, games)``. The parent adds the slabs up at the end.
+
+A slab holds, in order:
+
+* ``wins``: games won by A and by B;
+* ``turns``: game length in turns, ``MAX_TURNS`` bins (last one is
+  "that many or more");
+* ``scores``: final score of A, then of B, ``target + 1`` bins each
+  (the last bin is "reached the target").
+
+``python -m pig.parallel easy hard --games 200000`` prints a summary.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+from pig.dice import Dice
+from pig.game import Game
+
+
+MAX_TURNS = 200
+ITEM = 8            # bytes per counter ("q")
+
+
+def slab_size(target: int) -> int:
+    """Counters in one worker's slab."""
+    return 2 + MAX_TURNS + 2 * (target + 1)
+
+
+@dataclass
+class SimResult:
+    """Merged counts of a run; "A" is the first bot given."""
+
+    target: int
+    wins: array             # [A, B]
+    turns: array            # games by length in turns
+    scores_a: array         # games by A's final score
+    scores_b: array
+
+    @property
+    def games(self) -> int:
+        """Games played."""
+        return self.wins[0] + self.wins[1]
+
+    @property
+    def rate(self) -> float:
+        """A's win rate."""
+        return self.wins[0] / self.games if self.games else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        """Average game length in turns (overflow bin counted as its floor)."""
+        n = self.games
+        return sum(i * c for i, c in enumerate(self.turns)) / n if n else 0.0
+
+    @classmethod
+    def from_slab(cls, slab, target: int) -> "SimResult":
+        """Split one slab (any sequence of counters) into its parts."""
+        t = 2 + MAX_TURNS
+        return cls(target, array("q", slab[:2]), array("q", slab[2:t]),
+                   array("q", slab[t:t + target + 1]),
+                   array("q", slab[t + target + 1:t + 2 * (target + 1)]))
+
+
+def play_into(slab, a, b, games: int, seed: int, target: int = 100,
+              sides: int = 6, offset: int = 0) -> int:
+    """Play ``games`` games of A vs B, adding the counts into ``slab``.
+
+    ``slab`` is any writable sequence of ints (a ``memoryview`` cast to
+    ``"q"`` over shared memory, or an ``array``); the counters start at
+    ``offset``. Seats alternate and the dice use their own
+    ``random.Random(seed)``, so a call is reproducible. Returns ``games``.
+    """
+    dice = Dice(sides, random.Random(seed))
+    turns_at = offset + 2
+    a_at = turns_at + MAX_TURNS
+    b_at = a_at + target + 1
+    last_turn, top = MAX_TURNS - 1, target
+    for n in range(games):
+        a_first = n % 2 == 0
+        bots = (a.decide, b.decide) if a_first else (b.decide, a.decide)
+        g = Game(target=target, dice=dice)
+        turns = 0
+        while not g.is_over:
+            g.play_cpu_turn(bots[g.current_index])
+            turns += 1
+        pa, pb = g.players if a_first else g.players[::-1]
+        slab[offset + (0 if g.winner_id == pa.player_id else 1)] += 1
+        slab[turns_at + min(turns, last_turn)] += 1
+        slab[a_at + min(pa.score, top)] += 1
+        slab[b_at + min(pb.score, top)] += 1
+    return games
+
+
+def _worker(name: str, slot: int, a, b, games: int, seed: int, target: int,
+            sides: int) -> tuple[int, int]:
+    """Pool task: attach, fill our slab, detach. Returns ``(slot, games)``."""
+    shm = shared_memory.SharedMemory(name=name)
+    view = shm.buf.cast("q")
+    try:
+        done = play_into(view, a, b, games, seed, target, sides,
+                         offset=slot * slab_size(target))
+    finally:
+        view.release()
+        shm.close()
+    return slot, done
+
+
+def run(a, b, games: int, *, workers: int | None = None, seed: int = 0,
+        target: int = 100, sides: int = 6) -> SimResult:
+    """Play ``games`` games of A vs B split over ``workers`` processes.
+
+    Args:
+        a: Strategy object for A (must pickle).
+        b: Strategy object for B.
+        games (int): Games in all.
+        workers (int | None): Processes (default: all cores). 1 runs in
+            this process, through the same shared block.
+        seed (int): Worker ``i`` seeds its dice with ``seed + i``.
+        target (int): Target score.
+        sides (int): Die size.
+
+    Returns:
+        SimResult: Counts summed over all workers.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, games or 1))
+    size = slab_size(target)
+    shares = [games // workers + (i < games % workers) for i in range(workers)]
+    shm = shared_memory.SharedMemory(create=True, size=workers * size * ITEM)
+    view = shm.buf.cast("q")
+    try:
+        for i in range(len(view)):
+            view[i] = 0
+        tasks = [(shm.name, i, a, b, shares[i], seed + i, target, sides)
+                 for i in range(workers)]
+        if workers == 1:
+            done = [_worker(*tasks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                done = list(pool.map(_worker, *zip(*tasks)))
+        if sum(n for _, n in done) != games:
+            raise RuntimeError("a worker came back short")
+        total = array("q", bytes(size * ITEM))
+        for slot in range(workers):
+            base = slot * size
+            for i in range(size):
+                total[i] += view[base + i]
+    finally:
+        view.release()
+        shm.close()
+        shm.unlink()
+    return SimResult.from_slab(total, target)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    from pig.matchup import bot_from_text
+    ap = argparse.ArgumentParser(
+        description="Simulate many Pig games on all cores.")
+    ap.add_argument("a", help='"easy", "normal", "hard", "computer:18", '
+                              '"smart:12,28"')
+    ap.add_argument("b")
+    ap.add_argument("--games", type=int, default=100_000)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    args = ap.parse_args(argv)
+    try:
+        a = bot_from_text(args.a, args.target)
+        b = bot_from_text(args.b, args.target)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    r = run(a, b, args.games, workers=args.workers, seed=args.seed,
+            target=args.target)
+    secs = time.perf_counter() - start
+    print(f"{args.a} vs {args.b}: {r.rate:.4f} over {r.games} games, "
+          f"{r.mean_turns:.1f} turns on average")
+    print(f"{r.games / secs:,.0f} games/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
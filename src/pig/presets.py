@@ -0,0 +1,108 @@
+"""Difficulty presets per target score.
+
+The table in ``presets.json`` is computed offline by ``pig.tuner`` (see
+``python -m pig.tuner --help``) and maps a target score to the bot
+settings for each difficulty. It is read once, the first time a
+computer opponent is built. Targets that aren't in the table get their
+thresholds interpolated between the two nearest ones.
+"""
+from __future__ import annotations
+import json
+import os
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pig.ai import ComputerStrategy, SmartStrategy
+
+
+# a bot config is ("computer", (base,)) or ("smart", (min, max))
+Spec = Tuple[str, Tuple[int, ...]]
+# target -> difficulty -> spec
+Table = Dict[int, Dict[str, Spec]]
+
+PRESETS_PATH = Path(__file__).with_name("presets.json")
+
+_table: Optional[Table] = None     # loaded on first use
+
+
+def make_bot(spec: Spec):
+    """Build a strategy object from a spec."""
+    kind, params = spec
+    if kind == "computer":
+        return ComputerStrategy(*params)
+    if kind == "smart":
+        return SmartStrategy(*params)
+    raise ValueError(f"unknown bot kind: {kind!r}")
+
+
+def load_presets(path: Path = PRESETS_PATH) -> Table:
+    """Read the preset table. A missing or broken file gives ``{}``."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    table: Table = {}
+    for target, row in data.get("targets", {}).items():
+        specs = {}
+        for name, entry in row.items():
+            try:
+                specs[name] = (entry["kind"],
+                               tuple(int(p) for p in entry["params"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        table[int(target)] = specs
+    return table
+
+
+def save_presets(rows: dict[int, dict[str, dict]],
+                 path: Path = PRESETS_PATH) -> None:
+    """Merge ``{target: {difficulty: entry}}`` into the file, atomically.
+
+    Each entry is a dict with at least ``kind`` and ``params``; anything
+    else (win rate, games played) is kept as a note.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = {}
+    targets = data.setdefault("targets", {})
+    for target, row in rows.items():
+        targets[str(target)] = row
+    data["targets"] = dict(sorted(targets.items(), key=lambda kv: int(kv[0])))
+    tmp = Path(str(path) + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def lookup(table: Table, difficulty: str, target: int) -> Spec | None:
+    """Spec for ``difficulty`` at ``target``, interpolating if needed.
+
+    Outside the calibrated range the nearest end is used. If the two
+    neighbours use different bot kinds, the nearer one wins.
+    """
+    known = sorted(t for t, row in table.items() if difficulty in row)
+    if not known:
+        return None
+    if target <= known[0]:
+        return table[known[0]][difficulty]
+    if target >= known[-1]:
+        return table[known[-1]][difficulty]
+    i = bisect_left(known, target)
+    hi = known[i]
+    if hi == target:
+        return table[hi][difficulty]
+    lo = known[i - 1]
+    a, b = table[lo][difficulty], table[hi][difficulty]
+    if a[0] != b[0] or len(a[1]) != len(b[1]):
+        return a if target - lo <= hi - target else b
+    w = (target - lo) / (hi - lo)
+    return a[0], tuple(round(x + (y - x) * w) for x, y in zip(a[1], b[1]))
+
+
+def preset_for(difficulty: str, target: int) -> Spec | None:
+    """Look up the shipped table (loading it on the first call)."""
+    global _table
+    if _table is None:
+        _table = load_presets()
+    return lookup(_table, difficulty, target)
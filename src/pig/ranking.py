@@ -0,0 +1,247 @@
+"""Find the best few bots in a big pool without a full round-robin.
+
+A round-robin of ``n`` tuner variants is ``n * (n - 1) / 2`` matchups.
+Two cheaper schedules, both playing paired blocks
+(``pig.compare.play_block``, 4 games each):
+
+* :func:`swiss` - a Swiss system: every round pairs bots with equal (or
+  close) points that haven't met yet, so ``n / 2`` matches a round and
+  about ``log2(n)`` rounds sort out the top;
+* :func:`successive_rejects` - a best-arm bandit: each phase plays every
+  surviving bot against random opponents from the pool and drops the
+  worst, with phases lengthening as the field shrinks, until ``k`` are
+  left. The whole run fits a fixed game budget.
+
+Both return a :class:`Ranking`, whose ``top(n)`` gives ``(name, score)``
+pairs like ``Scoreboard.top``.
+
+``python -m pig.ranking --kind smart --method swiss --top 5`` ranks the
+tuner's grid.
+"""
+from __future__ import annotations
+import argparse
+import math
+import random
+import sys
+from dataclasses import dataclass, field
+
+from pig.compare import play_block
+
+
+METHODS = ("swiss", "rejects")
+BLOCK_GAMES = 4
+
+
+@dataclass
+class Ranking:
+    """Scores, games played and final order of a pool."""
+
+    scores: dict[str, float]
+    games: dict[str, int]                             # games each bot played
+    order: list[str] = field(default_factory=list)    # best first
+    total_games: int = 0
+
+    def top(self, n: int = 3) -> list[tuple[str, float]]:
+        """Return the top N bots with their scores."""
+        return [(name, self.scores[name]) for name in self.order[:n]]
+
+
+def _block(bots: dict, a: str, b: str, seed: int, target: int,
+           sides: int) -> float:
+    wins, games = play_block(bots[a], bots[b], seed, target, sides)
+    return wins / games
+
+
+def _pair_round(
+    names: list[str], points: dict[str, float], met: dict[str, set],
+) -> tuple[list[tuple[str, str]], str | None]:
+    """Pair the field by points, avoiding rematches where possible."""
+    left = sorted(names, key=lambda n: (-points[n], names.index(n)))
+    bye = None
+    if len(left) % 2:
+        # the lowest bot that hasn't had a bye yet sits out
+        for name in reversed(left):
+            if "" not in met[name]:
+                bye = name
+                break
+        bye = bye or left[-1]
+        left.remove(bye)
+    pairs = []
+    while left:
+        a = left.pop(0)
+        b = next((n for n in left if n not in met[a]), left[0])
+        left.remove(b)
+        pairs.append((a, b))
+    return pairs, bye
+
+
+def swiss(bots: dict, *, rounds: int | None = None, blocks: int = 10,
+          seed: int = 0, target: int = 100, sides: int = 6) -> Ranking:
+    """Rank a pool with a Swiss-system tournament.
+
+    A match is ``blocks`` paired blocks; the winner gets 1 point, a dead
+    even match half each, and an odd bot out a bye worth 1. Ties in
+    points are broken by Buchholz (the sum of the opponents' points).
+
+    Args:
+        bots (dict): Name -> strategy object (anything with ``decide``).
+        rounds (int | None): Rounds to play; default ``ceil(log2(n)) + 2``.
+        blocks (int): Blocks per match.
+        seed (int): Base seed; every match gets its own seed range.
+        target (int): Target score.
+        sides (int): Die size.
+
+    Returns:
+        Ranking: Points per bot and the standings.
+    """
+    names = list(bots)
+    if len(names) < 2:
+        raise ValueError("need at least two bots")
+    if rounds is None:
+        rounds = math.ceil(math.log2(len(names))) + 2
+    points = {n: 0.0 for n in names}
+    games = {n: 0 for n in names}
+    met: dict[str, set] = {n: set() for n in names}
+    match = total = 0
+    for _ in range(rounds):
+        pairs, bye = _pair_round(names, points, met)
+        if bye is not None:
+            points[bye] += 1.0
+            met[bye].add("")
+        for a, b in pairs:
+            base = seed + match * blocks
+            score = sum(_block(bots, a, b, base + i, target, sides)
+                        for i in range(blocks)) / blocks
+            match += 1
+            if score > 0.5:
+                points[a] += 1.0
+            elif score < 0.5:
+                points[b] += 1.0
+            else:
+                points[a] += 0.5
+                points[b] += 0.5
+            games[a] += blocks * BLOCK_GAMES
+            games[b] += blocks * BLOCK_GAMES
+            total += blocks * BLOCK_GAMES
+            met[a].add(b)
+            met[b].add(a)
+    buchholz = {n: sum(points[o] for o in met[n] if o) for n in names}
+    order = sorted(names, key=lambda n: (-points[n], -buchholz[n],
+                                         names.index(n)))
+    return Ranking(points, games, order, total)
+
+
+def successive_rejects(bots: dict, k: int = 1, *, budget: int = 20_000,
+                       reference=None, seed: int = 0, target: int = 100,
+                       sides: int = 6) -> Ranking:
+    """Find the top ``k`` of a pool with the successive-rejects bandit.
+
+    Phase ``p`` plays every surviving bot ``n_p`` blocks and then rejects
+    the one with the lowest mean block score; ``n_p`` follows Audibert and
+    Bubeck's schedule, so later phases (closer calls) get more games.
+
+    Args:
+        bots (dict): Name -> strategy object.
+        k (int): How many to keep.
+        budget (int): Games to spend, roughly.
+        reference: Strategy every bot plays; default is a random bot
+            from the pool each block.
+        seed (int): Base seed for dice and opponent draws.
+        target (int): Target score.
+        sides (int): Die size.
+
+    Returns:
+        Ranking: Mean block score per bot (A's win rate); survivors first
+        by score, then the rejected ones, last rejected first.
+    """
+    names = list(bots)
+    n = len(names)
+    if n < 2:
+        raise ValueError("need at least two bots")
+    if not 1 <= k < n:
+        raise ValueError(f"k must be between 1 and {n - 1}")
+    pool = dict(bots)
+    if reference is not None:
+        pool[""] = reference
+    rng = random.Random(seed)
+    arms = budget // BLOCK_GAMES
+    log_bar = 0.5 + sum(1.0 / i for i in range(2, n + 1))
+    totals = {name: 0.0 for name in names}
+    pulls = {name: 0 for name in names}
+    games = {name: 0 for name in names}
+    alive, rejected = list(names), []
+    done = total = 0
+    block_seed = seed
+    for phase in range(1, n - k + 1):
+        want = math.ceil((arms - n) / (log_bar * (n + 1 - phase)))
+        more = max(1, want - done)
+        for name in alive:
+            for _ in range(more):
+                if reference is not None:
+                    opp = ""
+                else:
+                    opp = rng.choice(names)
+                    while opp == name:
+                        opp = rng.choice(names)
+                totals[name] += _block(pool, name, opp, block_seed,
+                                       target, sides)
+                block_seed += 1
+                pulls[name] += 1
+                games[name] += BLOCK_GAMES
+                if opp:
+                    games[opp] += BLOCK_GAMES
+                total += BLOCK_GAMES
+        done += more
+        worst = min(alive, key=lambda a: (totals[a] / pulls[a],
+                                          -names.index(a)))
+        alive.remove(worst)
+        rejected.append(worst)
+    scores = {a: totals[a] / pulls[a] for a in names}
+    alive.sort(key=lambda a: (-scores[a], names.index(a)))
+    return Ranking(scores, games, alive + rejected[::-1], total)
+
+
+def spec_name(spec) -> str:
+    """``("smart", (12, 28))`` -> ``"smart:12,28"``."""
+    kind, params = spec
+    return f"{kind}:{','.join(str(p) for p in params)}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    from pig.presets import make_bot
+    from pig.tuner import grid
+    ap = argparse.ArgumentParser(
+        description="Rank a pool of Pig bot settings.")
+    ap.add_argument("--kind", choices=("computer", "smart", "both"),
+                    default="smart")
+    ap.add_argument("--method", choices=METHODS, default="swiss")
+    ap.add_argument("--top", type=int, default=5)
+    ap.add_argument("--rounds", type=int, default=None, help="swiss rounds")
+    ap.add_argument("--blocks", type=int, default=10,
+                    help="blocks per swiss match")
+    ap.add_argument("--budget", type=int, default=20_000,
+                    help="games for successive rejects")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    args = ap.parse_args(argv)
+    kinds = ("computer", "smart") if args.kind == "both" else (args.kind,)
+    bots = {spec_name(s): make_bot(s)
+            for kind in kinds for s in grid(kind, args.target)}
+    top = max(1, min(args.top, len(bots) - 1))
+    if args.method == "swiss":
+        ranking = swiss(bots, rounds=args.rounds, blocks=args.blocks,
+                        seed=args.seed, target=args.target)
+    else:
+        ranking = successive_rejects(bots, top, budget=args.budget,
+                                     seed=args.seed, target=args.target)
+    for i, (name, score) in enumerate(ranking.top(top), 1):
+        print(f"{i:>3}. {name:<16} {score:.3f}")
+    n = len(bots)
+    print(f"{ranking.total_games} games for {n} bots "
+          f"(a round-robin is {n * (n - 1) // 2} matchups)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""Asyncio TCP server that hosts many Pig games at once.
+
+Every connection gets its own :class:`Session` (one ``Game`` each): a
+``PigShell`` whose output is collected per command instead of printed,
+so clients get the same commands and the same replies as the terminal.
+Replies are plain text lines, followed by a line holding a single ``.``
+so clients know where a reply ends. Where the terminal would pause (CPU
+rolls, busts) the server sends what it has and awaits the pacer, so a
+paced reply never holds up the other clients. All sessions share one
+``Scoreboard``; only the writer task ever changes it, so there is no
+locking.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import sys
+from typing import Callable, Optional
+
+from pig.game import Game
+from pig.output import MemorySink
+from pig.pacing import InstantPacer, Pacer, make_pacer
+from pig.player import Player
+from pig.scoreboard import Scoreboard
+from pig.shell import PigShell, load_scoreboard, save_scoreboard
+
+
+END = "."                 # marks the end of one reply
+MAX_LINE = 1024           # longest command line we accept
+
+log = logging.getLogger(__name__)
+
+
+class ScoreboardWriter:
+    """Owns the shared scoreboard. Sessions only put results on its queue."""
+
+    def __init__(
+        self,
+        sb: Scoreboard,
+        save: Optional[Callable[[Scoreboard], None]] = None,
+    ) -> None:
+        """Record into ``sb``; call ``save(sb)`` after each batch if given."""
+        self.sb = sb
+        self.save = save
+        self.save_errors = 0         # failed saves (the results stay in sb)
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def submit(self, winner: Player, players: list[Player],
+               target: int) -> None:
+        """Queue a finished game. Never blocks the caller."""
+        self.queue.put_nowait((winner, players, target))
+
+    async def run(self) -> None:
+        """Record queued results until a ``None`` arrives.
+
+        A save that fails is logged and counted, and the loop carries on:
+        the results are still in memory and the next save writes them.
+        """
+        while True:
+            item = await self.queue.get()
+            stop = item is None
+            recorded = False
+            # drain whatever else is waiting so a burst costs one save
+            while item is not None:
+                winner, players, target = item
+                self.sb.record(winner=winner, players=players, target=target)
+                recorded = True
+                if self.queue.empty():
+                    break
+                item = self.queue.get_nowait()
+                stop = item is None
+            if recorded and self.save is not None:
+                try:
+                    await asyncio.to_thread(self.save, self.sb)
+                except Exception:
+                    self.save_errors += 1
+                    log.exception("saving the scoreboard failed")
+            if stop:
+                return
+
+
+class Session(PigShell):
+    """One client's game: a ``PigShell`` that answers in reply lines."""
+
+    # would block every client (hint), or reach the server's own files
+    # and process-wide hooks (save, stats)
+    LOCAL_ONLY = frozenset({"hint", "save", "stats"})
+    # search bots think for a while on every CPU move, which would also
+    # block every client
+    LOCAL_DIFFICULTIES = frozenset({"expert"})
+    # the shared board only catches up once the writer task has run
+    recent_after_win = False
+
+    def __init__(self, game: Game, writer: ScoreboardWriter,
+                 pacer: Pacer | None = None) -> None:
+        """Play ``game``, sending finished games to ``writer``.
+
+        ``pacer`` is only awaited (by the server, between the parts of a
+        reply); it never blocks inside a command.
+        """
+        super().__init__(game, writer.sb,
+                         pacer=pacer if pacer is not None else InstantPacer(),
+                         out=MemorySink())
+        self.board = writer
+        self._cuts: list[int] = []   # chunk counts where pauses fell
+        self.stdout = self.out       # cmd's own writes (help) go there too
+        self.persist = False         # the writer task does the saving
+        self._cheat_word = None      # its menu would wait on input()
+
+    def handle(self, line: str) -> tuple[list[str], bool]:
+        """Run one command. Returns (reply lines, should_close)."""
+        parts, stop = self.handle_parts(line)
+        return [text for part in parts for text in part], stop
+
+    def handle_parts(self, line: str) -> tuple[list[list[str]], bool]:
+        """Like :meth:`handle`, with the reply split where the shell pauses.
+
+        There is always at least one part; the server awaits the pacer
+        between them.
+        """
+        name, sep, arg = line.strip().partition(" ")
+        name = name.lower()
+        if not name:
+            return [[]], False
+        if name == "exit":
+            name = "quit"
+        stop = False
+        if name in self.LOCAL_ONLY:
+            self._print(f"'{name}' isn't available over the network.")
+            self.out.flush()
+        else:
+            line = self.precmd(name + sep + arg)
+            stop = self.postcmd(self.onecmd(line), line)
+        chunks, parts, start = self.out.chunks, [], 0
+        for cut in [*self._cuts, len(chunks)]:
+            parts.append("".join(chunks[start:cut]).splitlines())
+            start = cut
+        chunks.clear()
+        self._cuts.clear()
+        return parts, bool(stop)
+
+    def _pause(self) -> None:
+        """End a paced part of the reply instead of sleeping."""
+        self.out.flush()
+        self._cuts.append(len(self.out.chunks))
+
+    def do_diff(self, arg):
+        """Set the difficulty, except the ones too slow to share a server."""
+        if arg.strip().lower() in self.LOCAL_DIFFICULTIES:
+            self._print(f"'{arg.strip().lower()}' isn't available over the "
+                        "network.")
+            return
+        super().do_diff(arg)
+
+    def _record_result(self) -> None:
+        """Hand the finished game to the writer task."""
+        g = self.game
+        self.board.submit(g.get_winner(), list(g.players), g.target)
+
+    def get_names(self) -> list[str]:
+        """Attribute names ``help`` lists, minus the local-only commands."""
+        return [n for n in super().get_names()
+                if n[3:] not in self.LOCAL_ONLY]
+
+
+class PigServer:
+    """TCP server: one ``Session`` per connection, one shared scoreboard."""
+
+    def __init__(
+        self,
+        sb: Scoreboard | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        save: Optional[Callable[[Scoreboard], None]] = None,
+        game_factory: Callable[[], Game] = Game,
+        pacer: Pacer | None = None,
+    ) -> None:
+        """Set up (but don't start) a server; ``start()`` binds the port.
+
+        ``pacer`` (default: none) is awaited between the paced parts of
+        every session's replies.
+        """
+        self.sb = sb if sb is not None else Scoreboard()
+        self.host = host
+        self.port = port
+        self.save = save
+        self.game_factory = game_factory
+        self.pacer = pacer if pacer is not None else InstantPacer()
+        self.connections = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._writer: ScoreboardWriter | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> "PigServer":
+        """Start listening. With ``port=0`` the OS picks a free port."""
+        self._writer = ScoreboardWriter(self.sb, self.save)
+        self._writer_task = asyncio.create_task(self._writer.run())
+        self._server = await asyncio.start_server(
+            self._serve_client, self.host, self.port, limit=MAX_LINE
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        """Stop accepting, drop clients and flush pending results."""
+        if self._server is not None:
+            self._server.close()
+            for w in list(self._clients):
+                w.close()
+            await self._server.wait_closed()
+        if self._writer is not None:
+            self._writer.queue.put_nowait(None)
+            await self._writer_task
+
+    async def serve_forever(self) -> None:
+        """Run until cancelled (Ctrl+C)."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        session = Session(self.game_factory(), self._writer, self.pacer)
+        self._clients.add(writer)
+        self.connections += 1
+        try:
+            writer.write(self._reply(["Pig — type a command."]))
+            await writer.drain()
+            while True:
+                try:
+                    raw = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(self._reply(["Line too long."]))
+                    break
+                if not raw:
+                    break  # client hung up
+                parts, done = session.handle_parts(
+                    raw.decode("utf-8", "replace"))
+                *paced, last = parts
+                for lines in paced:
+                    if lines:
+                        writer.write(self._lines(lines))
+                        await writer.drain()
+                    await self.pacer.wait()
+                writer.write(self._reply(last))
+                await writer.drain()
+                if done:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self._clients.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _lines(lines: list[str]) -> bytes:
+        return "".join(line + "\n" for line in lines).encode("utf-8")
+
+    @classmethod
+    def _reply(cls, lines: list[str]) -> bytes:
+        return cls._lines([*lines, END])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the server: ``python -m pig.server [port] [host]``.
+
+    Set ``PIG_METRICS=<port>`` to also serve Prometheus metrics, and
+    ``PIG_PACE`` (e.g. ``async`` or ``0.5``) to pace CPU rolls and busts;
+    by default replies come all at once.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    port = int(argv[0]) if argv else 8023
+    host = argv[1] if len(argv) > 1 else "127.0.0.1"
+    metrics_port = os.getenv("PIG_METRICS")
+    if metrics_port:
+        from pig import metrics
+        metrics.enable()        # times save_scoreboard in place
+        metrics.serve(int(metrics_port))
+    pacer = make_pacer() if os.getenv("PIG_PACE") else InstantPacer()
+    server = PigServer(load_scoreboard(), host=host, port=port,
+                       save=save_scoreboard, pacer=pacer)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,22 @@
 """cmd-based terminal shell for the Pig game."""
 from __future__ import annotations
 import cmd
-import json
 from pathlib import Path
-from time import sleep
+from typing import Callable, Optional
 
 from pig.game import Game
 from pig.scoreboard import Scoreboard
-from pig.ai import ComputerStrategy, SmartStrategy
-from pig.cheat import Cheat
+from pig.pacing import Pacer, make_pacer
+from pig.output import Sink, StreamSink
+from pig import hooks, instrument
 
 
 SAVE_PATH = Path("scoreboard.json")
 
 
+@hooks.hookable
 def load_scoreboard() -> Scoreboard:
+    import json
     if SAVE_PATH.exists():
         try:
             data = json.loads(SAVE_PATH.read_text(encoding="utf-8"))
@@ -24,11 +26,70 @@ def load_scoreboard() -> Scoreboard:
     return Scoreboard()
 
 
+@hooks.hookable
 def save_scoreboard(sb: Scoreboard) -> None:
+    import json
     SAVE_PATH.write_text(json.dumps(sb.to_dict(), indent=2), encoding="utf-8")
 
 
-def _build_brain(difficulty: str):
+class LazyScoreboard:
+    """Stands in for a ``Scoreboard`` and loads it on first real use.
+
+    Reading a big ``scoreboard.json`` is most of the start-up time, and
+    most sessions never look at it until a game ends. Any attribute
+    access (``last``, ``record_from_game``, ``to_dict``...) loads it.
+    """
+
+    def __init__(
+        self, loader: Optional[Callable[[], Scoreboard]] = None
+    ) -> None:
+        """Load with ``loader()`` when needed (``load_scoreboard`` if None)."""
+        self._loader = loader
+        self._sb: Optional[Scoreboard] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True once the real scoreboard has been read."""
+        return self._sb is not None
+
+    def _board(self) -> Scoreboard:
+        if self._sb is None:
+            # looked up at call time so hooks on load_scoreboard still apply
+            self._sb = (self._loader or load_scoreboard)()
+        return self._sb
+
+    def __getattr__(self, name: str):
+        """Load the real scoreboard if needed and read ``name`` from it."""
+        return getattr(self._board(), name)
+
+    def __repr__(self) -> str:
+        """Show whether the scoreboard has been loaded (without loading)."""
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyScoreboard ({state})>"
+
+
+DIFFICULTIES = ("easy", "normal", "hard", "expert")
+
+# look-ahead budgets for search bots: difficulty -> (max depth, secs/move)
+SEARCH_BUDGETS = {"expert": (8, 0.05)}
+
+# 'hint' solves the whole game on first use: ~1s at 100, ~9s at 200
+HINT_MAX_TARGET = 100
+
+
+def _build_brain(difficulty: str, target: int = 100, timed: bool = True):
+    # imported here so starting the shell doesn't pay for the bots
+    from pig.ai import ComputerStrategy, SmartStrategy, SearchStrategy
+    if difficulty in SEARCH_BUDGETS:
+        depth, secs = SEARCH_BUDGETS[difficulty]
+        # untimed: always the full depth, the same moves on any machine
+        return SearchStrategy(max_depth=depth,
+                              time_budget=secs if timed else None)
+    # tuned per target offline (pig/presets.json); falls back to defaults
+    from pig.presets import make_bot, preset_for
+    spec = preset_for(difficulty, target)
+    if spec is not None:
+        return make_bot(spec)
     if difficulty == "easy":
         return ComputerStrategy(base_threshold=18)
     if difficulty == "hard":
@@ -39,49 +100,90 @@ def _build_brain(difficulty: str):
 class PigShell(cmd.Cmd):
     intro = "Pig — type 'help' for commands. Start with 'status' or 'roll'."
     prompt = "> "
-
-    def __init__(self, game: Game, sb: Scoreboard) -> None:
+    recent_after_win = True          # list recent results after each win
+
+    def __init__(
+        self,
+        game: Game,
+        sb: Scoreboard,
+        pacer: Pacer | None = None,
+        out: Sink | None = None,
+    ) -> None:
         super().__init__()
         self.game = game
         self.sb = sb
+        self.pacer = pacer if pacer is not None else make_pacer()
+        # default writes through like print(); pass a buffered sink to
+        # collect each command's output and write it once in postcmd
+        self.out = out if out is not None else StreamSink(autoflush=True)
         self.mode = "pvp"
         self.difficulty = "normal"
         self.brain = None          
-        self._cheat = Cheat(self.game)   # stays dormant until armed
+        self._cheat = None               # built when the word is typed
         self._cheat_unlocked = False
         self._cheat_word = "pepper"      # change this to whatever you like
+        self.persist = True              # batch runs turn off auto-saving
+        self.timed_search = True         # False: search bots use full depth
+        if not self.game.undo_depth:
+            self.game.enable_undo()
 
         #self._print_header()
 
+    def _new_brain(self):
+        """Build the bot for the current difficulty and target."""
+        return _build_brain(self.difficulty, self.game.target,
+                            timed=self.timed_search)
+
+    def _print(self, *parts, sep: str = " ", end: str = "\n") -> None:
+        """Like print(), but into the shell's output sink."""
+        self.out.write(sep.join(str(p) for p in parts) + end)
+
+    def _ask(self, prompt: str) -> str:
+        """Flush pending output, then read a line from the user."""
+        self.out.flush()
+        return input(prompt)
+
+    def _pause(self) -> None:
+        """Dramatic pause. Shows what we have so far if we really wait."""
+        if self.pacer.delay > 0:
+            self.out.flush()
+        self.pacer.pause()
+
     def _print_header(self) -> None:
         g = self.game
-        print("=" * 42)
-        print(f"Pig — first to {g.target} wins")
-        print("-" * 42)
+        self._print("=" * 42)
+        self._print(f"Pig — first to {g.target} wins")
+        self._print("-" * 42)
         p1, p2 = g.players
-        print(f"{p1.name:>12}: {p1.score:>3}   vs   {p2.name:<12}: {p2.score:>3}")
-        print("-" * 42)
+        self._print(f"{p1.name:>12}: {p1.score:>3}   vs   {p2.name:<12}: {p2.score:>3}")
+        self._print("-" * 42)
         self._print_turn()
 
     def _print_turn(self) -> None:
         g = self.game
-        print(f"Current: {g.current.name}")
-        print(f"Turn points: {g.turn_points}")
+        self._print(f"Current: {g.current.name}")
+        self._print(f"Turn points: {g.turn_points}")
         if self.mode == "pvc" and self.brain and g.current is g.players[1]:
-            print("Computer is thinking…")
+            self._print("Computer is thinking…")
 
     def _ensure_cpu_name(self) -> None:
         """Rename Player 2 to 'Computer' only if we're in PvC and it's still the default name."""
         if self.mode == "pvc" and self.game.players[1].name == "Player 2":
             self.game.players[1].change_name("Computer")
 
+    def _record_result(self) -> None:
+        """Put the finished game on the scoreboard (and save it)."""
+        self.sb.record_from_game(self.game)
+        if self.persist:
+            save_scoreboard(self.sb)
+
     def _maybe_record_winner(self) -> None:
         if self.game.is_over:
             winner = self.game.get_winner()
-            self.sb.record_from_game(self.game)
-            save_scoreboard(self.sb)
-            print(f"\n🎉 {winner.name} wins with {winner.score}!\n")
-            self._print_recent()
+            self._record_result()
+            self._print(f"\n🎉 {winner.name} wins with {winner.score}!\n")
+            if self.recent_after_win:
+                self._print_recent()
             self.game.reset(keep_names=True)
             self._ensure_cpu_name()
             self._print_header()
@@ -96,85 +198,125 @@ class PigShell(cmd.Cmd):
         result = self.game.play_cpu_turn(self.brain.decide)
         for step in result.get("actions", []):
             if step["action"] == "roll":
-                print(f"{self.game.players[1].name} rolled {step['value']}")
+                self._print(f"{self.game.players[1].name} rolled {step['value']}")
                 if step["value"] == 1:
-                    print("CPU busted.")
-                    print(f"{self.game.current.name}'s turn.")
+                    self._print("CPU busted.")
+                    self._print(f"{self.game.current.name}'s turn.")
                     break
-                sleep(0.25)
+                self._pause()
         if result["ended"] == "hold":
-            print("CPU holds.")
-            print(f"CPU score: {self.game.players[1].score} points.")
-            print(f"{self.game.current.name}'s turn.")
+            self._print("CPU holds.")
+            self._print(f"CPU score: {self.game.players[1].score} points.")
+            self._print(f"{self.game.current.name}'s turn.")
 
     def _print_recent(self, n: int = 5) -> None:
         rows = self.sb.last(n)
         if not rows:
-            print("(no games recorded yet)")
+            self._print("(no games recorded yet)")
             return
-        print("Recent results:")
+        self._print("Recent results:")
         for r in rows:
             line = ", ".join(f"{name}: {pts}" for name, pts in r.scores.items())
-            print(f"[{r.when}] to {r.target} — winner: {r.winner} — {line}")
-        print()
+            self._print(f"[{r.when}] to {r.target} — winner: {r.winner} — {line}")
+        self._print()
 
     def _prompt_mode_and_diff(self) -> None:
         """Ask once at startup: PvP or PvC (and difficulty)."""
         while True:
-            pick = input("Mode? [1] PvP  [2] PvC: ").strip()
+            pick = self._ask("Mode? [1] PvP  [2] PvC: ").strip()
             if pick in {"1", "2"}:
                 break
-            print("Choose 1 or 2.")
-        self.mode = "pvc" if pick == "2" else "pvp"
+            self._print("Choose 1 or 2.")
+        mode = "pvc" if pick == "2" else "pvp"
 
-        if self.mode == "pvc":
+        difficulty = None
+        if mode == "pvc":
             while True:
-                d = input("Difficulty? [1] Easy  [2] Normal  [3] Hard: ").strip()
-                if d in {"1", "2", "3"}:
+                d = self._ask(
+                    "Difficulty? [1] Easy  [2] Normal  [3] Hard  [4] Expert: "
+                ).strip()
+                if d in {"1", "2", "3", "4"}:
                     break
-                print("Choose 1, 2, or 3.")
-            self.difficulty = {"1": "easy", "2": "normal", "3": "hard"}[d]
-            self.brain = _build_brain(self.difficulty)
-            self._ensure_cpu_name()
-
-        print(f"Mode set to {self.mode}" + (f" ({self.difficulty})" if self.mode == "pvc" else ""))
+                self._print("Choose 1, 2, 3 or 4.")
+            difficulty = DIFFICULTIES[int(d) - 1]
+        self.set_mode(mode, difficulty)
+
+        self._print(f"Mode set to {self.mode}" + (f" ({self.difficulty})" if self.mode == "pvc" else ""))
+
+    def set_mode(self, mode: str, difficulty: str | None = None) -> None:
+        """Pick PvP/PvC (and difficulty) without asking, e.g. from flags."""
+        if mode not in {"pvp", "pvc"}:
+            raise ValueError("mode must be 'pvp' or 'pvc'")
+        if difficulty is not None:
+            if difficulty not in DIFFICULTIES:
+                raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+            self.difficulty = difficulty
+        self.mode = mode
+        self.brain = self._new_brain() if mode == "pvc" else None
+        self._ensure_cpu_name()
 
     def preloop(self):
         self._prompt_mode_and_diff()
         self._print_header()
+        self.out.flush()
 
     def postcmd(self, stop: bool, line: str) -> bool:
         # After every command, check winner, then let CPU act if it's their turn
         self._maybe_record_winner()
         self._cpu_take_turn()
         self._maybe_record_winner()
+        self.out.flush()   # one write per command
         return stop
 
     def do_roll(self, arg):
         """roll: Roll the dice for the current player."""
         v = self.game.roll()
         if v == 1:
-            print("Rolled 1.")
-            sleep(0.25)
-            print("BUSTED! No points this turn.")
-            sleep(0.25)
-            print("Score this round: 0 points.")
-            sleep(0.25)
-            print(f"Total score: {self.game.opponent.score} points.")
-            sleep(0.25)
-            print(f"{self.game.current.name}'s turn.")
-            sleep(0.25)
+            self._print("Rolled 1.")
+            self._pause()
+            self._print("BUSTED! No points this turn.")
+            self._pause()
+            self._print("Score this round: 0 points.")
+            self._pause()
+            self._print(f"Total score: {self.game.opponent.score} points.")
+            self._pause()
+            self._print(f"{self.game.current.name}'s turn.")
+            self._pause()
         else:
-            print(f"Rolled {v}. Turn points: {self.game.turn_points}")
+            self._print(f"Rolled {v}. Turn points: {self.game.turn_points}")
 
     def do_hold(self, arg):
         """hold: Bank current turn points."""
         self.game.hold()
         if not self.game.is_over:
-            print(f"Holding. Current Score: {self.game.opponent.score} points.")
-            sleep(0.25)
-            print(f"{self.game.current.name}'s turn.")
-            sleep(0.25)
+            self._print(f"Holding. Current Score: {self.game.opponent.score} points.")
+            self._pause()
+            self._print(f"{self.game.current.name}'s turn.")
+            self._pause()
+
+    def _cpu_to_move(self) -> bool:
+        return self.mode == "pvc" and self.game.current is self.game.players[1]
+
+    def do_undo(self, arg):
+        """undo: Take back the last roll or hold (in PvC, back to your turn)."""
+        if not self.game.undo():
+            self._print("Nothing to undo.")
+            return
+        # don't stop on the computer's turn, it would just play again
+        while self._cpu_to_move() and self.game.undo():
+            pass
+        self._print("Undone.")
+        self._print_turn()
+
+    def do_redo(self, arg):
+        """redo: Put back what 'undo' took back."""
+        if not self.game.redo():
+            self._print("Nothing to redo.")
+            return
+        while self._cpu_to_move() and self.game.redo():
+            pass
+        self._print("Redone.")
+        self._print_turn()
 
     def do_status(self, arg):
         """status: Show scores and whose turn it is."""
@@ -185,21 +327,24 @@ class PigShell(cmd.Cmd):
         try:
             idx_str, *rest = arg.split()
             if idx_str not in ("1", "2") or not rest:
-                print("Usage: name 1 Alice")
+                self._print("Usage: name 1 Alice")
                 return
             new_name = " ".join(rest)
             self.game.rename(int(idx_str), new_name)
             self._print_header()
         except Exception as e:
-            print(f"Name change failed: {e}")
+            self._print(f"Name change failed: {e}")
 
     def do_target(self, arg):
         """target <points>: Set new target score (>= 1)."""
         try:
             self.game.set_target(int(arg.strip()))
-            print(f"Target set to {self.game.target}.")
+            if self.mode == "pvc":
+                # bot settings are calibrated per target
+                self.brain = self._new_brain()
+            self._print(f"Target set to {self.game.target}.")
         except Exception as e:
-            print(f"Could not set target: {e}")
+            self._print(f"Could not set target: {e}")
 
     def do_reset(self, arg):
         """reset [keep|clear]: Reset the game. Keep names by default."""
@@ -208,6 +353,53 @@ class PigShell(cmd.Cmd):
         self._ensure_cpu_name()
         self._print_header()
 
+    def do_stats(self, arg):
+        """stats [on|off|reset|profile|save <file>]: Timing counters (dev)."""
+        op, _, rest = arg.strip().partition(" ")
+        op = op.lower()
+        if op == "on":
+            instrument.enable()
+            self._print("Counters on.")
+        elif op == "off":
+            instrument.disable()
+            self._print("Counters off.")
+        elif op == "reset":
+            instrument.reset()
+            self._print("Counters reset.")
+        elif op == "profile":
+            instrument.enable(profile=True)
+            self._print("Counters on, cProfile running.")
+        elif op == "save":
+            path = rest.strip() or "pig.pstats"
+            if instrument.dump_profile(path):
+                self._print(f"Profile written to {path} "
+                            f"(python -m pstats {path})")
+            else:
+                self._print("No profile yet — run 'stats profile' first.")
+        elif op:
+            self._print("Usage: stats [on|off|reset|profile|save <file>]")
+        else:
+            self._print(instrument.report())
+
+    def do_hint(self, arg):
+        """hint: Exact chance to win from here, and the best move."""
+        from pig import analysis
+        if self.game.is_over:
+            self._print("Game is over.")
+            return
+        if self.game.target > HINT_MAX_TARGET:
+            self._print(f"No hint: targets above {HINT_MAX_TARGET} take "
+                        "too long to solve while you wait.")
+            return
+        try:
+            p = analysis.win_probability(self.game)
+            move = analysis.best_move(self.game)
+        except ValueError as e:
+            self._print(f"No hint: {e}")
+            return
+        self._print(f"{self.game.current.name}: {p:.1%} to win with best play. "
+                    f"Best move: {move}.")
+
     def do_view(self, arg):
         """view: Show recent scoreboard results."""
         self._print_recent()
@@ -215,7 +407,7 @@ class PigShell(cmd.Cmd):
     def do_save(self, arg):
         """save: Write scoreboard to disk."""
         save_scoreboard(self.sb)
-        print(f"Scoreboard saved to {SAVE_PATH.resolve()}")
+        self._print(f"Scoreboard saved to {SAVE_PATH.resolve()}")
 
     # ----- mode / difficulty ------------------------------------------
 
@@ -223,64 +415,69 @@ class PigShell(cmd.Cmd):
         """mode <pvp|pvc>: Switch between two humans or vs computer."""
         val = arg.strip().lower()
         if val not in {"pvp", "pvc"}:
-            print("Pick 'pvp' or 'pvc'.")
+            self._print("Pick 'pvp' or 'pvc'.")
             return
         self.mode = val
-        self.brain = _build_brain(self.difficulty) if self.mode == "pvc" else None
+        self.brain = self._new_brain() if self.mode == "pvc" else None
         self._ensure_cpu_name()
         self._print_header()
 
     def do_diff(self, arg):
-        """diff <easy|normal|hard>: Set computer difficulty (PvC only)."""
+        """diff <easy|normal|hard|expert>: Set the CPU difficulty (PvC)."""
         val = arg.strip().lower()
-        if val not in {"easy", "normal", "hard"}:
-            print("Pick 'easy', 'normal' or 'hard'.")
+        if val not in DIFFICULTIES:
+            self._print("Pick 'easy', 'normal', 'hard' or 'expert'.")
             return
         self.difficulty = val
         if self.mode == "pvc":
-            self.brain = _build_brain(self.difficulty)
-        print(f"Difficulty set to {self.difficulty}.")
+            self.brain = self._new_brain()
+        self._print(f"Difficulty set to {self.difficulty}.")
 
     def do_quit(self, arg):
         """quit: Exit the game."""
-        save_scoreboard(self.sb)
-        print("Bye!")
+        # a scoreboard that was never loaded has nothing new to write
+        if self.persist and getattr(self.sb, "loaded", True):
+            save_scoreboard(self.sb)
+        self._print("Bye!")
         return True
 
     def do_EOF(self, arg):
         """Ctrl+D/Ctrl+Z: Exit."""
-        print()
+        self._print()
         return self.do_quit(arg)
 
     def default(self, line: str) -> bool:
     # if user types the magic word, open the cheat menu
         if line.strip().lower() == self._cheat_word:
+            if self._cheat is None:
+                from pig.cheat import Cheat
+                self._cheat = Cheat(self.game)
             self._cheat.arm()
             self._cheat_unlocked = True
-            print("(dev) cheats unlocked.")
+            self._print("(dev) cheats unlocked.")
             self._cheat_menu()
             return False
     # otherwise, just say we don't know that command
-        print(f"Unknown command: {line!r}. Type 'help' for a list of commands.")
+        self._print(f"Unknown command: {line!r}. Type 'help' for a list of commands.")
         return False
     
     def _cheat_menu(self) -> None:
         if not self._cheat_unlocked:
-            print("nope.")
+            self._print("nope.")
             return
 
-        print("\ncheat menu — type 'back' to exit")
-        print("  next <vals...>     # force next rolls, e.g. 'next 6 6 2'")
-        print("  nobust on|off      # 1s count as 2 when on")
-        print("  add <p> <pts>      # add points to player 1/2")
-        print("  score <p> <n>      # set exact score for player 1/2")
-        print("  win [p]            # make player 1 (or 2) win now")
-        print("  clear              # clear all cheat knobs\n")
+        self._print("\ncheat menu — type 'back' to exit")
+        self._print("  next <vals...>     # force next rolls, e.g. 'next 6 6 2'")
+        self._print("  nobust on|off      # 1s count as 2 when on")
+        self._print("  add <p> <pts>      # add points to player 1/2")
+        self._print("  score <p> <n>      # set exact score for player 1/2")
+        self._print("  win [p]            # make player 1 (or 2) win now")
+        self._print("  clear              # clear all cheat knobs\n")
 
         while True:
-            cmd = input("(cheat)> ").strip().lower()
+            cmd = self._ask("(cheat)> ").strip().lower()
             if cmd in {"back", "exit", "quit"}:
-                print("leaving cheat menu.\n")
+                self._print("leaving cheat menu.\n")
                 return
             if not cmd:
                 continue
@@ -291,27 +488,31 @@ class PigShell(cmd.Cmd):
                 if op == "next":
                     for v in parts[1:]:
                         self._cheat.force_next_roll(int(v))
-                    print("ok.")
+                    self._print("ok.")
                 elif op == "nobust":
                     on = len(parts) > 1 and parts[1] == "on"
                     self._cheat.no_bust_on_ones(on)
-                    print(f"nobust {'on' if on else 'off'}.")
+                    self._print(f"nobust {'on' if on else 'off'}.")
                 elif op == "add":
                     p, pts = int(parts[1]), int(parts[2])
                     self._cheat.add_points(p, pts)
-                    print("ok.")
+                    self._print("ok.")
                 elif op == "score":
                     p, n = int(parts[1]), int(parts[2])
                     self._cheat.set_score(p, n)
-                    print("ok.")
+                    self._print("ok.")
                 elif op == "win":
                     p = int(parts[1]) if len(parts) > 1 else 1
                     self._cheat.win_now(p)
-                    print("ok.")
+                    self._print("ok.")
                 elif op == "clear":
                     self._cheat.clear()
-                    print("cleared.")
+                    self._print("cleared.")
                 else:
-                    print("huh?")
+                    self._print("huh?")
             except Exception as e:
-                print(f"err: {e}")
+                self._print(f"err: {e}")
+
+
+# PIG_PROF=1 turns the timing hooks on (see pig.instrument)
+instrument.enable_from_env()
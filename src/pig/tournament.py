@@ -0,0 +1,184 @@
+"""Round-robin tournaments that stop each matchup as soon as it's settled.
+
+A fixed number of games per pair wastes most of them: ``computer:18`` vs
+a strong bot is clear after a few dozen games, while two near-equal bots
+need thousands. :func:`run` plays every pairing in rounds of paired
+blocks (``pig.compare.play_block``, 4 games each) and after each round
+checks a stopping rule per pair:
+
+* ``"sprt"`` - Wald's sequential probability ratio test of
+  ``p = 0.5 - delta`` (B is better) against ``p = 0.5 + delta`` (A is
+  better) on A's game results, with error rates ``alpha``/``beta``
+  (it counts games as independent, which the paired dice only make
+  more conservative);
+* ``"ci"`` - stop once the 95% interval of the win rate leaves 0.5, or
+  is narrower than ``delta`` on each side (an even matchup).
+
+Each round shares ``round_games`` games between the pairs still running,
+so the games saved on lopsided pairs go to the close ones. Pairs that hit
+``max_games`` stop unsettled.
+
+``python -m pig.tournament easy normal hard computer:18`` prints the table.
+"""
+from __future__ import annotations
+import argparse
+import math
+import sys
+from dataclasses import dataclass, field
+from itertools import combinations
+
+from pig.compare import Comparison, play_block
+
+
+RULES = ("sprt", "ci")
+BLOCK_GAMES = 4             # games in one paired, mirrored block
+MIN_BLOCKS = 25             # before trusting the spread of block scores
+
+
+@dataclass
+class Pairing:
+    """One matchup of the tournament; rates are A's."""
+
+    a: str
+    b: str
+    result: Comparison = field(default_factory=Comparison)
+    verdict: str | None = None      # "a", "b", "even", or None if unsettled
+    rounds: int = 0
+
+    @property
+    def games(self) -> int:
+        """Games played so far."""
+        return self.result.games
+
+    @property
+    def winner(self) -> str | None:
+        """Name of the better bot, if the pairing was settled that way."""
+        return {"a": self.a, "b": self.b}.get(self.verdict or "")
+
+
+def sprt_llr(wins: int, games: int, delta: float = 0.05) -> float:
+    """Log-likelihood ratio of ``p = 0.5 + delta`` over ``p = 0.5 - delta``."""
+    p1, p0 = 0.5 + delta, 0.5 - delta
+    return (wins * math.log(p1 / p0)
+            + (games - wins) * math.log((1 - p1) / (1 - p0)))
+
+
+def settle(result: Comparison, rule: str = "sprt", *, delta: float = 0.05,
+           alpha: float = 0.05, beta: float = 0.05) -> str | None:
+    """Check one pairing's stopping rule.
+
+    Args:
+        result (Comparison): Games played so far.
+        rule (str): ``"sprt"`` or ``"ci"``.
+        delta (float): How far from 0.5 counts as a real difference.
+        alpha (float): SPRT chance of calling A better when B is.
+        beta (float): SPRT chance of calling B better when A is.
+
+    Returns:
+        str | None: ``"a"``, ``"b"``, ``"even"`` (``"ci"`` only), or None
+        to keep playing.
+    """
+    if rule == "sprt":
+        llr = sprt_llr(result.wins, result.games, delta)
+        if llr >= math.log((1 - beta) / alpha):
+            return "a"
+        if llr <= math.log(beta / (1 - alpha)):
+            return "b"
+        return None
+    if rule == "ci":
+        if result.blocks < MIN_BLOCKS:
+            return None
+        lo, hi = result.interval
+        if lo > 0.5:
+            return "a"
+        if hi < 0.5:
+            return "b"
+        if result.half_width < delta:
+            return "even"
+        return None
+    raise ValueError(f"unknown rule {rule!r} (expected one of {RULES})")
+
+
+def run(bots: dict, *, rule: str = "sprt", delta: float = 0.05,
+        alpha: float = 0.05, beta: float = 0.05, round_games: int = 400,
+        max_games: int = 20_000, seed: int = 0, target: int = 100,
+        sides: int = 6) -> list[Pairing]:
+    """Play a round-robin until every pairing is settled or capped.
+
+    Args:
+        bots (dict): Name -> strategy object (anything with ``decide``).
+        rule (str): Stopping rule, ``"sprt"`` or ``"ci"``.
+        delta (float): Smallest win-rate edge over 0.5 worth resolving.
+        alpha (float): SPRT error rate for "A is better".
+        beta (float): SPRT error rate for "B is better".
+        round_games (int): Games per round, shared by the running pairs.
+        max_games (int): Cap per pairing.
+        seed (int): Base seed; pairing ``p`` plays blocks
+            ``seed + p * max_games + i``, so results are reproducible.
+        target (int): Target score.
+        sides (int): Die size.
+
+    Returns:
+        list[Pairing]: Every pairing, in round-robin order.
+    """
+    if rule not in RULES:
+        raise ValueError(f"unknown rule {rule!r} (expected one of {RULES})")
+    pairs = [Pairing(a, b) for a, b in combinations(bots, 2)]
+    live = list(range(len(pairs)))
+    while live:
+        blocks = max(1, round_games // (BLOCK_GAMES * len(live)))
+        for p in live:
+            pair = pairs[p]
+            start = pair.result.blocks
+            stop = min(start + blocks, max_games // BLOCK_GAMES)
+            for i in range(start, stop):
+                pair.result.add(*play_block(
+                    bots[pair.a], bots[pair.b], seed + p * max_games + i,
+                    target, sides))
+            pair.rounds += 1
+            pair.verdict = settle(pair.result, rule, delta=delta,
+                                  alpha=alpha, beta=beta)
+        live = [p for p in live if pairs[p].verdict is None
+                and pairs[p].games + BLOCK_GAMES <= max_games]
+    return pairs
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    from pig.matchup import bot_from_text
+    ap = argparse.ArgumentParser(description="Round-robin of Pig bots "
+                                             "with early stopping.")
+    ap.add_argument("bots", nargs="+",
+                    help='"easy", "normal", "hard", "computer:18", '
+                         '"smart:12,28"')
+    ap.add_argument("--rule", choices=RULES, default="sprt")
+    ap.add_argument("--delta", type=float, default=0.05)
+    ap.add_argument("--round-games", type=int, default=400)
+    ap.add_argument("--max-games", type=int, default=20_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--target", type=int, default=100)
+    args = ap.parse_args(argv)
+    try:
+        bots = {text: bot_from_text(text, args.target) for text in args.bots}
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if len(bots) < 2:
+        print("error: need at least two different bots", file=sys.stderr)
+        return 2
+    pairs = run(bots, rule=args.rule, delta=args.delta,
+                round_games=args.round_games, max_games=args.max_games,
+                seed=args.seed, target=args.target)
+    for p in pairs:
+        verdict = {"a": f"{p.a} better", "b": f"{p.b} better",
+                   "even": "even"}.get(p.verdict or "", "unsettled")
+        print(f"{p.a:>14} vs {p.b:<14} {p.result.rate:.3f}  "
+              f"{p.games:>6} games  {verdict}")
+    total = sum(p.games for p in pairs)
+    print(f"{total} games in all ({len(pairs) * args.max_games} "
+          f"at the cap for every pair)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
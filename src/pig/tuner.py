@@ -0,0 +1,417 @@
+"""Parameter sweep / auto-tuner for the threshold bots.
+
+Scores candidate ``ComputerStrategy`` / ``SmartStrategy`` settings
+against a reference bot. Up to ``pig.analysis.MAX_TARGET`` every
+candidate's win rate is solved exactly (``pig.analysis.solve_pair``), so
+the picks carry no sampling noise at all. Above that, seeded matches are
+played on all cores with common random numbers (``pig.compare``: every
+candidate meets the same dice, mirrored too) and successive halving keeps
+the better half after every round, doubling the games for the survivors.
+
+The winners are saved per target score as difficulty presets
+(``pig.presets``) that ``pig.shell._build_brain`` looks up. Hard is the
+strongest setting of either bot kind (at small targets the smart bot's
+fixed endgame rules make every smart setting play alike, and only a
+greedy computer setting beats the reference); normal and easy are picked
+strictly below it. Thresholds are made non-decreasing in the target
+(:func:`monotone`) before saving, so a preset never gets more timid as
+the game gets longer, and a table where easy < normal < hard no longer
+holds is refused (:func:`check_order`).
+
+Run it with ``python -m pig.tuner --targets 10 50 100 --out pig/presets.json``.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from pig.analysis import MAX_TARGET, solve_pair
+from pig.compare import play_block
+from pig.presets import PRESETS_PATH, Spec, make_bot, save_presets
+
+
+REFERENCE: Spec = ("smart", (12, 28))
+
+# win rate vs the reference each difficulty aims for ("hard" = best found)
+EASY_RATE = 0.40
+NORMAL_RATE = 0.50
+
+
+def play_match(a: Spec, b: Spec, games: int, seed: int,
+               target: int = 100) -> int:
+    """Play ``games`` games of ``a`` vs ``b``; return how many ``a`` won.
+
+    Games go in ``pig.compare`` blocks of four (both seat orders, plain
+    and mirrored dice), block ``i`` seeded with ``seed + i``; a remainder
+    of fewer than four is played as single games with alternating seats.
+    The same call always gives the same answer, and two candidates
+    played with the same ``seed`` see the same dice.
+    """
+    bot_a, bot_b = make_bot(a), make_bot(b)
+    blocks, extra = divmod(games, 4)
+    wins = 0
+    for i in range(blocks):
+        wins += play_block(bot_a, bot_b, seed + i, target)[0]
+    for i in range(blocks, blocks + extra):
+        wins += play_block(bot_a, bot_b, seed + i, target, paired=False)[0]
+    return wins
+
+
+def exact_rate(a: Spec, b: Spec, target: int = 100) -> float:
+    """Solve ``a``'s win chance against ``b``, seats alternating."""
+    wa, wb = solve_pair(make_bot(a), make_bot(b), target)
+    return (wa.value(0, 0, 0) + 1.0 - wb.value(0, 0, 0)) / 2
+
+
+def _match_task(args: tuple) -> int:
+    return play_match(*args)
+
+
+def _exact_task(args: tuple) -> float:
+    return exact_rate(*args)
+
+
+def _run(tasks: list[tuple], workers: int, fn=_match_task) -> list:
+    if workers <= 1 or len(tasks) <= 1:
+        return [fn(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, tasks, chunksize=1))
+
+
+def grid(kind: str, target: int = 100) -> list[Spec]:
+    """Build the search grid for a bot kind, scaled to the target score.
+
+    Thresholds never go above the target (or 40, where holding later
+    stops paying off at any target).
+    """
+    top = max(4, min(40, target))
+    step = 2 if top >= 20 else 1
+    if kind == "computer":
+        return [("computer", (base,))
+                for base in range(max(2, top // 4), top + 1, step)]
+    if kind == "smart":
+        return [
+            ("smart", (lo, hi))
+            for lo in range(max(2, top // 5), top * 2 // 3 + 1, step * 2)
+            for hi in range(lo + step * 2, top + 1, step * 2)
+        ]
+    raise ValueError(f"unknown bot kind: {kind!r}")
+
+
+@dataclass
+class Result:
+    """How one candidate did against the reference."""
+
+    spec: Spec
+    wins: int
+    games: int
+    exact: float | None = None      # solved win rate (no games played)
+
+    @property
+    def rate(self) -> float:
+        """Share of games won, or the solved chance (0 if neither)."""
+        if self.exact is not None:
+            return self.exact
+        return self.wins / self.games if self.games else 0.0
+
+
+def successive_halving(
+    candidates: Sequence[Spec],
+    reference: Spec = REFERENCE,
+    *,
+    games: int = 200,
+    rounds: int | None = None,
+    chunk: int = 100,
+    workers: int | None = None,
+    seed: int = 0,
+    target: int = 100,
+) -> list[Result]:
+    """Rank candidates against ``reference``, dropping losers each round.
+
+    Args:
+        candidates: Bot specs to try.
+        reference: Bot every candidate plays against.
+        games: Games per candidate in the first round (doubles each round).
+        rounds: How many rounds; default halves down to one survivor.
+        chunk: Games per worker task.
+        workers: Processes to use (default: all cores).
+        seed: Base seed. Every chunk of games gets its own, but all the
+            candidates still in play get the same ones, so they are
+            compared on the same dice.
+        target: Target score of the games.
+
+    Returns:
+        list[Result]: Every candidate, best first. Dropped ones keep the
+        counts they had when they were dropped.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {spec: Result(spec, 0, 0) for spec in candidates}
+    alive = list(candidates)
+    if rounds is None:
+        rounds = max(1, (len(alive) - 1).bit_length())
+    per = games
+    for _ in range(rounds):
+        tasks, owners = [], []
+        for spec in alive:
+            start = results[spec].games    # the same for every survivor
+            for done in range(0, per, chunk):
+                n = min(chunk, per - done)
+                tasks.append((spec, reference, n, seed + start + done,
+                              target))
+                owners.append(spec)
+        for spec, wins, task in zip(owners, _run(tasks, workers), tasks):
+            results[spec].wins += wins
+            results[spec].games += task[2]
+        alive.sort(key=lambda s: -results[s].rate)
+        if len(alive) == 1:
+            break
+        alive = alive[: max(1, len(alive) // 2)]
+        per *= 2
+    ranked = sorted(results.values(), key=lambda r: (-r.games, -r.rate))
+    return ranked
+
+
+def exact_results(
+    candidates: Sequence[Spec],
+    reference: Spec = REFERENCE,
+    *,
+    workers: int | None = None,
+    target: int = 100,
+) -> list[Result]:
+    """Solve every candidate against ``reference`` exactly, best first.
+
+    Only for targets up to ``pig.analysis.MAX_TARGET``. No games are
+    played, so there is nothing to halve: every candidate gets scored.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(spec, reference, target) for spec in candidates]
+    rates = _run(tasks, workers, _exact_task)
+    ranked = [Result(spec, 0, 0, rate)
+              for spec, rate in zip(candidates, rates)]
+    ranked.sort(key=lambda r: -r.rate)
+    return ranked
+
+
+def _entry(r: Result) -> dict:
+    entry = {"kind": r.spec[0], "params": list(r.spec[1]),
+             "win_rate": round(r.rate, 4)}
+    if r.exact is None:
+        entry["games"] = r.games
+    return entry
+
+
+def pick_presets(
+    computer: Iterable[Result], smart: Iterable[Result]
+) -> dict[str, dict]:
+    """Choose easy/normal/hard settings from tuning results.
+
+    ``hard`` is the best setting of either kind: each kind's survivor of
+    the most halving rounds (best win rate among those), the stronger of
+    the two, smart on a tie. ``normal`` is the setting closest to an even
+    match that is still weaker than hard (smart if there is one), and
+    ``easy`` the one closest to ``EASY_RATE`` that is weaker than normal.
+    The computer settings for normal and easy hold no later than the best
+    computer setting (a bot can be weak by being too timid or too greedy;
+    these are always the timid kind, so they don't flip between the two).
+    Settings that score the same go to the one closest to ``REFERENCE``.
+
+    Raises:
+        ValueError: If a kind has no results, or nothing is left weaker
+            than hard or normal.
+    """
+    computer = [r for r in computer if r.games or r.exact is not None]
+    smart = [r for r in smart if r.games or r.exact is not None]
+    if not computer or not smart:
+        raise ValueError("need results for both bot kinds")
+
+    def off(r: Result) -> int:          # ties go to the reference's shape
+        return sum(abs(x - y) for x, y in zip(r.spec[1], REFERENCE[1]))
+
+    def best(results: list[Result]) -> Result:
+        return max(results,
+                   key=lambda r: (r.games, round(r.rate, 6), -off(r)))
+
+    def closest(results: list[Result], rate: float, than: Result,
+                name: str) -> Result:
+        weaker = [r for r in results
+                  if round(r.rate, 6) < round(than.rate, 6)]
+        if not weaker:
+            raise ValueError(f"no setting is weaker than {name} "
+                             f"({than.spec[0]} {than.spec[1]}, "
+                             f"{than.rate:.3f})")
+        return min(weaker, key=lambda r: (round(abs(r.rate - rate), 6),
+                                          off(r)))
+
+    top = best(computer)
+    hard = max(best(smart), top, key=lambda r: round(r.rate, 6))
+    timid = [r for r in computer if r.spec[1][0] <= top.spec[1][0]]
+    try:
+        normal = closest(smart, NORMAL_RATE, hard, "hard")
+    except ValueError:
+        normal = closest(timid, NORMAL_RATE, hard, "hard")
+    easy = closest(timid, EASY_RATE, normal, "normal")
+    return {name: _entry(r)
+            for name, r in (("easy", easy), ("normal", normal),
+                            ("hard", hard))}
+
+
+def _pooled(values: list[float]) -> list[float]:
+    """Closest non-decreasing sequence (pool adjacent violators)."""
+    pools: list[list[float]] = []           # [mean, size]
+    for v in values:
+        pools.append([v, 1])
+        while len(pools) > 1 and pools[-2][0] > pools[-1][0]:
+            m, n = pools.pop()
+            pools[-1][0] = (pools[-1][0] * pools[-1][1] + m * n) / (
+                pools[-1][1] + n)
+            pools[-1][1] += n
+    return [m for m, n in pools for _ in range(n)]
+
+
+def monotone(rows: dict[int, dict[str, dict]]) -> set[tuple[int, str]]:
+    """Make each difficulty's thresholds non-decreasing in the target.
+
+    Works in place on ``{target: {difficulty: entry}}``; each threshold
+    is replaced by its least-squares non-decreasing fit across targets
+    (same bot kind only). Returns the ``(target, difficulty)`` pairs
+    that changed; their ``win_rate`` notes are stale.
+    """
+    series: dict[tuple, list[int]] = {}
+    for target in sorted(rows):
+        for name, entry in rows[target].items():
+            key = (name, entry["kind"], len(entry["params"]))
+            series.setdefault(key, []).append(target)
+    changed = set()
+    for (name, _, size), targets in series.items():
+        fits = [_pooled([rows[t][name]["params"][i] for t in targets])
+                for i in range(size)]
+        for k, t in enumerate(targets):
+            params = [round(fit[k]) for fit in fits]
+            for i in range(1, size):
+                params[i] = max(params[i], params[i - 1])    # min <= max
+            if params != list(rows[t][name]["params"]):
+                rows[t][name]["params"] = params
+                changed.add((t, name))
+    return changed
+
+
+def calibrate(
+    target: int,
+    *,
+    games: int = 200,
+    workers: int | None = None,
+    seed: int = 0,
+    exact: bool | None = None,
+    verbose: bool = False,
+) -> dict[str, dict]:
+    """Tune both bot kinds at one target and pick its presets.
+
+    ``exact`` solves the win rates instead of playing games; by default
+    it does whenever the target is small enough to solve.
+    """
+    if exact is None:
+        exact = target <= MAX_TARGET
+    ranked = {}
+    for kind in ("computer", "smart"):
+        if exact:
+            ranked[kind] = exact_results(grid(kind, target),
+                                         workers=workers, target=target)
+        else:
+            ranked[kind] = successive_halving(
+                grid(kind, target), games=games, workers=workers,
+                seed=seed, target=target,
+            )
+        if verbose:
+            print(f"target {target}, {kind}:")
+            for r in ranked[kind][:3]:
+                print(f"  {r.spec[1]}  {r.rate:.3f}  ({r.games} games)")
+    return pick_presets(ranked["computer"], ranked["smart"])
+
+
+def rescore(entry: dict, target: int, *, games: int = 200,
+            seed: int = 0) -> None:
+    """Refresh an entry's ``win_rate`` note after its params changed."""
+    spec = (entry["kind"], tuple(entry["params"]))
+    if target <= MAX_TARGET:
+        entry["win_rate"] = round(exact_rate(spec, REFERENCE, target), 4)
+        entry.pop("games", None)
+    else:
+        games = games * 8
+        wins = play_match(spec, REFERENCE, games, seed, target)
+        entry["win_rate"], entry["games"] = round(wins / games, 4), games
+
+
+def check_order(rows: dict[int, dict[str, dict]]) -> None:
+    """Raise ``ValueError`` unless every target has easy < normal < hard.
+
+    Run it after :func:`rescore`: smoothing can move a setting past its
+    neighbour, and a table whose hard preset doesn't beat normal must not
+    be saved.
+    """
+    for target, row in sorted(rows.items()):
+        rates = [row[name]["win_rate"] for name in ("easy", "normal", "hard")]
+        if not rates[0] < rates[1] < rates[2]:
+            raise ValueError(f"target {target}: easy/normal/hard win "
+                             f"rates {rates} are not increasing")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point."""
+    ap = argparse.ArgumentParser(description="Tune Pig bot thresholds.")
+    ap.add_argument("--games", type=int, default=200,
+                    help="games per candidate in the first round")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--targets", type=int, nargs="+", default=[100],
+                    help="target scores to calibrate")
+    ap.add_argument("--simulate", action="store_true",
+                    help="play games even where the rates can be solved")
+    ap.add_argument("--out", type=Path, default=None,
+                    help="merge presets into this JSON "
+                         f"(e.g. {PRESETS_PATH.name})")
+    args = ap.parse_args(argv)
+
+    rows = {}
+    for target in args.targets:
+        try:
+            presets = calibrate(target, games=args.games,
+                                workers=args.workers, seed=args.seed,
+                                exact=False if args.simulate else None,
+                                verbose=True)
+        except ValueError as e:
+            print(f"error: target {target}: {e}", file=sys.stderr)
+            return 1
+        for name, p in presets.items():
+            print(f"  {name:>6}: {p['kind']} {tuple(p['params'])} "
+                  f"~{p['win_rate']:.3f}")
+        rows[target] = presets
+    if args.out:
+        try:
+            data = json.loads(args.out.read_text(encoding="utf-8"))
+            old = {int(t): row for t, row in data["targets"].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            old = {}
+        rows = {**old, **rows}
+        for target, name in sorted(monotone(rows)):
+            rescore(rows[target][name], target, games=args.games,
+                    seed=args.seed)
+            p = rows[target][name]
+            print(f"  smoothed {target} {name}: {tuple(p['params'])} "
+                  f"~{p['win_rate']:.3f}")
+        try:
+            check_order(rows)
+        except ValueError as e:
+            print(f"error: {e}; presets not written", file=sys.stderr)
+            return 1
+        save_presets(rows, args.out)
+        print(f"presets written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
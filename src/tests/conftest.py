@@ -2,4 +2,7 @@
 import os
 import sys
 
-sys.path.insert(0, os.path.abspath("src"))
\ No newline at end of file
+sys.path.insert(0, os.path.abspath("src"))
+
+# no dramatic pauses in the shell while testing
+os.environ.setdefault("PIG_PACE", "instant")
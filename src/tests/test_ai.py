@@ -1,6 +1,8 @@
 import pytest
 from pig.game import Game
-from pig.ai import ComputerStrategy, SmartStrategy
+from pig.ai import (
+    ComputerStrategy, SmartStrategy, SearchStrategy, TranspositionTable,
+)
 
 
 def _setup(game: Game, *, me_score=0, opp_score=0, turn_points=0,
@@ -142,4 +144,100 @@ def test_smart_slightly_ahead_reduces_threshold():
     bot = SmartStrategy()
     assert bot.decide(g) == "roll"
     g.turn_points = 16
-    assert bot.decide(g) == "hold"
\ No newline at end of file
+    assert bot.decide(g) == "hold"
+
+# SearchStrategy (expert)
+def test_search_holds_when_it_can_win_and_rolls_on_zero():
+    """Test the obvious moves skip the search entirely."""
+    bot = SearchStrategy(table=TranspositionTable())
+    g = _setup(Game(), me_score=95, turn_points=5)
+    assert bot.decide(g) == "hold"
+    g = _setup(Game(), me_score=50, opp_score=50, turn_points=0)
+    assert bot.decide(g) == "roll"
+    assert bot.last_depth == 0
+
+
+def test_search_rolls_small_and_holds_big_turns():
+    """Test sensible choices in the middle of a game."""
+    bot = SearchStrategy(max_depth=5, time_budget=5, table=TranspositionTable())
+    g = _setup(Game(), me_score=20, opp_score=20, turn_points=2)
+    assert bot.decide(g) == "roll"
+    assert bot.last_depth == 5
+    g.turn_points = 40
+    assert bot.decide(g) == "hold"
+
+
+def test_search_stops_at_deadline():
+    """Test iterative deepening gives up when time runs out."""
+    bot = SearchStrategy(max_depth=50, time_budget=0.01,
+                         table=TranspositionTable())
+    g = _setup(Game(), me_score=10, opp_score=10, turn_points=6)
+    assert bot.decide(g) in {"roll", "hold"}
+    assert bot.last_depth < 50
+
+
+def test_transposition_table_is_reused_and_bounded():
+    """Test the table caches across calls and evicts oldest entries."""
+    table = TranspositionTable(max_entries=50)
+    bot = SearchStrategy(max_depth=4, time_budget=5, table=table)
+    g = _setup(Game(), me_score=30, opp_score=40, turn_points=8)
+    bot.decide(g)
+    assert len(table) == 50
+    bot.decide(g)
+    assert table.hits > 0
+
+    t = TranspositionTable(max_entries=2)
+    t.put(1, 0.1); t.put(2, 0.2); t.put(3, 0.3)
+    assert t.get(1) is None and t.get(3) == 0.3
+    t.clear()
+    assert len(t) == 0
+
+
+def test_transposition_table_rejects_bad_size():
+    """Test size and depth validation."""
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+    with pytest.raises(ValueError):
+        SearchStrategy(max_depth=0)
+    with pytest.raises(ValueError):
+        SearchStrategy(max_depth=256)      # would spill out of the key
+    assert SearchStrategy(max_depth=255).max_depth == 255
+    # deepest allowed depth still gets its own key
+    k = SearchStrategy._key
+    assert k(3, 4, 5, 255, 100, 6) != k(3, 4, 6, 0, 100, 6)
+
+
+def test_search_key_keeps_setups_apart():
+    """Test positions from different targets and dice never share a key."""
+    from pig.dice import Dice
+    k = SearchStrategy._key
+    keys = {k(me, opp, t, d, target, sides)
+            for target in (10, 11, 74)
+            for sides in (2, 6, 63, 64, 255)
+            for me in range(0, target, 3)
+            for opp in range(0, target, 4)
+            for t in range(0, target - me, 5)
+            for d in (1, 255)}
+    count = sum(len(range(0, target - me, 5)) * len(range(0, target, 4))
+                * 2 * 5
+                for target in (10, 11, 74) for me in range(0, target, 3))
+    assert len(keys) == count
+    g = Game(target=20, dice=Dice(256))
+    with pytest.raises(ValueError, match="sides"):
+        SearchStrategy().decide(g)
+
+
+def test_untimed_search_always_reaches_full_depth(monkeypatch):
+    """Test time_budget=None ignores the clock entirely."""
+    import pig.ai as ai
+    ticks = iter(range(0, 10**9, 10))       # every clock read: 10s later
+    monkeypatch.setattr(ai, "perf_counter", lambda: next(ticks))
+    g = Game()
+    g.turn_points = 12
+    bot = SearchStrategy(max_depth=6, time_budget=None,
+                         table=TranspositionTable())
+    bot.decide(g)
+    assert bot.last_depth == 6
+    timed = SearchStrategy(max_depth=6, table=TranspositionTable())
+    timed.decide(g)
+    assert timed.last_depth < 6
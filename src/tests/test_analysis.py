@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from pig import analysis
+from pig.ai import ComputerStrategy, SmartStrategy
+from pig.game import Game
+from pig.scoreboard import Scoreboard
+import pig.shell as shell
+
+
+def _game(target, me=0, opp=0, points=0, current=0):
+    g = Game(target=target)
+    g.players[current].score = me
+    g.players[1 - current].score = opp
+    g.current_index = current
+    g.turn_points = points
+    return g
+
+
+def test_known_value_at_100():
+    """Test the first player's optimal chance matches the published 0.5306."""
+    table = analysis.optimal(100)
+    assert table.value(0, 0, 0) == pytest.approx(0.5306, abs=5e-5)
+    assert analysis.optimal(100) is table          # solved once
+
+
+def test_optimal_table_satisfies_its_equations():
+    """Test roll/hold equations hold (and the chosen move is the best)."""
+    T, s = 25, 6
+    t = analysis.optimal(T, s)
+    rng = random.Random(1)
+    for _ in range(300):
+        i, j = rng.randrange(T), rng.randrange(T)
+        k = rng.randrange(T - i)
+        roll = (1 - t.value(j, i, 0)
+                + sum(t.value(i, j, k + f) for f in range(2, s + 1))) / s
+        best = roll if k == 0 else max(roll, 1 - t.value(j, i + k, 0))
+        assert t.value(i, j, k) == pytest.approx(best, abs=1e-9)
+        if k and t.move(i, j, k) == "hold":
+            assert 1 - t.value(j, i + k, 0) >= roll - 1e-12
+
+
+def test_evaluating_the_optimal_policy_gives_optimal_values():
+    """Test fixed-policy solve agrees with the optimal solve."""
+    t = analysis.optimal(20)
+    a, b = analysis.evaluate(t.moves, t.moves, 20)
+    for pos in [(0, 0, 0), (5, 12, 3), (19, 0, 0), (10, 18, 7)]:
+        assert a.value(*pos) == pytest.approx(t.value(*pos), abs=1e-9)
+        assert b.value(*pos) == pytest.approx(t.value(*pos), abs=1e-9)
+
+
+def test_strategy_pair_matches_simulation():
+    """Test exact head-to-head odds agree with a long simulation."""
+    T = 20
+    bots = (ComputerStrategy(6), SmartStrategy(4, 10))
+    exact = analysis.win_probability(Game(target=T), bots)
+    rng_state = random.getstate()
+    random.seed(5)
+    wins, n = 0, 8_000
+    for _ in range(n):
+        g = Game(target=T)
+        while not g.is_over:
+            g.play_cpu_turn(bots[g.current_index].decide)
+        wins += g.winner_id == g.players[0].player_id
+    random.setstate(rng_state)
+    assert wins / n == pytest.approx(exact, abs=0.02)
+
+
+def test_policies_are_cached_by_settings():
+    """Test the same settings reuse one compiled policy."""
+    p1 = analysis.policy_for(SmartStrategy(4, 10), 15)
+    p2 = analysis.policy_for(SmartStrategy(4, 10), 15)
+    p3 = analysis.policy_for(SmartStrategy(5, 10), 15)
+    assert p1 is p2 and p1 is not p3
+
+
+def test_win_probability_reads_the_game():
+    """Test seats, finished games and limits."""
+    g = _game(30, me=29, opp=0, points=0, current=1)
+    p = analysis.win_probability(g)
+    assert p == analysis.optimal(30).value(29, 0, 0) and p > 0.8
+    assert analysis.win_probability(_game(30, me=10, points=20)) == 1.0
+    assert analysis.best_move(_game(30, me=10, points=20)) == "hold"
+
+    g = Game(target=5)
+    g.turn.points = 6
+    g.hold()
+    assert g.is_over
+    assert analysis.win_probability(g) == 1.0      # current player won
+
+    with pytest.raises(ValueError):
+        analysis.win_probability(Game(target=analysis.MAX_TARGET + 1))
+
+
+def test_shell_hint(capsys):
+    """Test the hint command prints the odds and the move."""
+    sh = shell.PigShell(_game(30, me=10, opp=5, points=25), Scoreboard())
+    sh.do_hint("")
+    out = capsys.readouterr().out
+    assert "100.0% to win" in out and "Best move: hold." in out
+
+    sh = shell.PigShell(Game(target=1000), Scoreboard())
+    sh.do_hint("")
+    assert "No hint:" in capsys.readouterr().out
+
+
+def test_shell_hint_skips_slow_targets(capsys, monkeypatch):
+    """Test hint won't start a long solve above the interactive cap."""
+    def slow(*_):
+        raise AssertionError("should not solve")
+    monkeypatch.setattr(analysis, "optimal", slow)
+    sh = shell.PigShell(Game(target=shell.HINT_MAX_TARGET + 1), Scoreboard())
+    sh.do_hint("")
+    assert "take too long to solve" in capsys.readouterr().out
+
+
+class _Fixed:
+    """A strategy that plays a compiled policy."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def decide(self, game):
+        return self.table.move(game.current.score, game.opponent.score,
+                               game.turn_points)
+
+
+def test_best_response_to_optimal_play_gains_nothing():
+    """Test optimal play can't be exploited."""
+    br = analysis.best_response(_Fixed(analysis.optimal(20)), 20)
+    assert br.win_rate == pytest.approx(0.5, abs=1e-9)
+    assert br.exploitability == pytest.approx(0.0, abs=1e-9)
+
+
+def test_best_response_beats_every_fixed_counter():
+    """Test the counter does at least as well as optimal play and a bot."""
+    opp = ComputerStrategy(6)
+    br = analysis.best_response(opp, 20)
+    t = analysis.optimal(20)
+    a, b = analysis.evaluate(t.moves, analysis.policy_for(opp, 20), 20)
+    assert br.win_first >= a.value(0, 0, 0) - 1e-12
+    assert br.win_second >= 1 - b.value(0, 0, 0) - 1e-12
+    # playing the counter's policy back reproduces its numbers
+    a2, _ = analysis.evaluate(br.policy, analysis.policy_for(opp, 20), 20)
+    assert a2.value(0, 0, 0) == pytest.approx(br.win_first, abs=1e-9)
+    assert br.exploitability > 0
+    assert analysis.best_response(ComputerStrategy(6), 20) is br    # cached
+
+
+def test_exploitability_cli(capsys):
+    """Test the difficulty report."""
+    assert analysis.main(["--target", "15"]) == 0
+    out = capsys.readouterr().out
+    for name in ("easy", "normal", "hard"):
+        assert f"{name}:" in out
+    assert analysis.main(["--target", "1000"]) == 2
@@ -0,0 +1,113 @@
+import io
+import pytest
+
+from pig.scoreboard import Scoreboard
+import pig.batch as batch
+import pig.shell as shell
+
+
+def test_run_session_skips_comments_and_blank_lines():
+    """Test only real commands are counted and run."""
+    out, n = batch.run_session(
+        ["# opening", "", "status", "target 50", "  "], seed=1
+    )
+    assert n == 2
+    assert "Target set to 50." in out
+    assert out.count("Pig — first to") == 2  # start header + status
+
+
+def test_run_session_stops_on_quit_and_never_saves(tmp_path, monkeypatch):
+    """Test quit ends the script and batch runs leave the save file alone."""
+    p = tmp_path / "scoreboard.json"
+    monkeypatch.setattr(shell, "SAVE_PATH", p, raising=True)
+    out, n = batch.run_session(["quit", "roll"], seed=1)
+    assert n == 1
+    assert "Bye!" in out
+    assert "Rolled" not in out
+    assert not p.exists()
+
+
+def test_pvc_flags_apply_without_prompts(monkeypatch):
+    """Test mode/difficulty come from arguments, input() is never called."""
+    def boom(_):
+        raise AssertionError("batch mode must not prompt")
+    monkeypatch.setattr("builtins.input", boom)
+    sb = Scoreboard()
+    out, _ = batch.run_session(["status"], mode="pvc", difficulty="hard",
+                               sb=sb, seed=2)
+    assert "Computer" in out
+
+
+def test_same_seed_same_output():
+    """Test seeded runs are repeatable."""
+    script = ["roll", "roll", "roll", "hold", "roll"]
+    a = batch.run_batch([script, script], mode="pvc", seed=7)
+    b = batch.run_batch([script, script], mode="pvc", seed=7)
+    assert a.output == b.output
+    assert a.sessions == 2 and a.commands == 10
+    assert a.rate > 0
+
+
+def test_seeded_expert_is_untimed_and_leaves_global_rng(monkeypatch):
+    """Test a seed gives private dice and full-depth search bots."""
+    import random
+    timed = []
+    real = shell._build_brain
+    monkeypatch.setattr(shell, "_build_brain",
+                        lambda d, t=100, **kw:
+                        timed.append(kw["timed"]) or real(d, t, **kw))
+    random.seed(3)
+    expected = random.random()
+    random.seed(3)
+    a = batch.run_session(["roll", "hold"], mode="pvc",
+                          difficulty="expert", seed=5)
+    assert random.random() == expected      # the global RNG is untouched
+    assert a == batch.run_session(["roll", "hold"], mode="pvc",
+                                  difficulty="expert", seed=5)
+    batch.run_session(["status"], mode="pvc", difficulty="expert")
+    assert timed == [False, False, True]
+
+
+def test_main_reads_files_and_writes_once(tmp_path):
+    """Test the CLI reads script files, writes output and stats."""
+    f = tmp_path / "s1.txt"
+    f.write_text("roll\nstatus\n", encoding="utf-8")
+    out, err = io.StringIO(), io.StringIO()
+    code = batch.main([str(f), str(f), "--seed", "3", "--stats"],
+                      stdout=out, stderr=err)
+    assert code == 0
+    assert out.getvalue().count("Pig — first to") == 4
+    assert "2 sessions, 4 commands" in err.getvalue()
+
+
+def test_main_reads_stdin_and_reports_missing_file(tmp_path):
+    """Test stdin is used with no files, and unreadable files fail."""
+    out = io.StringIO()
+    code = batch.main(["--target", "20", "--quiet"],
+                      stdin=io.StringIO("status\n"), stdout=out)
+    assert code == 0 and out.getvalue() == ""
+
+    err = io.StringIO()
+    code = batch.main([str(tmp_path / "nope.txt")], stderr=err)
+    assert code == 2
+    assert "can't read" in err.getvalue()
+
+
+def test_cheat_word_is_off_in_batch(monkeypatch):
+    """Test the cheat word can't open its (prompting) menu in a script."""
+    def boom(_):
+        raise AssertionError("batch mode must not prompt")
+    monkeypatch.setattr("builtins.input", boom)
+    out, n = batch.run_session(["pepper", "status"], seed=1)
+    assert n == 2
+    assert "Unknown command: 'pepper'" in out
+    assert "cheats unlocked" not in out
+
+
+def test_main_rejects_bad_target():
+    """Test --target must be a positive whole number."""
+    for bad in ("0", "-5", "ten"):
+        with pytest.raises(SystemExit) as exc:
+            batch.main(["--target", bad], stdin=io.StringIO(""),
+                       stdout=io.StringIO(), stderr=io.StringIO())
+        assert exc.value.code == 2
@@ -4,7 +4,7 @@
 
 import pytest
 from pig.game import Game
-from pig.cheat import Cheat, cheats_enabled
+from pig.cheat import Cheat, RiggedDice, cheats_enabled
 
 
 # a simple dice we can control (no randomness)
@@ -218,4 +218,29 @@ def test_active_on_init_and_queue_beats_bias(monkeypatch):
     assert g.dice.roll() == 4
     assert g.dice.roll() == 5
     # once queue empty, bias takes over
-    assert g.dice.roll() == 1
\ No newline at end of file
+    assert g.dice.roll() == 1
+
+# 11) idle cheats hand out the bare dice roll; knobs switch the wrapper in
+def test_rigged_dice_idle_is_bare_roll(monkeypatch):
+    monkeypatch.delenv("PIG_DEV", raising=False)
+    g = Game()
+    g.dice = g.turn.dice = TweakDice(v=3)
+    inner = g.dice
+    c = Cheat(g)
+    c.arm()
+    assert isinstance(g.dice, RiggedDice) and g.turn.dice is g.dice
+    assert g.dice.roll == inner.roll          # no wrapper while idle
+
+    c.force_next_rolls(5, 6)
+    assert g.dice.roll != inner.roll
+    assert g.roll() == 5                      # goes through the turn too
+    assert g.dice.roll() == 6
+    assert g.dice.roll == inner.roll          # queue drained -> bare again
+
+    c.no_bust_on_ones(True)
+    assert g.dice.roll != inner.roll
+    c.clear()
+    assert g.dice.roll == inner.roll
+
+    c.uninstall()
+    assert g.dice is inner and g.turn.dice is inner
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from pig import checkpoint
+from pig.ai import ComputerStrategy, SmartStrategy
+from pig.checkpoint import ShardStore
+
+
+def test_keys_follow_the_settings():
+    """Test the hash changes with the config and the seeds only."""
+    a, b = ComputerStrategy(6), SmartStrategy(4, 10)
+    k = checkpoint.shard_key(a, b, 0, 10, 20)
+    assert k == checkpoint.shard_key(ComputerStrategy(6), b, 0, 10, 20)
+    assert k != checkpoint.shard_key(ComputerStrategy(7), b, 0, 10, 20)
+    assert k != checkpoint.shard_key(a, b, 10, 20, 20)
+    assert k != checkpoint.shard_key(b, a, 0, 10, 20)
+    assert checkpoint.shard_ranges(25, 10, seed=5) == [(5, 15), (15, 25), (25, 30)]
+
+
+def test_killed_run_resumes_from_its_checkpoint(tmp_path, monkeypatch):
+    """Test a crash keeps the saved shards and the resumed total is exact."""
+    path = tmp_path / "run.json"
+    b = SmartStrategy(4, 10)
+    whole, _ = checkpoint.run_match(ComputerStrategy(6), b, 40, shard=5, target=20)
+
+    real, calls = checkpoint.play_block, []
+
+    def dies_on_block_23(*args):
+        calls.append(1)
+        if len(calls) > 23:
+            raise KeyboardInterrupt
+        return real(*args)
+
+    monkeypatch.setattr(checkpoint, "play_block", dies_on_block_23)
+    with pytest.raises(KeyboardInterrupt):
+        checkpoint.run_match(ComputerStrategy(6), b, 40,
+                             store=ShardStore(path, every=2), shard=5, target=20)
+    monkeypatch.undo()
+    saved = len(json.loads(path.read_text())["shards"])
+    assert saved == 4                   # shard 5 was cut short
+    assert not (tmp_path / "run.json.tmp").exists()
+
+    resumed, played = checkpoint.run_match(ComputerStrategy(6), b, 40,
+                                           store=ShardStore(path), shard=5,
+                                           target=20)
+    assert played == 40 - 5 * saved
+    assert resumed == whole
+
+
+def test_unchanged_rerun_plays_nothing(tmp_path):
+    """Test the cache serves a rerun and only changed bots are replayed."""
+    path = tmp_path / "rr.json"
+    bots = {"a": ComputerStrategy(4), "b": ComputerStrategy(8),
+            "c": SmartStrategy(4, 10)}
+    first = checkpoint.round_robin(bots, 20, store=ShardStore(path), shard=10,
+                                   target=20)
+    store = ShardStore(path)
+    assert len(store) == 6
+    again = checkpoint.round_robin(bots, 20, store=store, shard=10, target=20)
+    assert again == first and len(store) == 6
+
+    bots["c"] = SmartStrategy(5, 10)
+    checkpoint.round_robin(bots, 20, store=store, shard=10, target=20)
+    assert len(store) == 6 + 4          # a-c and b-c replayed, a-b reused
+
+
+def test_broken_or_old_store_starts_empty(tmp_path):
+    """Test unreadable files and other formats are ignored."""
+    path = tmp_path / "s.json"
+    path.write_text("{nope")
+    assert len(ShardStore(path)) == 0
+    path.write_text(json.dumps({"format": -1, "shards": {"x": {}}}))
+    assert len(ShardStore(path)) == 0
+    for other in ([], "text", 3, {"format": 1, "shards": []}):
+        path.write_text(json.dumps(other))
+        assert len(ShardStore(path)) == 0
+
+
+def test_checkpoint_cli(tmp_path, capsys):
+    """Test the command line reports new and reused shards."""
+    argv = ["computer:4", "computer:8", "--blocks", "20", "--shard", "10",
+            "--target", "20", "--store", str(tmp_path / "t.json")]
+    assert checkpoint.main(argv) == 0
+    assert "2 new shards, 0 reused" in capsys.readouterr().out
+    assert checkpoint.main(argv) == 0
+    assert "0 new shards, 2 reused" in capsys.readouterr().out
+    # a different match in the same store: the old shards are there,
+    # but none of them is used by this run
+    other = ["computer:4", "computer:12"] + argv[2:]
+    assert checkpoint.main(other) == 0
+    assert "2 new shards, 0 reused" in capsys.readouterr().out
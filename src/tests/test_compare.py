@@ -0,0 +1,51 @@
+import random
+
+from pig import compare, matchup
+from pig.ai import ComputerStrategy, SmartStrategy
+from pig.dice import AntitheticDice, Dice
+
+
+def test_antithetic_dice_mirror_the_plain_ones():
+    """Test the same seed gives r and sides + 1 - r."""
+    plain = Dice(6, random.Random(3))
+    mirror = AntitheticDice(6, random.Random(3))
+    for _ in range(50):
+        assert plain.roll() + mirror.roll() == 7
+
+
+def test_blocks_replay_from_their_seed():
+    """Test a block gives the same result every time."""
+    a, b = ComputerStrategy(10), SmartStrategy(6, 15)
+    first = [compare.play_block(a, b, s, target=30) for s in range(20)]
+    again = [compare.play_block(a, b, s, target=30) for s in range(20)]
+    assert first == again
+    assert all(g == 4 for _, g in first)
+
+
+def test_mirror_match_has_no_luck_left():
+    """Test a bot against itself scores exactly one half in every block."""
+    a = ComputerStrategy(12)
+    r = compare.compare(a, ComputerStrategy(12), 50, target=40)
+    assert r.rate == 0.5
+    assert r.half_width == 0.0
+
+    plain = compare.compare(a, ComputerStrategy(12), 50, target=40,
+                            paired=False)
+    assert plain.half_width > 0.1
+
+
+def test_estimate_covers_the_exact_answer():
+    """Test the interval agrees with the exact matchup."""
+    a, b = ComputerStrategy(6), SmartStrategy(4, 10)
+    exact = matchup.head_to_head(a, b, target=20).win_rate
+    r = compare.compare(a, b, 1500, seed=9, target=20)
+    assert r.games == 6000
+    assert abs(r.rate - exact) < 2 * r.half_width
+
+
+def test_compare_cli(capsys):
+    """Test the command line prints the interval and rejects bad bots."""
+    assert compare.main(["computer:10", "smart:6,15", "--blocks", "20",
+                         "--target", "20"]) == 0
+    assert "95% CI" in capsys.readouterr().out
+    assert compare.main(["expert", "easy"]) == 2
@@ -99,4 +99,81 @@ def test_custom_sides_and_error():
         Dice(1)
         assert False, "Expected ValueError for sides < 2"
     except ValueError:
-        assert True
\ No newline at end of file
+        assert True
+
+
+def test_scripted_dice_replays_file(tmp_path):
+    """Test a dice script file is replayed byte by byte."""
+    from pig.dice import ScriptedDice
+    path = tmp_path / "rolls.bin"
+    path.write_bytes(bytes([3, 1, 6]))
+    with ScriptedDice.open(path) as d:
+        assert len(d) == 3
+        assert [d.roll(), d.roll(), d.roll()] == [3, 1, 6]
+        with pytest.raises(EOFError):
+            d.roll()
+        d.rewind()
+        assert d.roll() == 3
+
+
+def test_scripted_dice_loop_and_validation(tmp_path):
+    """Test looping scripts and rejecting bad or empty ones."""
+    from pig.dice import ScriptedDice
+    d = ScriptedDice(bytes([2, 5]), loop=True)
+    assert [d.roll() for _ in range(5)] == [2, 5, 2, 5, 2]
+    with pytest.raises(ValueError):
+        ScriptedDice(bytes([1, 7]))
+    with pytest.raises(ValueError):
+        ScriptedDice(bytes([0]))
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        ScriptedDice.open(empty)
+
+
+def test_scripted_dice_open_closes_mapping_on_bad_file(tmp_path, monkeypatch):
+    """Test a rejected script file doesn't leave its mapping open."""
+    import mmap
+    from pig.dice import ScriptedDice
+    opened = []
+
+    class Tracked(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            opened.append(self)
+
+    monkeypatch.setattr(mmap, "mmap", Tracked)
+    path = tmp_path / "bad.bin"
+    path.write_bytes(bytes([3, 9, 2]))
+    with pytest.raises(ValueError, match="outside"):
+        ScriptedDice.open(path)
+    assert len(opened) == 1 and opened[0].closed
+
+
+def test_write_script_is_seeded_and_drives_a_game(tmp_path):
+    """Test the same seed gives the same script, and a Game can use it."""
+    from pig.dice import ScriptedDice, write_script
+    from pig.game import Game
+    a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+    write_script(a, 1000, seed=7)
+    write_script(b, 1000, seed=7)
+    assert a.read_bytes() == b.read_bytes()
+    assert set(a.read_bytes()) <= set(range(1, 7))
+
+    dice = ScriptedDice.open(a)
+    g = Game(dice=dice)
+    first = a.read_bytes()[0]
+    assert g.roll() == first
+    dice.close()
+
+
+def test_default_game_copies_and_pickles():
+    """Test a Game with default dice can be deep-copied and pickled."""
+    import copy
+    import pickle
+    from pig.game import Game
+    g = Game()
+    assert copy.deepcopy(g).target == g.target
+    back = pickle.loads(pickle.dumps(g))
+    assert back.dice.rng is None and 1 <= back.dice.roll() <= 6
+    seeded = pickle.loads(pickle.dumps(Dice(6, random.Random(4))))
+    assert seeded.roll() == Dice(6, random.Random(4)).roll()
@@ -0,0 +1,165 @@
+import json
+import pytest
+
+from pig.game import Game
+from pig.ai import SmartStrategy, ComputerStrategy
+from pig.events import EventLog, record, replay, HOLD, SWITCH, WIN
+
+
+class SeqDice:
+    def __init__(self, seq):
+        self.seq = list(seq)
+    def roll(self):
+        return self.seq.pop(0)
+
+
+def _seq_game(seq, target=100):
+    g = Game(target=target)
+    g.dice = SeqDice(seq)
+    g.turn.dice = g.dice
+    return g
+
+
+def test_disabled_by_default():
+    """Test a plain Game records nothing."""
+    g = Game()
+    assert g.events is None
+    g.roll()
+    assert g.events is None
+
+
+def test_roll_hold_bust_and_win_are_logged():
+    """Test the event stream for a short game."""
+    g = _seq_game([4, 1, 6, 6], target=10)
+    log = record(g)
+    g.roll()          # P1 +4
+    g.roll()          # P1 busts
+    g.roll()          # P2 +6
+    g.roll()          # P2 +6
+    g.hold()          # P2 wins with 12
+    assert log.describe() == [
+        "roll 4", "roll 1", "switch", "roll 6", "roll 6", "hold", "win"
+    ]
+    assert list(log.codes) == [4, 1, SWITCH, 6, 6, HOLD, WIN]
+
+
+def test_replay_rebuilds_state_without_dice():
+    """Test replay matches the live game at every step."""
+    g = _seq_game([3, 5, 2, 1, 6, 4, 4], target=50)
+    g.players[0].change_name("Ann")
+    log = record(g, seed=99)
+    snaps = [g.snapshot()]
+    for act in ["roll", "roll", "hold", "roll", "roll", "target", "roll",
+                "roll", "hold"]:
+        if act == "target":
+            g.set_target(60)
+        else:
+            getattr(g, act)()
+        snaps.append(g.snapshot())
+
+    assert replay(log).snapshot() == g.snapshot()
+    # time travel: after 3 events (roll, roll, hold) P1 has 8 banked
+    early = replay(log, upto=3)
+    assert early.players[0].score == 8
+    assert early.current_index == 1  # hold already passed the turn
+    # replayed game can keep playing with real dice
+    assert 1 <= early.dice.roll() <= 6
+
+
+def test_cpu_turns_are_logged_and_replayable():
+    """Test a full bot-vs-bot game replays to the same final state."""
+    g = Game(target=60)
+    log = record(g, seed=1234)
+    bots = [ComputerStrategy(18), SmartStrategy()]
+    while not g.is_over:
+        g.play_cpu_turn(bots[g.current_index].decide)
+    r = replay(log)
+    assert r.is_over
+    assert r.snapshot() == g.snapshot()
+    assert log.seed == 1234
+
+
+def test_renames_are_logged_and_replayed():
+    """Test replay gives players the names they were renamed to."""
+    g = _seq_game([5, 3])
+    log = record(g)
+    g.roll()
+    g.rename(2, "  Bea ")
+    g.hold()
+    g.rename(1, "Al")
+    assert log.describe() == ["roll 5", "rename 2 Bea", "hold", "switch",
+                              "rename 1 Al"]
+    data = json.loads(json.dumps(log.to_dict()))
+    again = replay(EventLog.from_dict(data))
+    assert again.snapshot() == g.snapshot()
+    assert [p.name for p in again.players] == ["Al", "Bea"]
+    assert replay(log, upto=2).players[1].name == "Bea"
+
+
+def test_seeded_record_leaves_global_rng_alone():
+    """Test a seed gives the game's dice their own stream."""
+    import random
+    random.seed(5)
+    expected = random.random()
+    rolls = []
+    for _ in range(2):
+        random.seed(5)
+        g = Game(target=1000)
+        record(g, seed=42)
+        rolls.append([g.roll() for _ in range(10)])
+        assert random.random() == expected
+    assert rolls[0] == rolls[1]
+
+
+def test_reset_and_round_trip_json():
+    """Test reset events and to_dict/from_dict."""
+    g = _seq_game([5, 5])
+    log = record(g)
+    g.roll()
+    g.reset(keep_names=False)
+    g.roll()
+    data = json.loads(json.dumps(log.to_dict()))
+    log2 = EventLog.from_dict(data)
+    assert len(log2) == len(log) == 3
+    assert log2.describe() == ["roll 5", "reset", "roll 5"]
+    assert replay(log2).turn_points == 5
+
+
+def test_replay_rejects_broken_log():
+    """Test a log that contradicts the rules is rejected."""
+    log = EventLog(target=100)
+    log.roll(1)
+    log.win()
+    with pytest.raises(ValueError):
+        replay(log)
+
+
+def test_replay_after_undo_and_redo_matches_live_game():
+    """Test undo/redo are logged so a replay ends where the game is."""
+    g = _seq_game([3, 5, 1, 6, 2, 4, 4, 6])
+    g.enable_undo(10)
+    log = record(g)
+    g.roll()                 # 3
+    g.roll()                 # 5
+    g.hold()                 # P1 banks 8
+    assert g.undo()          # back to 8 turn points, P1 to play
+    g.roll()                 # 1 -> bust, P2's turn
+    assert g.undo() and g.redo()
+    g.roll()                 # P2 6
+    assert g.rewind(2) == 2  # back past the bust
+    g.roll()                 # 2
+    g.hold()
+    assert "undo" in log.describe() and "redo" in log.describe()
+    assert replay(log).snapshot() == g.snapshot()
+    # roll, roll, hold, switch, undo: the hold is taken back
+    assert replay(log, upto=4).players[0].score == 8
+    partial = replay(log, upto=5)
+    assert partial.players[0].score == 0 and partial.turn_points == 8
+
+
+def test_replay_rejects_undo_with_nothing_to_undo():
+    """Test a log that undoes past the start is refused."""
+    from pig.events import UNDO
+    log = EventLog.from_dict({"events": [4, UNDO, UNDO]})
+    with pytest.raises(ValueError, match="nothing to undo"):
+        replay(log)
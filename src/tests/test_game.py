@@ -234,3 +234,85 @@ def test_play_cpu_turn_can_win_and_returns_win_result():
     assert result["ended"] == "win"
     assert g.is_over
     assert g.get_winner() is g.players[0]
+
+
+# ---------- undo / redo ----------
+
+def test_state_and_restore_round_trip():
+    g = Game()
+    g.dice = SeqDice([4, 5])
+    g.turn.dice = g.dice
+    start = g.state()
+    assert start == (0, 0, 0, 0, -1)
+    g.roll(); g.roll()
+    assert g.state() == (0, 9, 0, 0, -1)
+    g.restore(start)
+    assert g.turn_points == 0 and g.turn.points == 0
+
+
+def test_undo_off_by_default():
+    g = Game()
+    g.dice = ConstDice(3)
+    g.turn.dice = g.dice
+    g.roll()
+    assert g.undo() is False
+    assert g.history() == []
+
+
+def test_undo_redo_roll_and_hold():
+    g = Game(undo_depth=10)
+    g.dice = SeqDice([6, 4, 1])
+    g.turn.dice = g.dice
+    g.roll(); g.roll(); g.hold()          # P1 banks 10
+    assert g.players[0].score == 10 and g.current_index == 1
+
+    assert g.undo()                        # back before hold
+    assert g.players[0].score == 0 and g.turn_points == 10
+    assert g.current_index == 0
+    assert g.undo()                        # back before 2nd roll
+    assert g.turn_points == 6
+    assert g.redo() and g.redo()
+    assert g.players[0].score == 10 and g.current_index == 1
+    assert g.redo() is False
+
+    # a new action clears redo
+    g.undo()
+    g.roll()                               # P1 busts on the 1
+    assert not g.can_redo()
+
+
+def test_undo_restores_winner_and_ring_is_bounded():
+    g = Game(target=6)
+    g.enable_undo(3)
+    g.dice = ConstDice(6)
+    g.turn.dice = g.dice
+    g.roll(); g.hold()
+    assert g.is_over
+    assert g.undo()
+    assert not g.is_over and g.turn_points == 6
+    g.redo()
+    assert g.get_winner() is g.players[0]
+
+    g.reset()
+    for _ in range(5):
+        g.roll()
+    assert len(g.history()) == 3           # only the last 3 steps kept
+    assert g.rewind(10) == 3
+    assert g.turn_points == 12
+
+
+def test_failed_roll_leaves_no_undo_step():
+    g = Game(undo_depth=5)
+    g.dice = SeqDice([5])
+    g.turn.dice = g.dice
+    g.roll()
+    g.undo()                               # something to redo
+    with pytest.raises(IndexError):        # the dice ran out
+        g.roll()
+    assert g.history() == [] and g.turn_points == 0
+    assert g.redo() and g.turn_points == 5
+
+
+def test_enable_undo_rejects_bad_depth():
+    with pytest.raises(ValueError):
+        Game().enable_undo(0)
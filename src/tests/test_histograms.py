@@ -0,0 +1,167 @@
+import json
+import random
+
+import pytest
+
+from pig import histograms
+from pig.ai import ComputerStrategy, SmartStrategy
+from pig.dice import Dice, ScriptedDice
+from pig.game import Game
+from pig.histograms import GameStats, Histogram
+
+
+BOTS = (ComputerStrategy(6), SmartStrategy(4, 10))
+
+
+def test_histogram_clips_but_keeps_the_exact_mean():
+    """Test big values land in the last bin and the sum stays exact."""
+    h = Histogram(4)
+    for v in (0, 1, 1, 3, 10):
+        h.add(v)
+    assert list(h.counts) == [1, 2, 0, 2]
+    assert h.total == 5 and h.mean == 3.0
+    assert h.quantile(0.5) == 1 and h.quantile(1.0) == 3
+    with pytest.raises(ValueError):
+        h.merge(Histogram(5))
+
+
+def test_turns_are_counted_from_the_summaries():
+    """Test a scripted game gives the exact counts."""
+    # P1: roll 4, roll 6, hold (10 -> wins at target 10)
+    stats = GameStats()
+    g = Game(target=10, dice=ScriptedDice(bytes([4, 6])))
+    stats.play(g, (ComputerStrategy(10), ComputerStrategy(10)))
+    assert list(stats.rolls_per_turn.counts[:3]) == [0, 0, 1]
+    assert stats.turns_per_game.total == 1 and stats.turns_per_game.sum == 1
+    assert stats.margin.sum == 10 and stats.busts == 0
+
+    g = Game(target=10, dice=ScriptedDice(bytes([1, 1, 5, 5])))
+    stats.play(g, (ComputerStrategy(10), ComputerStrategy(10)))
+    assert stats.busts == 2 and stats.busts_per_game.counts[2] == 1
+    assert stats.bust_rate == pytest.approx(2 / 4)
+
+
+def test_merge_and_json_round_trip(tmp_path):
+    """Test two sinks merge into one and survive a save/load."""
+    left, right = GameStats(), GameStats()
+    dice = Dice(6, random.Random(1))
+    for n in range(200):
+        g = Game(target=20, dice=dice)
+        (left if n % 2 else right).play(g, BOTS)
+    rolls = left.rolls_per_turn.total + right.rolls_per_turn.total
+    left.merge(right)
+    assert left.rolls_per_turn.total == rolls
+
+    path = tmp_path / "stats.json"
+    left.save(path)
+    back = GameStats.load(path)
+    assert back.to_dict() == left.to_dict()
+    assert back.turns_per_game.total == 200
+    assert json.loads(path.read_text())["busts"] == left.busts
+
+
+def test_hooked_play_cpu_turn_feeds_the_sink():
+    """Test enable() counts games played by any loop."""
+    stats = GameStats()
+    histograms.enable(stats)
+    try:
+        assert histograms.is_enabled()
+        for _ in range(20):
+            g = Game(target=20)
+            while not g.is_over:
+                g.play_cpu_turn(BOTS[g.current_index].decide)
+    finally:
+        histograms.disable()
+    assert not histograms.is_enabled()
+    assert stats.turns_per_game.total == 20
+    assert stats.rolls_per_turn.total == stats.turns_per_game.sum
+    assert stats.margin.total == 20 and not stats._open
+
+
+def test_histograms_cli(tmp_path, capsys):
+    """Test the summary and the JSON export."""
+    out = tmp_path / "h.json"
+    assert histograms.main(["computer:6", "smart:4,10", "--games", "50",
+                            "--target", "20", "--json", str(out)]) == 0
+    text = capsys.readouterr().out
+    assert "rolls_per_turn" in text and "bust rate" in text
+    assert GameStats.load(out).turns_per_game.total == 50
+    assert histograms.main(["expert", "easy"]) == 2
+
+
+def test_hook_counts_human_turns_and_forgets_abandoned_games():
+    """Test human wins finish games and dropped games leave nothing."""
+    import gc
+    stats = GameStats()
+    rng = random.Random(7)
+    real_turns = games = 0
+    histograms.enable(stats)
+    try:
+        for n in range(300):
+            g = Game(target=20, dice=Dice(6, rng))
+            turns = 0
+            while not g.is_over:
+                if g.current_index == 0:         # the "human"
+                    before = g.current_index
+                    while g.current_index == before and g.turn.points < 8:
+                        g.roll()
+                    if g.current_index == before:
+                        g.hold()
+                else:
+                    g.play_cpu_turn(BOTS[1].decide)
+                turns += 1
+                if n % 3 == 0 and turns == 3:
+                    break                          # abandoned mid-game
+            if g.is_over:
+                games += 1
+                real_turns += turns
+            del g
+    finally:
+        histograms.disable()
+    gc.collect()
+    assert stats.turns_per_game.total == games
+    assert stats.turns_per_game.sum == real_turns
+    assert not stats._open
+
+
+def test_reset_drops_the_unfinished_game():
+    """Test a reset game starts its tally again."""
+    stats = GameStats()
+    histograms.enable(stats)
+    try:
+        g = Game(target=10, dice=ScriptedDice(bytes([3, 1, 6, 6]), loop=True))
+        g.roll()
+        g.roll()                    # bust: one turn
+        g.reset()
+        g.roll()
+        g.roll()
+        g.hold()                    # 12 >= 10 in one turn
+    finally:
+        histograms.disable()
+    assert stats.turns_per_game.total == 1
+    assert stats.turns_per_game.sum == 1
+    assert stats.busts_per_game.sum == 0
+
+
+def test_only_one_sink_can_be_hooked():
+    """Test a second sink is refused instead of ignored."""
+    first = GameStats()
+    histograms.enable(first)
+    try:
+        histograms.enable(first)              # same one: fine
+        with pytest.raises(RuntimeError):
+            histograms.enable(GameStats())
+    finally:
+        histograms.disable()
+    histograms.enable(GameStats())
+    histograms.disable()
+
+
+def test_sinks_pickle_for_worker_processes():
+    """Test a sink with a game in progress still pickles its counts."""
+    import pickle
+    stats = GameStats()
+    g = Game(target=20)
+    stats.add_turn(g.play_cpu_turn(BOTS[0].decide), g)
+    back = pickle.loads(pickle.dumps(stats))
+    assert back.to_dict() == stats.to_dict() and not back._open
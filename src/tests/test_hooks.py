@@ -0,0 +1,52 @@
+from pig import hooks
+
+
+class Thing:
+    def work(self, x):
+        return x + 1
+
+
+@hooks.hookable
+def helper(x):
+    """Double x."""
+    return x * 2
+
+
+def _tagger(log, tag):
+    def make(fn):
+        def wrapper(*args):
+            log.append(tag)
+            return fn(*args)
+        return wrapper
+    return make
+
+
+def test_layers_come_off_in_any_order():
+    """Test removing the first owner keeps the second one's wrapper."""
+    log = []
+    plain = Thing.work
+    hooks.wrap(Thing, "work", "a", _tagger(log, "a"))
+    hooks.wrap(Thing, "work", "b", _tagger(log, "b"))
+    assert Thing().work(1) == 2 and log == ["b", "a"]
+    hooks.unwrap("a")
+    log.clear()
+    assert Thing().work(1) == 2 and log == ["b"]
+    assert hooks.is_wrapped("b") and not hooks.is_wrapped("a")
+    assert hooks.original(Thing, "work") is plain
+    hooks.unwrap("b")
+    assert Thing.work is plain
+
+
+def test_hookable_functions_are_wrapped_in_place():
+    """Test a function imported by name sees the layers."""
+    log = []
+    held = helper                      # like "from module import helper"
+    hooks.wrap(__import__(__name__), "helper", "t", _tagger(log, "t"))
+    try:
+        assert held(3) == 6 and log == ["t"]
+        assert helper is held
+    finally:
+        hooks.unwrap("t")
+    log.clear()
+    assert held(3) == 6 and log == []
+    assert helper.__doc__ == "Double x."
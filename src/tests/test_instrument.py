@@ -0,0 +1,123 @@
+import pstats
+import pytest
+
+from pig import instrument
+from pig.ai import SmartStrategy
+from pig.dice import Dice
+from pig.game import Game
+from pig.turn import Turn
+from pig.scoreboard import Scoreboard
+import pig.shell as shell
+
+
+@pytest.fixture
+def hooks():
+    """Turn counters on for one test and always turn them off again."""
+    instrument.enable()
+    instrument.reset()
+    yield instrument
+    instrument.disable()
+    instrument.reset()
+
+
+def test_off_means_plain_methods(monkeypatch):
+    """Test nothing is wrapped unless asked for."""
+    monkeypatch.delenv("PIG_PROF", raising=False)
+    instrument.enable_from_env()
+    assert not instrument.is_enabled()
+    assert not hasattr(Turn.roll, "__wrapped__")
+    assert "off" in instrument.report()
+
+
+def test_prof_mode_env(monkeypatch):
+    """Test PIG_PROF values."""
+    for val, mode in [("0", ""), ("1", "counters"), ("YES", "counters"),
+                      ("profile", "profile")]:
+        monkeypatch.setenv("PIG_PROF", val)
+        assert instrument.prof_mode() == mode
+
+
+def test_counts_hot_paths(hooks):
+    """Test rolls, holds, decisions and turn creation are counted."""
+    g = Game(target=30)
+    bot = SmartStrategy()
+    while not g.is_over:
+        g.play_cpu_turn(bot.decide)
+    stats = hooks.snapshot()
+    assert stats["game.roll"]["calls"] == stats["dice.roll"]["calls"] > 0
+    assert stats["game.hold"]["calls"] >= 1
+    assert stats["decide.SmartStrategy"]["calls"] >= stats["game.roll"]["calls"]
+    assert stats["turn.create"]["calls"] >= 1
+    assert stats["game.roll"]["total_ms"] >= 0
+
+
+def test_rolls_counted_whatever_the_dice(hooks):
+    """Test rigged, scripted and antithetic dice rolls are counted too."""
+    import random
+    from pig.cheat import RiggedDice
+    from pig.dice import AntitheticDice, ScriptedDice
+    for dice in (RiggedDice(Dice()), ScriptedDice(bytes([2, 3, 4])),
+                 AntitheticDice(6, random.Random(1))):
+        g = Game(dice=dice)
+        g.roll()
+        g.roll()
+    assert hooks.snapshot()["dice.roll"]["calls"] == 6
+    assert "game.roll" in hooks.report()
+
+    hooks.reset()
+    assert hooks.snapshot() == {}
+    assert "nothing counted" in hooks.report()
+
+
+def test_disable_restores_originals(hooks):
+    """Test disable() puts the real methods back."""
+    assert Turn.roll.__wrapped__
+    hooks.disable()
+    assert not hasattr(Turn.roll, "__wrapped__")
+    save = shell.save_scoreboard
+    assert save.__hook_slot__[0] is save.__wrapped__      # plain again
+
+
+def test_scoreboard_io_counted(hooks, tmp_path, monkeypatch):
+    """Test load/save through the shell module are timed."""
+    monkeypatch.setattr(shell, "SAVE_PATH", tmp_path / "sb.json")
+    shell.save_scoreboard(Scoreboard())
+    shell.load_scoreboard()
+    stats = hooks.snapshot()
+    assert stats["scoreboard.save"]["calls"] == 1
+    assert stats["scoreboard.load"]["calls"] == 1
+
+
+def test_scoreboard_io_counted_when_imported_by_name(hooks, tmp_path,
+                                                     monkeypatch):
+    """Test callers that imported the functions (server, main) are timed."""
+    from pig.shell import load_scoreboard, save_scoreboard
+    monkeypatch.setattr(shell, "SAVE_PATH", tmp_path / "sb.json")
+    save_scoreboard(Scoreboard())
+    load_scoreboard()
+    stats = hooks.snapshot()
+    assert stats["scoreboard.save"]["calls"] == 1
+    assert stats["scoreboard.load"]["calls"] == 1
+
+
+def test_shell_stats_command_and_profile_dump(tmp_path, capsys):
+    """Test the stats command, including writing a pstats file."""
+    sh = shell.PigShell(Game(), Scoreboard())
+    try:
+        sh.do_stats("save")
+        assert "No profile yet" in capsys.readouterr().out
+        sh.do_stats("profile")
+        sh.do_roll("")
+        sh.do_stats("")
+        out = capsys.readouterr().out
+        assert "cProfile running" in out and "game.roll" in out
+        path = tmp_path / "run.pstats"
+        sh.do_stats(f"save {path}")
+        assert "Profile written" in capsys.readouterr().out
+        assert pstats.Stats(str(path)).total_calls > 0
+        sh.do_stats("reset")
+        sh.do_stats("bogus")
+        assert "Usage: stats" in capsys.readouterr().out
+    finally:
+        sh.do_stats("off")
+    assert not instrument.is_enabled()
@@ -0,0 +1,115 @@
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+_PATH = Path(__file__).resolve().parents[2] / "tools" / "kroki_render.py"
+_spec = importlib.util.spec_from_file_location("kroki_render", _PATH)
+kroki = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(kroki)
+
+
+class FakeKroki(BaseHTTPRequestHandler):
+    """Stand-in for Kroki: answers 'PNG:<type>:<source>' over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    hits: list = []
+    peers: set = set()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        FakeKroki.hits.append(self.path)
+        FakeKroki.peers.add(self.client_address)
+        if b"broken" in body:
+            data, code = b"syntax error", 400
+        else:
+            data, code = b"PNG:" + self.path.encode() + b":" + body, 200
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FakeKroki.hits, FakeKroki.peers = [], set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeKroki)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _sources(tmp_path, n):
+    jobs = []
+    for i in range(n):
+        ext = ".dot" if i % 2 else ".puml"
+        src = tmp_path / f"d{i}{ext}"
+        src.write_text(f"diagram {i}", encoding="utf-8")
+        jobs.append((src, tmp_path / "out" / f"d{i}.png", kroki.guess_type(src)))
+    return jobs
+
+
+def test_batch_renders_then_skips_unchanged(tmp_path, server):
+    """Test a second run only re-renders the source that changed."""
+    jobs = _sources(tmp_path, 6)
+    cache = tmp_path / "cache.json"
+
+    first = kroki.render_many(jobs, server, workers=3, cache=cache)
+    assert set(first.values()) == {"rendered"}
+    assert len(FakeKroki.hits) == 6
+    assert (tmp_path / "out" / "d1.png").read_bytes() == b"PNG:/graphviz/png:diagram 1"
+    assert (tmp_path / "out" / "d0.png").read_bytes() == b"PNG:/plantuml/png:diagram 0"
+    assert len(json.loads(cache.read_text())) == 6
+
+    jobs[2][0].write_text("diagram 2, edited", encoding="utf-8")
+    second = kroki.render_many(jobs, server, workers=3, cache=cache)
+    assert [s for s in second.values() if s == "rendered"] == ["rendered"]
+    assert second[jobs[2][1]] == "rendered"
+    assert len(FakeKroki.hits) == 7
+
+
+def test_batch_reuses_connections(tmp_path, server):
+    """Test each worker keeps one connection for many requests."""
+    jobs = _sources(tmp_path, 12)
+    kroki.render_many(jobs, server, workers=2)
+    assert len(FakeKroki.hits) == 12
+    assert len(FakeKroki.peers) <= 2
+
+
+def test_batch_failures_are_not_cached(tmp_path, server):
+    """Test a failed render is reported and retried next time."""
+    src = tmp_path / "bad.puml"
+    src.write_text("broken", encoding="utf-8")
+    out = tmp_path / "bad.png"
+    cache = tmp_path / "cache.json"
+    res = kroki.render_many([(src, out, "plantuml")], server, cache=cache)
+    assert res[out].startswith("http 400")
+    assert not out.exists()
+    kroki.render_many([(src, out, "plantuml")], server, cache=cache)
+    assert len(FakeKroki.hits) == 2
+
+    missing = tmp_path / "nope.puml"
+    res = kroki.render_many([(missing, out, "plantuml")], server)
+    assert res[out].startswith("failed to read")
+
+
+def test_batch_cli(tmp_path, server, monkeypatch, capsys):
+    """Test the --batch command line."""
+    (src, out, _), = _sources(tmp_path, 1)
+    cache = tmp_path / "c.json"
+    argv = ["kroki_render.py", "--batch", "--server", server,
+            "--cache", str(cache), f"{src}={out}"]
+    monkeypatch.setattr(kroki.sys, "argv", argv)
+    assert kroki.main() == 0
+    assert kroki.main() == 0
+    text = capsys.readouterr().out
+    assert "rendered" in text and "cached" in text
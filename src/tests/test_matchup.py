@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from pig import matchup
+from pig.ai import ComputerStrategy, SmartStrategy
+from pig.game import Game
+
+
+def _simulate(bots, target, n, seed):
+    random.seed(seed)
+    wins = turns = rolls = 0
+    for _ in range(n):
+        g = Game(target=target)
+        while not g.is_over:
+            res = g.play_cpu_turn(bots[g.current_index].decide)
+            turns += 1
+            rolls += sum(1 for s in res["actions"] if s["action"] == "roll")
+        wins += g.winner_id == g.players[0].player_id
+    return wins / n, turns / n, rolls / n
+
+
+def test_head_to_head_matches_simulation():
+    """Test exact win chance and game length agree with simulation."""
+    a, b = ComputerStrategy(6), SmartStrategy(4, 10)
+    m = matchup.head_to_head(a, b, target=20)
+    win, turns, rolls = _simulate((a, b), 20, 6_000, seed=11)
+    assert m.win_first == pytest.approx(win, abs=0.02)
+    assert m.turns_first == pytest.approx(turns, rel=0.03)
+    assert m.rolls_first == pytest.approx(rolls, rel=0.03)
+
+    win2, _, _ = _simulate((b, a), 20, 6_000, seed=12)
+    assert m.win_second == pytest.approx(1 - win2, abs=0.02)
+    assert m.win_rate == pytest.approx((m.win_first + m.win_second) / 2)
+
+
+def test_mirror_match_is_fair_over_both_seats():
+    """Test a bot against itself wins half over alternating seats."""
+    m = matchup.head_to_head(SmartStrategy(), SmartStrategy(), target=30)
+    assert m.win_rate == pytest.approx(0.5, abs=1e-12)
+    assert m.win_first > 0.5                        # moving first helps
+    assert m.turns_first == pytest.approx(m.turns_second, abs=1e-9)
+
+
+def test_tiny_game_by_hand():
+    """Test target 2, always roll: first roll decides most of it."""
+    class Roller:
+        def decide(self, game):
+            return "hold" if game.current.score + game.turn_points >= game.target else "roll"
+
+    m = matchup.head_to_head(Roller(), Roller(), target=2, sides=2)
+    # 2-sided die: a 2 wins at once, a 1 passes; first mover wins 2/3
+    assert m.win_first == pytest.approx(2 / 3)
+    assert m.rolls_first == pytest.approx(2.0)      # geometric, p = 1/2
+    assert m.turns_first == pytest.approx(2.0)
+
+
+def test_cli(capsys):
+    """Test the command line prints a matchup and rejects search bots."""
+    assert matchup.main(["computer:6", "smart:4,10", "--target", "15"]) == 0
+    out = capsys.readouterr().out
+    assert "computer:6 wins:" in out and "rolls" in out
+    assert matchup.main(["expert", "easy", "--target", "15"]) == 2
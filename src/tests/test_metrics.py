@@ -0,0 +1,157 @@
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pig import metrics
+from pig.ai import SmartStrategy
+from pig.game import Game
+from pig.scoreboard import Scoreboard
+
+
+class ConstDice:
+    def __init__(self, v):
+        self.v = v
+    def roll(self):
+        return self.v
+
+
+@pytest.fixture
+def hooks():
+    """Turn metrics on for one test and always turn them off again."""
+    metrics.enable()
+    metrics.reset()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def _value(text, line_start):
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not in output")
+
+
+def test_game_counters(hooks):
+    """Test games, rolls, busts and finished games are counted."""
+    g = Game(target=10)
+    g.dice = g.turn.dice = ConstDice(6)
+    g.roll()
+    g.roll()
+    g.hold()                      # 12 >= 10 -> finished
+    g.reset()
+    g.dice = g.turn.dice = ConstDice(1)
+    g.roll()                      # bust
+    text = metrics.render()
+    assert _value(text, "pig_games_started_total") == 2
+    assert _value(text, "pig_games_finished_total") == 1
+    assert _value(text, "pig_rolls_total") == 3
+    assert _value(text, "pig_busts_total") == 1
+    assert "# TYPE pig_rolls_total counter" in text
+
+
+def test_decide_histogram_and_labels(hooks):
+    """Test decisions are counted by choice and timed per strategy."""
+    g = Game()
+    bot = SmartStrategy()
+    for _ in range(3):
+        bot.decide(g)
+    text = metrics.render()
+    lab = 'strategy="SmartStrategy"'
+    assert _value(text, f'pig_decisions_total{{{lab},choice="roll"}}') == 3
+    assert _value(text, f'pig_decide_seconds_count{{{lab}}}') == 3
+    assert _value(text, f'pig_decide_seconds_bucket{{{lab},le="+Inf"}}') == 3
+    assert "# TYPE pig_decide_seconds histogram" in text
+
+
+def test_scoreboard_write_timed(hooks):
+    """Test scoreboard records are timed."""
+    g = Game(target=1)
+    g.dice = g.turn.dice = ConstDice(6)
+    g.roll()
+    g.hold()
+    Scoreboard().record_from_game(g)
+    text = metrics.render()
+    assert _value(text, 'pig_scoreboard_write_seconds_count{op="record"}') == 1
+
+
+def test_threads_write_their_own_shard(hooks):
+    """Test counts from many threads add up without locking."""
+    def work():
+        for _ in range(1000):
+            metrics.inc("pig_rolls_total")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    counters, _ = metrics.collect()
+    assert counters[("pig_rolls_total", "")] == 8000
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket lines count everything at or below the bound."""
+    metrics.reset()
+    metrics.observe("t_seconds", 0.0002)
+    metrics.observe("t_seconds", 0.3)
+    metrics.observe("t_seconds", 5.0)
+    text = metrics.render()
+    assert _value(text, 't_seconds_bucket{le="0.0001"}') == 0
+    assert _value(text, 't_seconds_bucket{le="0.0005"}') == 1
+    assert _value(text, 't_seconds_bucket{le="0.5"}') == 2
+    assert _value(text, 't_seconds_bucket{le="+Inf"}') == 3
+    assert _value(text, "t_seconds_sum") == pytest.approx(5.3002)
+    metrics.reset()
+
+
+def test_disable_restores_methods():
+    """Test nothing stays wrapped after disable."""
+    plain = Game.roll
+    metrics.enable()
+    assert Game.roll is not plain
+    metrics.disable()
+    assert Game.roll is plain and not metrics.is_enabled()
+
+
+def test_http_endpoint(hooks):
+    """Test /metrics serves the text format and other paths 404."""
+    metrics.inc("pig_rolls_total", n=5)
+    server = metrics.serve(0)
+    port = server.server_address[1]
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as r:
+            assert r.headers["Content-Type"].startswith("text/plain")
+            body = r.read().decode()
+        assert _value(body, "pig_rolls_total") == 5
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/nope")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_metrics_and_instrument_unhook_in_any_order():
+    """Test turning one module off keeps the other's wrappers."""
+    from pig import instrument
+    for first, second in ((instrument, metrics), (metrics, instrument)):
+        metrics.reset()
+        instrument.reset()
+        metrics.enable()
+        instrument.enable()
+        try:
+            first.disable()
+            g = Game(target=10)
+            g.dice = g.turn.dice = ConstDice(6)
+            g.roll()
+            assert second.is_enabled() and not first.is_enabled()
+            if second is metrics:
+                assert _value(metrics.render(), "pig_rolls_total") == 1
+            else:
+                assert instrument.snapshot()["game.roll"]["calls"] == 1
+        finally:
+            metrics.disable()
+            instrument.disable()
+    assert not hasattr(Game.roll, "__wrapped__")
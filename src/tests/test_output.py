@@ -0,0 +1,115 @@
+import io
+import socket
+import pytest
+
+from pig.game import Game
+from pig.scoreboard import Scoreboard
+from pig.output import MemorySink, Sink, SocketSink, StreamSink
+from pig.pacing import FixedPacer, InstantPacer
+import pig.shell as shell
+
+
+class SeqDice:
+    def __init__(self, seq):
+        self.seq = list(seq)
+    def roll(self):
+        return self.seq.pop(0)
+
+
+def test_memory_sink_buffers_until_flush():
+    """Test nothing goes out until flush, then it's one chunk."""
+    s = MemorySink()
+    s.write("a\n")
+    s.write("b\n")
+    assert s.getvalue() == ""
+    assert s.pending() == "a\nb\n"
+    s.flush()
+    s.flush()  # nothing left, no extra write
+    assert s.chunks == ["a\nb\n"]
+    assert s.flushes == 1
+
+
+def test_autoflush_writes_every_time():
+    """Test autoflush behaves like plain print."""
+    s = MemorySink(autoflush=True)
+    s.write("x")
+    s.write("y")
+    assert s.chunks == ["x", "y"]
+
+
+def test_stream_sink_uses_given_stream_or_stdout(capsys):
+    """Test StreamSink writes to its stream, or sys.stdout by default."""
+    buf = io.StringIO()
+    s = StreamSink(buf)
+    s.write("hello\n")
+    s.flush()
+    assert buf.getvalue() == "hello\n"
+
+    d = StreamSink()
+    d.write("to stdout\n")
+    d.flush()
+    assert capsys.readouterr().out == "to stdout\n"
+
+
+def test_socket_sink_sends_once():
+    """Test SocketSink sends the buffered text in a single sendall."""
+    a, b = socket.socketpair()
+    try:
+        s = SocketSink(a)
+        s.write("one\n")
+        s.write("two\n")
+        s.flush()
+        assert b.recv(100) == b"one\ntwo\n"
+        assert s.flushes == 1
+    finally:
+        a.close()
+        b.close()
+
+
+def test_shell_flushes_once_per_command():
+    """Test a whole header (many lines) goes out in one write at postcmd."""
+    out = MemorySink()
+    sh = shell.PigShell(Game(), Scoreboard(), pacer=InstantPacer(), out=out)
+    sh.onecmd("status")
+    assert out.chunks == []
+    sh.postcmd(False, "status")
+    assert out.flushes == 1
+    assert "Pig — first to 100 wins" in out.getvalue()
+    assert "Turn points: 0" in out.getvalue()
+
+
+def test_shell_bust_is_one_write_when_instant():
+    """Test instant pacing keeps a bust's five lines in a single write."""
+    g = Game()
+    g.dice = SeqDice([1])
+    g.turn.dice = g.dice
+    out = MemorySink()
+    sh = shell.PigShell(g, Scoreboard(), pacer=InstantPacer(), out=out)
+    sh.onecmd("roll")
+    sh.postcmd(False, "roll")
+    assert out.flushes == 1
+    assert "BUSTED!" in out.getvalue()
+
+
+def test_shell_real_pauses_show_text_first():
+    """Test with a real delay the sink flushes before each pause."""
+    g = Game()
+    g.dice = SeqDice([1])
+    g.turn.dice = g.dice
+    out = MemorySink()
+    sh = shell.PigShell(g, Scoreboard(), pacer=FixedPacer(0), out=out)
+    sh.pacer.delay = 0.001
+    sh.do_roll("")
+    assert out.flushes == 5
+
+
+def test_sink_base_is_abstract():
+    """Test a sink without somewhere to emit to can't be built."""
+    with pytest.raises(TypeError):
+        Sink()
+
+    class Half(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        Half()
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+
+from pig.game import Game
+from pig.scoreboard import Scoreboard
+from pig.pacing import (
+    AsyncPacer, FixedPacer, InstantPacer, Pacer, make_pacer, DEFAULT_DELAY,
+)
+import pig.shell as shell
+
+
+class CountingPacer(Pacer):
+    def __init__(self):
+        self.calls = 0
+    def pause(self):
+        self.calls += 1
+
+
+class SeqDice:
+    def __init__(self, seq):
+        self.seq = list(seq)
+    def roll(self):
+        return self.seq.pop(0)
+
+
+def test_make_pacer_specs(monkeypatch):
+    """Test each spec string builds the right pacer."""
+    assert isinstance(make_pacer("instant"), InstantPacer)
+    assert isinstance(make_pacer("0"), InstantPacer)
+    p = make_pacer("0.5")
+    assert isinstance(p, FixedPacer) and p.delay == 0.5
+    a = make_pacer("async:0.1")
+    assert isinstance(a, AsyncPacer) and a.delay == 0.1
+    assert make_pacer("async").delay == DEFAULT_DELAY
+
+    monkeypatch.delenv("PIG_PACE", raising=False)
+    d = make_pacer()
+    assert isinstance(d, FixedPacer) and d.delay == DEFAULT_DELAY
+    monkeypatch.setenv("PIG_PACE", "instant")
+    assert isinstance(make_pacer(), InstantPacer)
+
+
+def test_bad_specs_raise():
+    """Test nonsense or negative delays are rejected."""
+    with pytest.raises(ValueError):
+        make_pacer("soon")
+    with pytest.raises(ValueError):
+        FixedPacer(-1)
+
+
+def test_instant_and_async_pause_do_not_block():
+    """Test instant and async pacers return from pause() right away."""
+    start = time.perf_counter()
+    InstantPacer().pause()
+    AsyncPacer(5).pause()
+    assert time.perf_counter() - start < 0.5
+
+
+def test_async_pacer_waits_on_event_loop():
+    """Test AsyncPacer.wait() sleeps via asyncio."""
+    start = time.perf_counter()
+    asyncio.run(AsyncPacer(0.05).wait())
+    assert time.perf_counter() - start >= 0.04
+
+
+def test_shell_uses_injected_pacer(capsys):
+    """Test the shell pauses through its pacer (five times on a bust)."""
+    g = Game()
+    g.dice = SeqDice([1])
+    g.turn.dice = g.dice
+    pacer = CountingPacer()
+    sh = shell.PigShell(g, Scoreboard(), pacer=pacer)
+    sh.do_roll("")
+    assert pacer.calls == 5
+    assert "BUSTED!" in capsys.readouterr().out
@@ -0,0 +1,47 @@
+from array import array
+
+import pytest
+
+from pig import parallel
+from pig.ai import ComputerStrategy, SmartStrategy
+
+
+A, B = ComputerStrategy(6), SmartStrategy(4, 10)
+
+
+def test_play_into_counts_every_game():
+    """Test the counters add up and stay inside their ranges."""
+    slab = array("q", bytes(parallel.slab_size(20) * parallel.ITEM))
+    assert parallel.play_into(slab, A, B, 300, seed=1, target=20) == 300
+    r = parallel.SimResult.from_slab(slab, 20)
+    assert r.games == 300
+    assert sum(r.turns) == sum(r.scores_a) == sum(r.scores_b) == 300
+    assert r.scores_a[20] == r.wins[0] and r.scores_b[20] == r.wins[1]
+    assert r.mean_turns >= 2
+
+
+def test_workers_merge_to_the_same_counts():
+    """Test two processes give exactly what their two slabs give in-process."""
+    r = parallel.run(A, B, 401, workers=2, seed=3, target=20)
+    size = parallel.slab_size(20)
+    slab = array("q", bytes(2 * size * parallel.ITEM))
+    parallel.play_into(slab, A, B, 201, 3, 20)
+    parallel.play_into(slab, A, B, 200, 4, 20, offset=size)
+    both = [slab[i] + slab[size + i] for i in range(size)]
+    expected = parallel.SimResult.from_slab(both, 20)
+    assert r == expected and r.games == 401
+
+
+def test_single_worker_matches_exact_odds():
+    """Test the in-process path and the win rate."""
+    from pig.matchup import head_to_head
+    r = parallel.run(A, B, 4_000, workers=1, seed=2, target=20)
+    assert r.rate == pytest.approx(head_to_head(A, B, 20).win_rate, abs=0.03)
+
+
+def test_parallel_cli(capsys):
+    """Test the summary line."""
+    assert parallel.main(["computer:6", "smart:4,10", "--games", "50",
+                          "--workers", "1", "--target", "20"]) == 0
+    assert "over 50 games" in capsys.readouterr().out
+    assert parallel.main(["expert", "easy"]) == 2
@@ -0,0 +1,80 @@
+import json
+import pytest
+
+from pig.ai import ComputerStrategy, SmartStrategy
+import pig.presets as presets
+import pig.shell as shell
+
+
+TABLE = {
+    10: {"easy": ("computer", (6,)), "hard": ("smart", (4, 8))},
+    100: {"easy": ("computer", (20,)), "hard": ("smart", (12, 28))},
+    200: {"easy": ("smart", (10, 20)), "hard": ("smart", (16, 32))},
+}
+
+
+def test_lookup_exact_and_clamped():
+    """Test exact targets and targets outside the table."""
+    assert presets.lookup(TABLE, "hard", 100) == ("smart", (12, 28))
+    assert presets.lookup(TABLE, "hard", 3) == ("smart", (4, 8))
+    assert presets.lookup(TABLE, "hard", 5000) == ("smart", (16, 32))
+    assert presets.lookup(TABLE, "normal", 100) is None
+    assert presets.lookup({}, "hard", 100) is None
+
+
+def test_lookup_interpolates_between_targets():
+    """Test thresholds are blended between the two nearest targets."""
+    assert presets.lookup(TABLE, "hard", 55) == ("smart", (8, 18))
+    assert presets.lookup(TABLE, "easy", 55) == ("computer", (13,))
+    # different bot kinds on each side -> nearest one
+    assert presets.lookup(TABLE, "easy", 120) == ("computer", (20,))
+    assert presets.lookup(TABLE, "easy", 180) == ("smart", (10, 20))
+
+
+def test_save_merges_and_load_round_trips(tmp_path):
+    """Test saving merges targets into the file and loading reads them."""
+    p = tmp_path / "presets.json"
+    presets.save_presets({50: {"easy": {"kind": "computer", "params": [12],
+                                        "win_rate": 0.4}}}, p)
+    presets.save_presets({10: {"hard": {"kind": "smart", "params": [4, 8]}}}, p)
+    data = json.loads(p.read_text(encoding="utf-8"))
+    assert list(data["targets"]) == ["10", "50"]
+    table = presets.load_presets(p)
+    assert table == {10: {"hard": ("smart", (4, 8))},
+                     50: {"easy": ("computer", (12,))}}
+    assert presets.load_presets(tmp_path / "nope.json") == {}
+
+
+def test_shipped_table_covers_common_targets():
+    """Test the offline table that ships with the package loads."""
+    table = presets.load_presets()
+    assert 100 in table and 10 in table
+    for row in table.values():
+        assert set(row) == {"easy", "normal", "hard"}
+
+
+def test_build_brain_follows_target(monkeypatch):
+    """Test _build_brain looks up presets by target, lazily."""
+    monkeypatch.setattr(presets, "_table", None)
+    monkeypatch.setattr(presets, "load_presets", lambda: TABLE)
+    small = shell._build_brain("hard", 10)
+    big = shell._build_brain("hard", 100)
+    assert isinstance(small, SmartStrategy) and small.max_threshold == 8
+    assert big.max_threshold == 28
+    assert isinstance(shell._build_brain("easy", 10), ComputerStrategy)
+    # nothing calibrated for "normal" -> built-in default
+    assert shell._build_brain("normal", 100).max_threshold == 28
+    with pytest.raises(ValueError):
+        presets.make_bot(("dragon", ()))
+
+
+def test_shell_rebuilds_brain_on_target_change(monkeypatch, capsys):
+    """Test changing the target in PvC swaps to that target's preset."""
+    from pig.game import Game
+    from pig.scoreboard import Scoreboard
+    monkeypatch.setattr(presets, "_table", TABLE)
+    sh = shell.PigShell(Game(), Scoreboard())
+    sh.set_mode("pvc", "hard")
+    assert sh.brain.max_threshold == 28
+    sh.do_target("10")
+    assert sh.brain.max_threshold == 8
@@ -0,0 +1,60 @@
+import pytest
+
+from pig import ranking
+from pig.ai import ComputerStrategy
+
+
+def _pool():
+    # at target 20 the exact order is c20 > c12 > c7 > c3 > c2 ~ c1
+    return {f"c{t}": ComputerStrategy(t) for t in (1, 2, 7, 3, 20, 12)}
+
+
+def test_swiss_pairs_without_rematches():
+    """Test 4 bots over 3 rounds meet everyone exactly once."""
+    bots = {f"c{t}": ComputerStrategy(t) for t in (2, 5, 8, 11)}
+    r = ranking.swiss(bots, rounds=3, blocks=2, target=20)
+    assert set(r.games.values()) == {3 * 2 * 4}
+    assert r.total_games == 6 * 2 * 4
+    assert sum(r.scores.values()) == 6          # one point per match
+
+
+def test_swiss_finds_the_strong_bot():
+    """Test the ranking comes out like Scoreboard.top."""
+    r = ranking.swiss(_pool(), blocks=8, target=20)
+    top = r.top(2)
+    assert isinstance(top, list) and all(isinstance(t, tuple) for t in top)
+    assert top == [("c20", 5.0), ("c12", 4.0)]
+    assert r.order[-1] in ("c1", "c2")
+
+
+def test_successive_rejects_keeps_the_best():
+    """Test the bandit keeps the best bots and spends on the survivors."""
+    r = ranking.successive_rejects(_pool(), k=2, budget=2_400, seed=1,
+                                   target=20)
+    assert [name for name, _ in r.top(2)] == ["c20", "c12"]
+    assert r.order[-1] in ("c1", "c2")
+    assert r.total_games <= 2_400
+    first_out = r.order[-1]
+    assert all(r.games[name] > r.games[first_out] for name in r.order[:2])
+
+
+def test_successive_rejects_against_a_reference():
+    """Test a fixed opponent and the argument checks."""
+    r = ranking.successive_rejects(_pool(), k=1, budget=1_200,
+                                   reference=ComputerStrategy(7), target=20)
+    assert r.order[0] == "c20"
+    assert sum(r.games.values()) == r.total_games
+    with pytest.raises(ValueError):
+        ranking.successive_rejects(_pool(), k=6)
+    with pytest.raises(ValueError):
+        ranking.swiss({"x": ComputerStrategy(5)})
+
+
+def test_ranking_cli(capsys):
+    """Test ranking the tuner grid from the command line."""
+    assert ranking.main(["--kind", "computer", "--target", "10",
+                         "--method", "rejects", "--budget", "400",
+                         "--top", "2"]) == 0
+    out = capsys.readouterr().out
+    assert "  1. computer:" in out and "round-robin" in out
+    assert ranking.spec_name(("smart", (12, 28))) == "smart:12,28"
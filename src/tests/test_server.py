@@ -0,0 +1,219 @@
+import asyncio
+
+from pig.game import Game
+from pig.pacing import AsyncPacer
+from pig.scoreboard import Scoreboard
+from pig.server import PigServer, Session, ScoreboardWriter, END
+
+
+class ConstDice:
+    def __init__(self, v):
+        self.v = v
+    def roll(self):
+        return self.v
+
+
+def _const_game(v=6, target=100):
+    g = Game(target=target)
+    g.dice = ConstDice(v)
+    g.turn.dice = g.dice
+    return g
+
+
+async def _ask(reader, writer, line):
+    """Send one command and collect the reply up to the END marker."""
+    writer.write((line + "\n").encode("utf-8"))
+    await writer.drain()
+    lines = []
+    while True:
+        raw = await reader.readline()
+        text = raw.decode("utf-8").rstrip("\n")
+        if text == END:
+            return lines
+        lines.append(text)
+
+
+async def _connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    greeting = []
+    while (text := (await reader.readline()).decode().rstrip("\n")) != END:
+        greeting.append(text)
+    return reader, writer
+
+
+# 1) Session handles the shell commands without any socket
+def test_session_commands_without_network():
+    async def go():
+        w = ScoreboardWriter(Scoreboard())
+        s = Session(_const_game(6), w)
+        out, done = s.handle("roll")
+        assert out == ["Rolled 6. Turn points: 6"] and not done
+        out, _ = s.handle("hold")
+        assert "Holding. Current Score: 6 points." in out
+        out, _ = s.handle("name 1 Alice")
+        assert "       Alice:   6   vs   Player 2    :   0" in out
+        out, _ = s.handle("target x")
+        assert out[0].startswith("Could not set target:")
+        out, _ = s.handle("diff banana")
+        assert out == ["Pick 'easy', 'normal', 'hard' or 'expert'."]
+        out, _ = s.handle("dance")
+        assert out[0].startswith("Unknown command:")
+        out, done = s.handle("quit")
+        assert done
+    asyncio.run(go())
+
+
+# 2) a win goes through the writer task into the shared scoreboard
+def test_win_is_recorded_by_writer_task():
+    saved = []
+
+    async def go():
+        sb = Scoreboard()
+        server = await PigServer(
+            sb, save=lambda b: saved.append(len(b.history)),
+            game_factory=lambda: _const_game(6, target=10),
+        ).start()
+        r, w = await _connect(server.port)
+        await _ask(r, w, "roll")
+        await _ask(r, w, "roll")
+        reply = await _ask(r, w, "hold")
+        assert "🎉 Player 1 wins with 12!" in reply
+        assert "Current: Player 1" in reply  # fresh game after reset
+        w.close()
+        await server.close()
+        return sb
+
+    sb = asyncio.run(go())
+    assert [r.winner for r in sb.history] == ["Player 1"]
+    assert saved and saved[-1] == 1
+
+
+# 3) PvC mode: the CPU plays right after the human's command
+def test_pvc_cpu_plays_after_hold():
+    async def go():
+        server = await PigServer(
+            game_factory=lambda: _const_game(1),
+        ).start()
+        r, w = await _connect(server.port)
+        reply = await _ask(r, w, "mode pvc")
+        assert "    Player 1:   0   vs   Computer    :   0" in reply
+        reply = await _ask(r, w, "roll")  # human busts, CPU busts back
+        assert "BUSTED! No points this turn." in reply
+        assert "Computer rolled 1" in reply
+        assert "CPU busted." in reply
+        w.close()
+        await server.close()
+    asyncio.run(go())
+
+
+# 4) many idle clients each get their own game
+def test_many_concurrent_sessions_are_independent():
+    async def go():
+        server = await PigServer(game_factory=lambda: _const_game(4)).start()
+        conns = [await _connect(server.port) for _ in range(200)]
+        assert server.connections == 200
+        r0, w0 = conns[0]
+        await _ask(r0, w0, "roll")
+        r1, w1 = conns[1]
+        status = await _ask(r1, w1, "status")
+        assert "Turn points: 0" in status
+        for r, w in conns:
+            w.close()
+        await server.close()
+    asyncio.run(go())
+
+
+# 5) quit closes only that connection
+def test_quit_closes_connection():
+    async def go():
+        server = await PigServer().start()
+        r, w = await _connect(server.port)
+        assert await _ask(r, w, "quit") == ["Bye!"]
+        assert await r.readline() == b""
+        w.close()
+        await server.close()
+    asyncio.run(go())
+
+
+# 6) the session is a PigShell: its commands, minus the local-only ones
+def test_session_reuses_shell_commands(monkeypatch):
+    def boom(_):
+        raise AssertionError("a session must never prompt")
+    monkeypatch.setattr("builtins.input", boom)
+
+    async def go():
+        s = Session(_const_game(5), ScoreboardWriter(Scoreboard()))
+        s.handle("roll")
+        out, _ = s.handle("UNDO")
+        assert out[0] == "Undone." and "Turn points: 0" in out
+        out, _ = s.handle("help")
+        assert any("roll" in line for line in out)
+        assert not any("stats" in line for line in out)
+        for cmd in ("hint", "save", "stats on", "diff EXPERT"):
+            out, done = s.handle(cmd)
+            assert "isn't available over the network" in out[0]
+            assert not done
+        assert s.difficulty == "normal"
+        assert s.handle("diff hard")[0] == ["Difficulty set to hard."]
+        out, _ = s.handle("pepper")
+        assert out[0].startswith("Unknown command:")
+        assert s.handle("exit") == (["Bye!"], True)
+    asyncio.run(go())
+
+
+# 7) a failing save is logged and later results are still recorded
+def test_writer_survives_failed_save(caplog):
+    calls = []
+
+    def flaky(sb):
+        calls.append(len(sb.history))
+        if len(calls) == 1:
+            raise OSError("disk full")
+
+    async def go():
+        w = ScoreboardWriter(Scoreboard(), save=flaky)
+        task = asyncio.create_task(w.run())
+        g = _const_game(6, target=10)
+        for _ in range(2):
+            g.roll()
+            g.roll()
+            g.hold()
+            w.submit(g.get_winner(), list(g.players), g.target)
+            g.reset()
+            await asyncio.sleep(0.05)
+        w.queue.put_nowait(None)
+        await task
+        return w
+
+    with caplog.at_level("ERROR", logger="pig.server"):
+        w = asyncio.run(go())
+    assert calls == [1, 2]
+    assert w.save_errors == 1 and len(w.sb.history) == 2
+    assert "saving the scoreboard failed" in caplog.text
+
+
+# 8) pauses split a reply; the server awaits the pacer between the parts
+def test_paced_reply_does_not_hold_up_other_clients():
+    async def go():
+        s = Session(_const_game(1), ScoreboardWriter(Scoreboard()))
+        parts, _ = s.handle_parts("roll")        # a bust pauses five times
+        assert parts[0] == ["Rolled 1."] and len(parts) == 6
+
+        games = iter([_const_game(1), _const_game(6)])
+        server = await PigServer(game_factory=lambda: next(games),
+                                 pacer=AsyncPacer(0.1)).start()
+        r1, w1 = await _connect(server.port)
+        r2, w2 = await _connect(server.port)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        slow = asyncio.create_task(_ask(r1, w1, "roll"))
+        await asyncio.sleep(0.05)
+        assert await _ask(r2, w2, "roll") == ["Rolled 6. Turn points: 6"]
+        assert not slow.done()       # still pausing between its parts
+        reply = await slow
+        assert loop.time() - start >= 0.45
+        assert reply[:2] == ["Rolled 1.", "BUSTED! No points this turn."]
+        w1.close()
+        w2.close()
+        await server.close()
+    asyncio.run(go())
@@ -229,7 +229,7 @@ def test_mode_and_diff_switching_and_errors(capsys):
 
     sh.do_diff("banana")
     out4 = capsys.readouterr().out
-    assert "Pick 'easy', 'normal' or 'hard'." in out4
+    assert "Pick 'easy', 'normal', 'hard' or 'expert'." in out4
 
 
 # 12) cpu turn printing, default() unknown + cheat unlock + menu ops (minimal)
@@ -324,3 +324,84 @@ def test_postcmd_records_and_resets(monkeypatch, tmp_path, capsys):
     assert "Pig — first to" in out
     # after reset winner cleared
     assert not g.is_over
+
+
+# undo/redo commands; in pvc undo goes back to the human's turn
+def test_undo_redo_commands(capsys):
+    g = Game()
+    g.dice = ConstDice(5); g.turn.dice = g.dice
+    sh = shell.PigShell(g, Scoreboard())
+
+    sh.do_undo("")
+    assert "Nothing to undo." in capsys.readouterr().out
+    sh.do_roll("")
+    sh.do_undo("")
+    out = capsys.readouterr().out
+    assert "Undone." in out and "Turn points: 0" in out
+    sh.do_redo("")
+    assert "Turn points: 5" in capsys.readouterr().out
+    sh.do_redo("")
+    assert "Nothing to redo." in capsys.readouterr().out
+
+    sh.mode = "pvc"
+    sh.brain = types.SimpleNamespace(decide=lambda game: "hold")
+    sh.do_hold("")                 # P1 banks 5
+    sh._cpu_take_turn()            # CPU holds straight away
+    assert g.current is g.players[0]
+    sh.do_undo("")
+    assert g.current is g.players[0]
+    assert g.players[0].score == 0 and g.turn_points == 5
+
+
+# expert difficulty builds the search bot with its budget
+def test_expert_difficulty_uses_search_bot():
+    from pig.ai import SearchStrategy
+    brain = shell._build_brain("expert")
+    assert isinstance(brain, SearchStrategy)
+    assert (brain.max_depth, brain.time_budget) == shell.SEARCH_BUDGETS["expert"]
+
+    sh = shell.PigShell(Game(), Scoreboard())
+    sh.set_mode("pvc", "expert")
+    assert isinstance(sh.brain, SearchStrategy)
+    with pytest.raises(ValueError):
+        sh.set_mode("pvc", "impossible")
+
+
+# the scoreboard is only read when something needs it
+def test_lazy_scoreboard_loads_on_first_use(tmp_path, monkeypatch):
+    p = set_tmp_save_path(tmp_path, monkeypatch)
+    a, b = Player("A"), Player("B")
+    sb = Scoreboard()
+    sb.record(winner=a, players=[a, b], target=10)
+    shell.save_scoreboard(sb)
+
+    calls = []
+    def loader():
+        calls.append(1)
+        return shell.load_scoreboard()
+
+    lazy = shell.LazyScoreboard(loader)
+    sh = shell.PigShell(Game(), lazy)
+    sh.do_status("")
+    assert not lazy.loaded and calls == []
+
+    # quitting without touching it leaves the file alone
+    p.write_text("sentinel", encoding="utf-8")
+    sh.do_quit("")
+    assert p.read_text(encoding="utf-8") == "sentinel"
+    shell.save_scoreboard(sb)
+
+    sh.do_view("")
+    assert lazy.loaded and calls == [1]
+    assert lazy.last(1)[0].winner == "A"
+    sh.do_view("")
+    assert calls == [1]
+
+
+def test_cheat_is_built_on_demand(monkeypatch, capsys):
+    sh = shell.PigShell(Game(), Scoreboard())
+    assert sh._cheat is None
+    monkeypatch.setattr(builtins, "input", lambda prompt="": "back")
+    sh.default("pepper")
+    assert sh._cheat is not None
+    assert "cheats unlocked" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import pytest
+
+from pig import tournament
+from pig.ai import ComputerStrategy
+from pig.compare import Comparison
+
+
+def _result(wins, games):
+    r = Comparison()
+    for i in range(games // 4):
+        r.add(min(4, max(0, wins - 4 * i)), 4)
+    return r
+
+
+def test_sprt_decides_either_way():
+    """Test clear results settle and a coin flip keeps going."""
+    assert tournament.sprt_llr(50, 100) == pytest.approx(0.0)
+    assert tournament.settle(_result(80, 100)) == "a"
+    assert tournament.settle(_result(20, 100)) == "b"
+    assert tournament.settle(_result(52, 100)) is None
+    with pytest.raises(ValueError):
+        tournament.settle(_result(50, 100), "vibes")
+
+
+def test_lopsided_pairs_stop_early_and_close_ones_get_the_games():
+    """Test a blowout settles fast while a mirror match runs to the cap."""
+    bots = {"timid": ComputerStrategy(2), "solid": ComputerStrategy(6),
+            "twin": ComputerStrategy(6)}
+    pairs = tournament.run(bots, round_games=120, max_games=800, target=20)
+    by_name = {(p.a, p.b): p for p in pairs}
+    blowout = by_name[("timid", "solid")]
+    mirror = by_name[("solid", "twin")]
+    assert blowout.winner == "solid"
+    assert blowout.games < 200
+    assert mirror.verdict is None and mirror.games == 800
+    assert mirror.result.rate == 0.5
+    # the mirror's later rounds got the whole round budget
+    assert mirror.rounds < 800 // (120 // 3)
+
+
+def test_runs_are_reproducible():
+    """Test the same seed gives the same tournament."""
+    bots = {"a": ComputerStrategy(4), "b": ComputerStrategy(8),
+            "c": ComputerStrategy(12)}
+    kw = dict(round_games=60, max_games=400, seed=3, target=20)
+    one = tournament.run(bots, **kw)
+    two = tournament.run(bots, **kw)
+    assert [(p.result.wins, p.games, p.verdict) for p in one] == \
+           [(p.result.wins, p.games, p.verdict) for p in two]
+
+
+def test_interval_rule_calls_even_matches_even():
+    """Test the confidence-bound rule settles a mirror match as even."""
+    bots = {"x": ComputerStrategy(6), "y": ComputerStrategy(6)}
+    pair, = tournament.run(bots, rule="ci", round_games=20, target=20)
+    assert pair.verdict == "even"
+    assert pair.games == tournament.MIN_BLOCKS * tournament.BLOCK_GAMES
+
+
+def test_tournament_cli(capsys):
+    """Test the table prints games per pair and bad input is refused."""
+    assert tournament.main(["computer:4", "computer:12", "--target", "20",
+                            "--max-games", "400"]) == 0
+    out = capsys.readouterr().out
+    assert "games" in out and "in all" in out
+    assert tournament.main(["easy", "easy"]) == 2
+    assert tournament.main(["expert", "easy"]) == 2
@@ -0,0 +1,150 @@
+import pytest
+
+from pig.ai import ComputerStrategy, SmartStrategy
+import pig.tuner as tuner
+
+
+def test_make_bot_and_bad_kind():
+    """Test specs turn into the right strategy objects."""
+    b = tuner.make_bot(("computer", (16,)))
+    assert isinstance(b, ComputerStrategy) and b.base_threshold == 16
+    s = tuner.make_bot(("smart", (10, 30)))
+    assert isinstance(s, SmartStrategy) and s.max_threshold == 30
+    with pytest.raises(ValueError):
+        tuner.make_bot(("dragon", ()))
+    with pytest.raises(ValueError):
+        tuner.grid("dragon")
+
+
+def test_play_match_is_seeded():
+    """Test the same seed gives the same result."""
+    a, b = ("computer", (20,)), ("smart", (12, 28))
+    w1 = tuner.play_match(a, b, 20, seed=5, target=30)
+    w2 = tuner.play_match(a, b, 20, seed=5, target=30)
+    assert w1 == w2
+    assert 0 <= w1 <= 20
+
+
+def test_successive_halving_drops_losers():
+    """Test survivors get more games and come first in the ranking."""
+    cands = [("computer", (b,)) for b in (4, 12, 20, 40)]
+    ranked = tuner.successive_halving(cands, games=20, chunk=10, workers=1,
+                                      seed=1, target=30)
+    assert len(ranked) == 4
+    games = [r.games for r in ranked]
+    assert games == sorted(games, reverse=True)
+    assert ranked[0].games > ranked[-1].games
+    assert all(0.0 <= r.rate <= 1.0 for r in ranked)
+
+
+def test_successive_halving_in_parallel_matches_serial():
+    """Test worker processes give exactly the serial results."""
+    cands = [("computer", (10,)), ("computer", (20,))]
+    kw = dict(games=20, chunk=10, seed=3, target=30, rounds=1)
+    serial = tuner.successive_halving(cands, workers=1, **kw)
+    parallel = tuner.successive_halving(cands, workers=2, **kw)
+    assert [(r.spec, r.wins) for r in serial] == \
+        [(r.spec, r.wins) for r in parallel]
+
+
+def test_pick_presets_and_grid_scaling():
+    """Test difficulty picks and that grids never exceed the target."""
+    R = tuner.Result
+    presets = tuner.pick_presets(
+        [R(("computer", (14,)), 40, 100), R(("computer", (24,)), 20, 100)],
+        [R(("smart", (10, 20)), 50, 100), R(("smart", (16, 32)), 60, 100)],
+    )
+    assert presets["easy"]["params"] == [14]
+    assert presets["normal"]["params"] == [10, 20]
+    assert presets["hard"]["params"] == [16, 32]
+    with pytest.raises(ValueError):
+        tuner.pick_presets([], [])
+
+    for kind in ("computer", "smart"):
+        for target in (5, 10, 100, 1000):
+            specs = tuner.grid(kind, target)
+            assert specs
+            assert all(max(p) <= max(4, target) for _, p in specs)
+
+
+def test_calibrate_one_target():
+    """Test a tiny calibration run produces all three difficulties."""
+    presets = tuner.calibrate(10, games=10, workers=1, seed=1)
+    assert set(presets) == {"easy", "normal", "hard"}
+    assert presets["easy"]["kind"] == "computer"
+
+
+def test_exact_results_rank_every_candidate():
+    """Test solved scores are exact, complete and best first."""
+    cands = [("computer", (b,)) for b in (2, 6, 10)]
+    ranked = tuner.exact_results(cands, workers=1, target=10)
+    assert {r.spec for r in ranked} == set(cands)
+    rates = [r.rate for r in ranked]
+    assert rates == sorted(rates, reverse=True)
+    assert all(r.games == 0 and r.exact is not None for r in ranked)
+    # the reference against itself is an even match
+    assert tuner.exact_rate(tuner.REFERENCE, tuner.REFERENCE, 20) == \
+        pytest.approx(0.5)
+
+
+def test_easy_stays_on_the_timid_side():
+    """Test easy never picks a too-greedy setting over a too-timid one."""
+    R = tuner.Result
+    presets = tuner.pick_presets(
+        [R(("computer", (10,)), 0, 0, 0.36), R(("computer", (20,)), 0, 0, 0.5),
+         R(("computer", (38,)), 0, 0, 0.40)],
+        [R(("smart", (12, 28)), 0, 0, 0.5),
+         R(("smart", (16, 22)), 0, 0, 0.52)],
+    )
+    assert presets["easy"]["params"] == [10]
+    assert "games" not in presets["easy"]
+
+
+def test_monotone_smooths_thresholds_across_targets():
+    """Test thresholds become non-decreasing in the target."""
+    def row(*params):
+        return {"hard": {"kind": "smart", "params": list(params)}}
+    rows = {10: row(4, 10), 50: row(24, 32), 75: row(8, 24),
+            100: row(12, 28)}
+    changed = tuner.monotone(rows)
+    assert changed == {(50, "hard"), (75, "hard"), (100, "hard")}
+    lows = [rows[t]["hard"]["params"][0] for t in sorted(rows)]
+    highs = [rows[t]["hard"]["params"][1] for t in sorted(rows)]
+    assert lows == sorted(lows) and highs == sorted(highs)
+    # 24, 8, 12 pool to their mean; 32, 24 to theirs
+    assert rows[50]["hard"]["params"] == rows[100]["hard"]["params"] == \
+        [15, 28]
+    assert rows[10]["hard"]["params"] == [4, 10]
+
+
+def test_hard_comes_from_either_kind_and_beats_normal():
+    """Test a greedy computer setting can be hard when smart can't win."""
+    R = tuner.Result
+    computer = [R(("computer", (b,)), 0, 0, rate)
+                for b, rate in ((8, 0.36), (9, 0.43), (19, 0.54))]
+    presets = tuner.pick_presets(computer,
+                                 [R(("smart", (12, 28)), 0, 0, 0.5)])
+    assert presets["hard"]["params"] == [19]
+    assert presets["normal"]["params"] == [12, 28]
+    assert presets["easy"]["params"] == [9]
+    # every smart setting is an even match and no computer one is better:
+    # normal drops to a weaker computer setting instead of tying hard
+    computer[2] = R(("computer", (10,)), 0, 0, 0.5)
+    even = [R(("smart", (6, 10)), 0, 0, 0.5)]
+    presets = tuner.pick_presets(computer, even)
+    assert presets["hard"] == {"kind": "smart", "params": [6, 10],
+                               "win_rate": 0.5}
+    assert presets["normal"]["params"] == [9]
+    assert presets["easy"]["params"] == [8]
+    with pytest.raises(ValueError, match="weaker than normal"):
+        tuner.pick_presets(computer[1:], even)
+
+
+def test_check_order_refuses_a_hard_that_ties_normal():
+    """Test a table where hard doesn't beat normal is rejected."""
+    def row(*rates):
+        return {name: {"kind": "smart", "params": [12, 28], "win_rate": r}
+                for name, r in zip(("easy", "normal", "hard"), rates)}
+    tuner.check_order({10: row(0.4, 0.5, 0.52)})
+    with pytest.raises(ValueError, match="target 30"):
+        tuner.check_order({10: row(0.4, 0.5, 0.52), 30: row(0.4, 0.5, 0.5)})
@@ -1,9 +1,24 @@
 # tools/kroki_render.py
 # Render a diagram source (PlantUML or DOT) to PNG via Kroki using stdlib only.
+#
+# One file:   python tools/kroki_render.py <src> <out.png> <plantuml|dot>
+#                 [server]
+# Many files: python tools/kroki_render.py --batch [--server URL] [--jobs N]
+#                 [--cache manifest.json] <src>=<out.png> ...
+# Batch mode skips sources whose SHA-256 matches the cache manifest and
+# renders the rest on a few threads, each keeping one connection open.
 
 from __future__ import annotations
+import argparse
+import hashlib
+import http.client
+import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 import urllib.request
 import urllib.error
 
@@ -13,7 +28,18 @@ ENDPOINTS = {
     "dot": "/graphviz/png",
 }
 
-def render(src: Path, out: Path, dtype: str, server: str = "https://kroki.io") -> int:
+# file extension -> diagram type, for batch mode
+EXTENSIONS = {
+    ".plantuml": "plantuml", ".puml": "plantuml", ".pu": "plantuml",
+    ".dot": "dot", ".gv": "dot",
+}
+
+DEFAULT_SERVER = "https://kroki.io"
+
+
+def render(src: Path, out: Path, dtype: str,
+           server: str = DEFAULT_SERVER) -> int:
+    """Render one diagram to ``out``; returns an exit code (0 = done)."""
     dtype = dtype.lower()
     if dtype not in ENDPOINTS:
         print(f"[kroki] unsupported type: {dtype}. Use 'plantuml' or 'dot'.", file=sys.stderr)
@@ -50,14 +76,202 @@ def render(src: Path, out: Path, dtype: str, server: str = "https://kroki.io") -
     return 0
 
 
+# ===== batch mode =====
+
+def guess_type(src: Path) -> str:
+    """Diagram type from the file extension ('plantuml' if unknown)."""
+    return EXTENSIONS.get(src.suffix.lower(), "plantuml")
+
+
+def source_hash(body: bytes, dtype: str, server: str) -> str:
+    """SHA-256 of what decides the PNG: source, type and server."""
+    h = hashlib.sha256()
+    h.update(f"{dtype}\n{server.rstrip('/')}\n".encode("utf-8"))
+    h.update(body)
+    return h.hexdigest()
+
+
+def load_manifest(path: Path | None) -> dict[str, str]:
+    """Read the cache manifest (output path -> hash). Missing/broken -> {}."""
+    if path is None:
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_manifest(path: Path, manifest: dict[str, str]) -> None:
+    """Write the manifest atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _Connections:
+    """One keep-alive HTTP(S) connection per worker thread."""
+
+    def __init__(self, server: str, timeout: float = 60) -> None:
+        parts = urlsplit(server)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+        self._all: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = (http.client.HTTPSConnection if self.https
+               else http.client.HTTPConnection)
+        conn = cls(self.host, self.port, timeout=self.timeout)
+        with self._lock:
+            self._all.append(conn)
+            self.opened += 1
+        self._local.conn = conn
+        return conn
+
+    def post(self, path: str, body: bytes) -> tuple[int, bytes]:
+        """POST on this thread's connection; reconnect once if it dropped."""
+        conn = getattr(self._local, "conn", None) or self._connect()
+        headers = {"Content-Type": "text/plain"}
+        for attempt in (1, 2):
+            try:
+                conn.request("POST", self.prefix + path, body=body,
+                             headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                if resp.will_close:
+                    conn.close()
+                    self._local.conn = None
+                return resp.status, data
+            except (http.client.RemoteDisconnected, ConnectionError,
+                    http.client.CannotSendRequest, http.client.BadStatusLine):
+                conn.close()
+                if attempt == 2:
+                    raise
+                conn = self._connect()
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+
+
+def render_many(
+    jobs: list[tuple[Path, Path, str]],
+    server: str = DEFAULT_SERVER,
+    workers: int = 4,
+    cache: Path | None = None,
+) -> dict[Path, str]:
+    """Render many ``(src, out, dtype)`` jobs; skip ones the cache knows.
+
+    Returns ``{out: status}`` with status "rendered", "cached" or an error
+    message. The manifest only remembers outputs that were written.
+    """
+    manifest = load_manifest(cache)
+    results: dict[Path, str] = {}
+    todo: list[tuple[Path, str, bytes, str]] = []
+    for src, out, dtype in jobs:
+        dtype = dtype.lower()
+        if dtype not in ENDPOINTS:
+            results[out] = f"unsupported type: {dtype}"
+            continue
+        try:
+            body = src.read_text(encoding="utf-8").encode("utf-8")
+        except Exception as e:
+            results[out] = f"failed to read {src}: {e}"
+            continue
+        digest = source_hash(body, dtype, server)
+        if manifest.get(str(out)) == digest and out.exists():
+            results[out] = "cached"
+        else:
+            todo.append((out, dtype, body, digest))
+
+    conns = _Connections(server)
+
+    def work(item: tuple[Path, str, bytes, str]) -> tuple[Path, str, str]:
+        out, dtype, body, digest = item
+        try:
+            status, data = conns.post(ENDPOINTS[dtype], body)
+        except Exception as e:
+            return out, f"request failed: {e}", digest
+        if status != 200:
+            return out, f"http {status}: {data[:200]!r}", digest
+        try:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_bytes(data)
+        except Exception as e:
+            return out, f"write failed: {e}", digest
+        return out, "rendered", digest
+
+    try:
+        if todo:
+            jobs = max(1, min(workers, len(todo)))
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                for out, status, digest in pool.map(work, todo):
+                    results[out] = status
+                    if status == "rendered":
+                        manifest[str(out)] = digest
+    finally:
+        conns.close()
+    if cache is not None and todo:
+        save_manifest(cache, manifest)
+    return results
+
+
+def parse_pair(text: str) -> tuple[Path, Path, str]:
+    """'src=out.png' -> (src, out, type guessed from src's extension)."""
+    src, sep, out = text.partition("=")
+    if not sep or not src or not out:
+        raise argparse.ArgumentTypeError(
+            f"expected <src>=<out.png>, got {text!r}")
+    return Path(src), Path(out), guess_type(Path(src))
+
+
+def batch_main(argv: list[str]) -> int:
+    """Handle ``--batch``: render every SRC=OUT pair; 4 if any failed."""
+    ap = argparse.ArgumentParser(prog="kroki_render.py --batch",
+                                 description="Render many diagrams via Kroki.")
+    ap.add_argument("pairs", nargs="+", type=parse_pair, metavar="SRC=OUT")
+    ap.add_argument("--server", default=DEFAULT_SERVER)
+    ap.add_argument("--jobs", type=int, default=4, help="parallel requests")
+    ap.add_argument("--cache", type=Path, default=None,
+                    help="SHA-256 manifest; unchanged sources are skipped")
+    args = ap.parse_args(argv)
+
+    results = render_many(args.pairs, args.server, args.jobs, args.cache)
+    failed = 0
+    for out, status in results.items():
+        if status in ("rendered", "cached"):
+            print(f"[kroki] {status}: {out}")
+        else:
+            failed += 1
+            print(f"[kroki] {out}: {status}", file=sys.stderr)
+    return 4 if failed else 0
+
+
 def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        return batch_main(sys.argv[2:])
     if len(sys.argv) not in (4, 5):
-        print("Usage: python tools/kroki_render.py <src> <out.png> <plantuml|dot> [server]", file=sys.stderr)
+        print("Usage: python tools/kroki_render.py <src> <out.png> "
+              "<plantuml|dot> [server]\n"
+              "       python tools/kroki_render.py --batch [--cache FILE] "
+              "<src>=<out.png> ...",
+              file=sys.stderr)
         return 1
     src = Path(sys.argv[1])
     out = Path(sys.argv[2])
     dtype = sys.argv[3]
-    server = sys.argv[4] if len(sys.argv) == 5 else "https://kroki.io"
+    server = sys.argv[4] if len(sys.argv) == 5 else DEFAULT_SERVER
     return render(src, out, dtype, server)
 
 if __name__ == "__main__":